@@ -0,0 +1,104 @@
+"""
+Latency benchmark for saving a busy library.
+
+Builds a large ConcurrentLibrary, then saves it while a client thread keeps
+borrowing and returning books, once with save_to_file (which holds the
+library for the whole save) and once with save_in_background (which only
+holds it to freeze the state). For each, the save time and the borrow and
+return latencies seen by the client during the save are reported.
+
+Usage:
+    python benchmarks/bench_background_save.py --books 200000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from library import ConcurrentLibrary, PhysicalBook, Member  # noqa: E402
+
+
+def build_library(books, members, loans, seed):
+    """Create a library with the given number of books, members, and loans."""
+    rng = random.Random(seed)
+    library = ConcurrentLibrary()
+    for i in range(books):
+        library.add_book(PhysicalBook(f"B{i:07d}", f"Title {i}", f"Author {i % 997}", 3))
+    for i in range(members):
+        library.add_member(Member(f"M{i:05d}", f"Member {i}"))
+    library.borrow_many(
+        (f"M{rng.randrange(members):05d}", f"B{rng.randrange(books):07d}") for _ in range(loans)
+    )
+    return library
+
+
+def client(library, books, members, seed, stop, latencies):
+    """Borrow and return random books until stopped, timing each call."""
+    rng = random.Random(seed)
+    while not stop.is_set():
+        pair = [(f"M{rng.randrange(members):05d}", f"B{rng.randrange(books):07d}")]
+        start = time.perf_counter()
+        if not library.borrow_many(pair)[0].ok:
+            library.return_many(pair)
+        latencies.append(time.perf_counter() - start)
+
+
+def percentile(sorted_values, fraction):
+    """Return the value at the given fraction of a sorted list."""
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def measure(library, save, args):
+    """Run save() under client load and return (save seconds, sorted latencies)."""
+    stop = threading.Event()
+    latencies = []
+    thread = threading.Thread(
+        target=client, args=(library, args.books, args.members, args.seed, stop, latencies)
+    )
+    thread.start()
+    time.sleep(0.2)
+    del latencies[:]
+    start = time.perf_counter()
+    save()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    thread.join()
+    return elapsed, sorted(latencies)
+
+
+def main():
+    """Save a busy library both ways and print the client latencies."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--books", type=int, default=100000)
+    parser.add_argument("--members", type=int, default=10000)
+    parser.add_argument("--loans", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    library = build_library(args.books, args.members, args.loans, args.seed)
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "library.jsonl")
+        saves = (
+            ("save_to_file", lambda: library.save_to_file(path)),
+            ("save_in_background", lambda: library.save_in_background(path).wait()),
+        )
+        print(f"{args.books} books, {args.members} members, {len(library.loans)} loans")
+        for name, save in saves:
+            elapsed, latencies = measure(library, save, args)
+            print(
+                f"  {name:<20} save {elapsed:6.2f} s, {len(latencies):>7,} calls during save: "
+                f"p50 {percentile(latencies, 0.5) * 1e6:8.0f} us, "
+                f"p99 {percentile(latencies, 0.99) * 1e6:8.0f} us, "
+                f"max {latencies[-1] * 1e3:8.1f} ms"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
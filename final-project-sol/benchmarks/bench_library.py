@@ -0,0 +1,296 @@
+"""
+Benchmark suite for the Library hot paths.
+
+Builds a synthetic catalog of configurable size, then measures add_book,
+borrow_book, return_book, save_to_file, load_from_file, import_catalog, and
+str(library). Each benchmark reports throughput, p50/p99 latency, and peak
+traced memory. Results can be written as JSON and compared against an earlier
+run to spot regressions between commits.
+
+Usage:
+    python benchmarks/bench_library.py --books 100000 --output before.json
+    python benchmarks/bench_library.py --books 100000 --compare before.json
+"""
+
+import argparse
+import csv
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from library import Library, PhysicalBook, EBook, Member  # noqa: E402
+
+RESULTS_VERSION = 1
+
+
+def make_books(count, seed):
+    """Create a reproducible mix of physical books and e-books."""
+    rng = random.Random(seed)
+    books = []
+    for i in range(count):
+        title = f"Title {rng.randrange(count)} Volume {i % 7}"
+        author = f"Author {rng.randrange(max(1, count // 10))}"
+        if i % 4 == 3:
+            books.append(EBook(f"E{i:07d}", title, author, round(rng.uniform(0.5, 20), 1)))
+        else:
+            books.append(PhysicalBook(f"P{i:07d}", title, author, rng.randint(1, 5)))
+    return books
+
+
+def make_library(config, loans=0):
+    """Create a library with the configured books and members and some loans."""
+    library = Library()
+    for book in make_books(config.books, config.seed):
+        library.add_book(book)
+    for i in range(config.members):
+        library.add_member(Member(f"M{i:06d}", f"Member {i}"))
+    for member_id, book_id in borrow_pairs(library, loans):
+        library.borrow_book(member_id, book_id)
+    return library
+
+
+def borrow_pairs(library, count):
+    """Return (member_id, book_id) pairs that can all be borrowed in order."""
+    member_ids = list(library.members)
+    book_ids = list(library.books)
+    return [
+        (member_ids[i % len(member_ids)], book_ids[i % len(book_ids)])
+        for i in range(min(count, len(book_ids)))
+    ]
+
+
+def timed_calls(function, arguments):
+    """Call function once per argument tuple, returning each latency in ns."""
+    clock = time.perf_counter_ns
+    latencies = []
+    for args in arguments:
+        start = clock()
+        function(*args)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def timed_repeats(function, repeat):
+    """Call function repeat times, returning each latency in ns."""
+    return timed_calls(function, [()] * repeat)
+
+
+def bench_add_book(config, workdir):
+    """Add every book of the catalog to an empty library."""
+    library = Library()
+    books = make_books(config.books, config.seed)
+    return timed_calls(library.add_book, [(book,) for book in books])
+
+
+def bench_borrow_book(config, workdir):
+    """Borrow one book per pair on a fully populated library."""
+    library = make_library(config)
+    return timed_calls(library.borrow_book, borrow_pairs(library, config.loans))
+
+
+def bench_return_book(config, workdir):
+    """Return every active loan."""
+    library = make_library(config, config.loans)
+    return timed_calls(library.return_book, borrow_pairs(library, config.loans))
+
+
+def bench_save_json(config, workdir):
+    """Save the library in the original JSON format."""
+    library = make_library(config, config.loans)
+    filename = os.path.join(workdir, "library.json")
+    return timed_repeats(lambda: library.save_to_file(filename), config.repeat)
+
+
+def bench_save_jsonl(config, workdir):
+    """Save the library in the streaming JSON-lines format."""
+    library = make_library(config, config.loans)
+    filename = os.path.join(workdir, "library.jsonl")
+    return timed_repeats(lambda: library.save_to_file(filename), config.repeat)
+
+
+def bench_load_json(config, workdir):
+    """Load the library from the original JSON format."""
+    filename = os.path.join(workdir, "library.json")
+    make_library(config, config.loans).save_to_file(filename)
+    library = Library()
+    return timed_repeats(lambda: library.load_from_file(filename), config.repeat)
+
+
+def bench_load_jsonl(config, workdir):
+    """Load the library from the streaming JSON-lines format."""
+    filename = os.path.join(workdir, "library.jsonl")
+    make_library(config, config.loans).save_to_file(filename)
+    library = Library()
+    return timed_repeats(lambda: library.load_from_file(filename), config.repeat)
+
+
+def bench_import_csv(config, workdir):
+    """Import the catalog from a CSV file into an empty library."""
+    filename = os.path.join(workdir, "catalog.csv")
+    with open(filename, "w", newline="") as f:
+        writer = csv.DictWriter(f, ["type", "id", "title", "author",
+                                    "available_copies", "file_size_mb"])
+        writer.writeheader()
+        writer.writerows(book.to_dict() for book in make_books(config.books, config.seed))
+    return timed_repeats(lambda: Library().import_catalog(filename), config.repeat)
+
+
+def bench_str(config, workdir):
+    """Render the library summary."""
+    library = make_library(config, config.loans)
+    return timed_repeats(lambda: str(library), config.repeat * 100)
+
+
+BENCHMARKS = {
+    "add_book": bench_add_book,
+    "borrow_book": bench_borrow_book,
+    "return_book": bench_return_book,
+    "save_to_file[json]": bench_save_json,
+    "save_to_file[jsonl]": bench_save_jsonl,
+    "load_from_file[json]": bench_load_json,
+    "load_from_file[jsonl]": bench_load_jsonl,
+    "import_catalog[csv]": bench_import_csv,
+    "str": bench_str,
+}
+
+
+def percentile(sorted_values, fraction):
+    """Return the nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_benchmark(function, config, workdir):
+    """
+    Run one benchmark: a timed pass, then a separate pass for peak memory.
+
+    Memory is traced in its own pass because tracemalloc slows every
+    allocation down and would distort the latencies. The peak covers the
+    whole scenario, including building the library it runs against.
+
+    Returns:
+        dict: ops, ops_per_sec, p50_us, p99_us, mean_us, and peak_memory_kb.
+    """
+    gc.collect()
+    latencies = function(config, workdir)
+    latencies.sort()
+    total = sum(latencies)
+
+    gc.collect()
+    tracemalloc.start()
+    function(config, workdir)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "ops": len(latencies),
+        "ops_per_sec": round(len(latencies) / (total / 1e9), 1) if total else None,
+        "p50_us": round(percentile(latencies, 0.50) / 1e3, 3),
+        "p99_us": round(percentile(latencies, 0.99) / 1e3, 3),
+        "mean_us": round(total / len(latencies) / 1e3, 3),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def git_commit():
+    """Return the current git commit, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """
+    Print the change in throughput against a baseline run.
+
+    Returns:
+        list: Names of benchmarks that got slower by more than threshold.
+    """
+    regressions = []
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    for name, result in results["benchmarks"].items():
+        before = baseline["benchmarks"].get(name)
+        if not before or not before["ops_per_sec"] or not result["ops_per_sec"]:
+            continue
+        change = result["ops_per_sec"] / before["ops_per_sec"] - 1
+        flag = ""
+        if change < -threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"  {name:<22} {change:+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    """Run the benchmarks, print a table, and optionally save or compare results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--books", type=int, default=20000)
+    parser.add_argument("--members", type=int, default=2000)
+    parser.add_argument("--loans", type=int, default=5000, help="loans borrowed and returned")
+    parser.add_argument("--repeat", type=int, default=5, help="repeats of whole-library operations")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--only", action="append", choices=BENCHMARKS, help="benchmark to run")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare with")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10,
+        help="slowdown that counts as a regression (default 0.10)",
+    )
+    config = parser.parse_args()
+
+    results = {
+        "version": RESULTS_VERSION,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "books": config.books,
+            "members": config.members,
+            "loans": config.loans,
+            "repeat": config.repeat,
+            "seed": config.seed,
+        },
+        "benchmarks": {},
+    }
+
+    print(f"{'benchmark':<22} {'ops':>8} {'ops/sec':>14} {'p50 us':>10} {'p99 us':>10} {'peak KB':>11}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in config.only or BENCHMARKS:
+            result = run_benchmark(BENCHMARKS[name], config, workdir)
+            results["benchmarks"][name] = result
+            print(
+                f"{name:<22} {result['ops']:>8} {result['ops_per_sec'] or 0:>14,.1f} "
+                f"{result['p50_us']:>10.1f} {result['p99_us']:>10.1f} {result['peak_memory_kb']:>11,.0f}"
+            )
+
+    if config.output:
+        with open(config.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {config.output}")
+
+    if config.compare:
+        with open(config.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("config") != results["config"]:
+            print("\nWarning: baseline was run with a different configuration.")
+        if compare(results, baseline, config.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
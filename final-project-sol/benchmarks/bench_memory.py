@@ -0,0 +1,112 @@
+"""
+Memory benchmark for loading a realistic catalog.
+
+Builds a synthetic catalog where authors follow a long-tailed distribution
+(a few prolific authors write whole series, most write one or two books) and
+many titles repeat across editions and formats. The catalog is saved, then
+loaded from the JSON lines file and imported from CSV, and for each the
+memory the library retains is reported, along with how many distinct string
+objects hold the titles and authors.
+
+Usage:
+    python benchmarks/bench_memory.py --books 200000
+"""
+
+import argparse
+import csv
+import gc
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+from itertools import accumulate
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from library import Library, PhysicalBook, EBook, storage  # noqa: E402
+
+
+def make_catalog(count, seed):
+    """Create a reproducible catalog with repeated authors and titles."""
+    rng = random.Random(seed)
+    authors = [f"Author {i} {rng.choice('ABCDEFGH')}. Surname{i}" for i in range(count // 8)]
+    weights = list(accumulate(1 / (rank + 1) for rank in range(len(authors))))
+    books = []
+    series = {}
+    for i in range(count):
+        author = rng.choices(authors, cum_weights=weights)[0]
+        if rng.random() < 0.4:
+            # Another edition or format of one of the author's titles.
+            titles = series.setdefault(author, [f"The Chronicles of {author[-6:]}"])
+            title = rng.choice(titles)
+        else:
+            title = f"{rng.choice(['A', 'The', 'Of'])} Story Number {i}"
+            series.setdefault(author, []).append(title)
+        if i % 4 == 3:
+            books.append(EBook(f"E{i:07d}", title, author, round(rng.uniform(0.5, 20), 1)))
+        else:
+            books.append(PhysicalBook(f"P{i:07d}", title, author, rng.randint(1, 5)))
+    return books
+
+
+def retained(load):
+    """Run load() and return the library it builds and the memory it retains."""
+    gc.collect()
+    tracemalloc.start()
+    library = load()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return library, size
+
+
+def main():
+    """Save a synthetic catalog, reload it, and print the retained memory."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--books", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    books = make_catalog(args.books, args.seed)
+    with tempfile.TemporaryDirectory() as workdir:
+        jsonl = os.path.join(workdir, "library.jsonl")
+        catalog = os.path.join(workdir, "catalog.csv")
+        with open(jsonl, "w") as f:
+            storage.write_jsonl(f, [("books", (book.to_dict() for book in books))])
+        with open(catalog, "w", newline="") as f:
+            writer = csv.DictWriter(
+                f, ["type", "id", "title", "author", "available_copies", "file_size_mb"]
+            )
+            writer.writeheader()
+            writer.writerows(book.to_dict() for book in books)
+        del books
+
+        def load_jsonl():
+            library = Library()
+            library.load_from_file(jsonl)
+            return library
+
+        def import_csv():
+            library = Library()
+            library.import_catalog(catalog)
+            return library
+
+        print(f"{args.books} books")
+        for name, load in (("load_from_file", load_jsonl), ("import_catalog", import_csv)):
+            library, size = retained(load)
+            loaded = library.list_books()
+            titles = len({id(book.title) for book in loaded})
+            authors = len({id(book.author) for book in loaded})
+            distinct = (len({book.title for book in loaded}), len({book.author for book in loaded}))
+            print(
+                f"  {name:<16} {size / 1024:>12,.0f} KB retained, "
+                f"{titles:,} title objects, {authors:,} author objects"
+            )
+            del library, loaded
+        print(f"  distinct values: {distinct[0]:,} titles, {distinct[1]:,} authors")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
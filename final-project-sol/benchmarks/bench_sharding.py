@@ -0,0 +1,83 @@
+"""
+Throughput benchmark for ShardedLibrary.
+
+Runs the same batched borrow/return workload against a single Library and
+against ShardedLibrary with an increasing number of shards, and reports
+operations per second for each. Shards only help when there are cores to
+run them on, so compare runs up to the machine's core count.
+
+Usage:
+    python benchmarks/bench_sharding.py --shards 1 2 4 8 --ops 200000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from library import Library, ShardedLibrary, PhysicalBook, Member  # noqa: E402
+
+
+def populate(library, books, members):
+    """Add the benchmark's books and members."""
+    for i in range(books):
+        library.add_book(PhysicalBook(f"B{i:07d}", f"Title {i}", "Author", 3))
+    for i in range(members):
+        library.add_member(Member(f"M{i:06d}", f"Member {i}"))
+
+
+def workload(ops, books, members, seed):
+    """Return a reproducible list of (member_id, book_id) requests."""
+    rng = random.Random(seed)
+    return [
+        (f"M{rng.randrange(members):06d}", f"B{rng.randrange(books):07d}")
+        for _ in range(ops)
+    ]
+
+
+def run(library, requests, batch):
+    """Borrow then return every request in batches; return ops per second."""
+    start = time.perf_counter()
+    for i in range(0, len(requests), batch):
+        library.borrow_many(requests[i:i + batch])
+    for i in range(0, len(requests), batch):
+        library.return_many(requests[i:i + batch])
+    return 2 * len(requests) / (time.perf_counter() - start)
+
+
+def main():
+    """Run the benchmark for each shard count and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--ops", type=int, default=100000)
+    parser.add_argument("--books", type=int, default=50000)
+    parser.add_argument("--members", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=5000, help="requests per batch")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    requests = workload(args.ops, args.books, args.members, args.seed)
+    print(f"{os.cpu_count()} CPUs, {args.ops} requests in batches of {args.batch}")
+
+    library = Library()
+    populate(library, args.books, args.members)
+    baseline = run(library, requests, args.batch)
+    print(f"  {'Library':<18} {baseline:>12,.0f} ops/sec")
+
+    for shards in args.shards:
+        with ShardedLibrary(shards) as sharded:
+            populate(sharded, args.books, args.members)
+            rate = run(sharded, requests, args.batch)
+            problems = sharded.verify_inventory()
+        print(
+            f"  {f'{shards} shard(s)':<18} {rate:>12,.0f} ops/sec "
+            f"({rate / baseline:.2f}x){'  INCONSISTENT' if problems else ''}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
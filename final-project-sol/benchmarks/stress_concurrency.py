@@ -0,0 +1,127 @@
+"""
+Stress benchmark for the thread-safe ConcurrentLibrary.
+
+Drives many threads through borrow_book/return_book on a small set of
+physical books (to force contention), then checks that copy counts never
+went negative and that every copy is accounted for by a loan.
+
+Usage:
+    python benchmarks/stress_concurrency.py --threads 16 --ops 20000
+    python benchmarks/stress_concurrency.py --unsafe   # plain Library, for comparison
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from library import (  # noqa: E402
+    Library,
+    ConcurrentLibrary,
+    PhysicalBook,
+    Member,
+    BookNotAvailableError,
+    InvalidOperationError,
+)
+
+
+def build_library(library_class, books, members, copies):
+    """Create a library with the given number of books and members."""
+    library = library_class()
+    for i in range(books):
+        library.add_book(PhysicalBook(f"B{i:04d}", f"Title {i}", "Author", copies))
+    for i in range(members):
+        library.add_member(Member(f"M{i:04d}", f"Member {i}"))
+    return library
+
+
+def worker(library, ops, books, members, seed, counts, negative):
+    """Run random borrows and returns, counting outcomes."""
+    rng = random.Random(seed)
+    done = failed = broken = 0
+    for _ in range(ops):
+        member_id = f"M{rng.randrange(members):04d}"
+        book_id = f"B{rng.randrange(books):04d}"
+        try:
+            if rng.random() < 0.5:
+                library.borrow_book(member_id, book_id)
+            else:
+                library.return_book(member_id, book_id)
+            done += 1
+        except (BookNotAvailableError, InvalidOperationError):
+            failed += 1
+        except Exception:
+            # Only possible when state was corrupted by a race.
+            broken += 1
+        if library.get_book_by_id(book_id).available_copies < 0:
+            negative.set()
+    counts.append((done, failed, broken))
+
+
+def check_invariants(library, copies):
+    """Return a list of invariant violations."""
+    problems = []
+    for book in library.list_books():
+        loans = len(library.loans_for_book(book.id))
+        if book.available_copies < 0:
+            problems.append(f"{book.id}: {book.available_copies} copies available")
+        if book.available_copies + loans != copies:
+            problems.append(
+                f"{book.id}: {book.available_copies} available + {loans} loans != {copies}"
+            )
+    problems.extend(library.verify_inventory())
+    return problems
+
+
+def main():
+    """Run the stress benchmark and report throughput and invariant checks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=20000, help="operations per thread")
+    parser.add_argument("--books", type=int, default=20)
+    parser.add_argument("--members", type=int, default=30)
+    parser.add_argument("--copies", type=int, default=3)
+    parser.add_argument("--unsafe", action="store_true", help="use the plain Library")
+    args = parser.parse_args()
+
+    library_class = Library if args.unsafe else ConcurrentLibrary
+    library = build_library(library_class, args.books, args.members, args.copies)
+
+    counts = []
+    negative = threading.Event()
+    threads = [
+        threading.Thread(
+            target=worker,
+            args=(library, args.ops, args.books, args.members, seed, counts, negative),
+        )
+        for seed in range(args.threads)
+    ]
+    # Switch threads often to make races more likely.
+    sys.setswitchinterval(1e-6)
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    total = args.threads * args.ops
+    done = sum(c[0] for c in counts)
+    broken = sum(c[2] for c in counts)
+    problems = check_invariants(library, args.copies)
+    print(f"{library_class.__name__}: {args.threads} threads x {args.ops} ops")
+    print(f"  {total / elapsed:,.0f} ops/sec ({elapsed:.2f}s), {done} succeeded")
+    print(f"  negative copy count observed: {negative.is_set()}")
+    print(f"  unexpected errors: {broken}")
+    print(f"  invariant violations: {len(problems)}")
+    for problem in problems[:10]:
+        print(f"    {problem}")
+    return 1 if problems or broken or negative.is_set() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
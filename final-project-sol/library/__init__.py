@@ -1,11 +1,27 @@
 """
 Initialize the library package.
+
+AsyncLibrary, ShardedLibrary, and Metrics pull in asyncio, multiprocessing,
+and http.server, so they are imported on first use rather than here, which
+keeps starting the console fast.
 """
 
+from importlib import import_module
 from .book import Book, PhysicalBook, EBook
 from .member import Member
 from .loan import Loan
+from .loan_index import LoanIndex
+from .holds import HoldQueue
+from .cow import BackgroundSave
 from .library import Library
+from .concurrency import ConcurrentLibrary
+from .journal import Journal
+from .events import Event, EventBus
+from .importer import ImportReport
+from .results import OperationResult
+from .search import SearchIndex
+from .catalog import ColumnarCatalog
+from .binary_snapshot import BinarySnapshot
 from .exceptions import (
     BookNotAvailableError,
     BookNotFoundError,
@@ -19,9 +35,39 @@ __all__ = [
     "EBook",
     "Member",
     "Loan",
+    "LoanIndex",
+    "HoldQueue",
+    "BackgroundSave",
     "Library",
+    "ConcurrentLibrary",
+    "AsyncLibrary",
+    "ShardedLibrary",
+    "Journal",
+    "Event",
+    "EventBus",
+    "ImportReport",
+    "OperationResult",
+    "SearchIndex",
+    "ColumnarCatalog",
+    "BinarySnapshot",
+    "Metrics",
     "BookNotAvailableError",
     "BookNotFoundError",
     "MemberNotFoundError",
     "InvalidOperationError",
 ]
+
+_LAZY = {
+    "AsyncLibrary": ".async_library",
+    "ShardedLibrary": ".sharding",
+    "Metrics": ".metrics",
+}
+
+
+def __getattr__(name):
+    """Import the classes listed in _LAZY the first time they are used."""
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,157 @@
+"""
+Async library module for the Smart Library Management System.
+
+Provides an asyncio facade over Library.
+"""
+
+import asyncio
+from .library import Library
+
+
+class AsyncLibrary:
+    """
+    Asyncio facade over a Library.
+
+    Every operation is a coroutine. Mutations are serialized through an
+    internal queue and applied one at a time by a worker task, so they never
+    interleave. Saving and loading run in a worker thread, so file I/O never
+    blocks the event loop; other mutations wait in the queue until the file
+    operation finishes, except during save_in_background().
+
+    Use it as an async context manager, or call start() and close():
+
+        async with AsyncLibrary() as library:
+            await library.add_member(Member("M001", "Alice"))
+
+    Attributes:
+        _library (Library): The wrapped library.
+        _queue (asyncio.Queue): Pending operations.
+        _worker (asyncio.Task): Task applying queued operations.
+    """
+
+    def __init__(self, library=None):
+        """
+        Initialize an AsyncLibrary.
+
+        Args:
+            library (Library, optional): The library to wrap. Defaults to a new Library.
+        """
+        self._library = Library() if library is None else library
+        self._queue = None
+        self._worker = None
+
+    @property
+    def library(self):
+        """Get the wrapped library, for read-only queries."""
+        return self._library
+
+    async def start(self):
+        """Start the worker task. Called automatically by the first operation."""
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self):
+        """Finish all queued operations and stop the worker task."""
+        if self._worker is not None:
+            await self._queue.put(None)
+            await self._worker
+            self._worker = None
+
+    async def __aenter__(self):
+        """Start the worker when entering an async with block."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """Stop the worker when leaving an async with block."""
+        await self.close()
+
+    async def add_book(self, book):
+        """Add a book to the library (see Library.add_book)."""
+        return await self._submit(self._library.add_book, book)
+
+    async def add_member(self, member):
+        """Add a member to the library (see Library.add_member)."""
+        return await self._submit(self._library.add_member, member)
+
+    async def borrow_book(self, member_id, book_id):
+        """Record a member borrowing a book (see Library.borrow_book)."""
+        return await self._submit(self._library.borrow_book, member_id, book_id)
+
+    async def return_book(self, member_id, book_id):
+        """Record a member returning a book (see Library.return_book)."""
+        return await self._submit(self._library.return_book, member_id, book_id)
+
+    async def borrow_many(self, requests):
+        """Process many borrows in one pass (see Library.borrow_many)."""
+        return await self._submit(self._library.borrow_many, list(requests))
+
+    async def return_many(self, requests):
+        """Process many returns in one pass (see Library.return_many)."""
+        return await self._submit(self._library.return_many, list(requests))
+
+    async def save(self, filename, streaming=None):
+        """Save the library to a file in a worker thread (see Library.save_to_file)."""
+        return await self._submit(
+            self._library.save_to_file, filename, streaming, offload=True
+        )
+
+    async def save_in_background(self, filename, streaming=None):
+        """
+        Save the library in a background thread without holding up mutations.
+
+        The state is frozen in the queue's order (see
+        Library.save_in_background), then operations queued after this one
+        are applied while the file is written.
+        """
+        handle = await self._submit(self._library.save_in_background, filename, streaming)
+        await asyncio.get_running_loop().run_in_executor(None, handle.wait)
+
+    async def load(self, filename, lazy=False):
+        """Load the library from a file in a worker thread (see Library.load_from_file)."""
+        return await self._submit(self._library.load_from_file, filename, lazy, offload=True)
+
+    async def import_catalog(self, filename, fmt=None):
+        """Import a catalog file in a worker thread (see Library.import_catalog)."""
+        return await self._submit(self._library.import_catalog, filename, fmt, offload=True)
+
+    async def _submit(self, function, *args, offload=False):
+        """
+        Queue an operation and wait for its result.
+
+        Args:
+            function (callable): The library method to call.
+            *args: Arguments for the method.
+            offload (bool, optional): Whether to run it in a worker thread.
+
+        Returns:
+            The method's return value.
+
+        Raises:
+            Exception: Whatever the method raised.
+        """
+        await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((future, function, args, offload))
+        return await future
+
+    async def _run(self):
+        """Apply queued operations one at a time until close() is called."""
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            future, function, args, offload = item
+            try:
+                if offload:
+                    result = await loop.run_in_executor(None, function, *args)
+                else:
+                    result = function(*args)
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            else:
+                if not future.cancelled():
+                    future.set_result(result)
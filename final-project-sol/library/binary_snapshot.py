@@ -0,0 +1,471 @@
+"""
+Binary snapshot module for the Smart Library Management System.
+
+Provides a binary snapshot format that can be memory-mapped and read lazily.
+
+Layout (all integers little-endian):
+
+    header        magic, version, record counts, and section offsets
+    strings       UTF-8 strings, referenced as (offset, length) pairs
+    books         fixed-width book records
+    members       fixed-width member records, each pointing at its loans
+    loans         fixed-width loan records, grouped by member
+    book index    book record numbers sorted by book ID
+    member index  member record numbers sorted by member ID
+
+Because every record has a fixed width and the indexes are sorted, a single
+book or member can be found with a binary search over the mapped file, without
+parsing anything else.
+"""
+
+import json
+import mmap
+import struct
+from array import array
+from collections.abc import MutableMapping
+from threading import RLock
+from .book import PhysicalBook, EBook
+
+MAGIC = b"LIBSNAP\x00"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sIIII" + "Q" * 7 + "I")
+_BOOK = struct.Struct("<Bqd" + "QI" * 3)
+_MEMBER = struct.Struct("<" + "QI" * 2 + "II")
+_LOAN = struct.Struct("<IIii")
+_REF = struct.Struct("<QI")
+
+_PHYSICAL = 0
+_EBOOK = 1
+_BOOK_ID_OFFSET = 17
+_MEMBER_ID_OFFSET = 0
+
+
+def write_snapshot(filename, books, members, loans_for_member, meta=None):
+    """
+    Write a binary snapshot.
+
+    Args:
+        filename (str): Path to the output file.
+        books (iterable): The books to store.
+        members (iterable): The members to store.
+        loans_for_member (callable): Returns the loans held by a member ID.
+        meta (dict, optional): Extra JSON-serializable metadata.
+
+    Raises:
+        TypeError: If a book is neither a PhysicalBook nor an EBook.
+    """
+    with open(filename, "wb") as f:
+        f.write(b"\0" * _HEADER.size)
+        strings_offset = f.tell()
+        strings = _StringWriter(f)
+
+        book_numbers = {}
+        book_ids = []
+        book_records = bytearray()
+        for book in books:
+            if isinstance(book, PhysicalBook):
+                kind, copies, size = _PHYSICAL, book.available_copies, 0.0
+            elif isinstance(book, EBook):
+                kind, copies, size = _EBOOK, 0, book.file_size_mb
+            else:
+                raise TypeError(f"Cannot store {type(book).__name__} in a snapshot.")
+            book_numbers[book.id] = len(book_ids)
+            book_ids.append(book.id)
+            book_records += _BOOK.pack(
+                kind, copies, size,
+                *strings.add(book.id), *strings.add(book.title), *strings.add(book.author),
+            )
+
+        member_ids = []
+        member_records = bytearray()
+        loan_records = bytearray()
+        loan_count = 0
+        for member in members:
+            loans = loans_for_member(member.member_id)
+            member_records += _MEMBER.pack(
+                *strings.add(member.member_id), *strings.add(member.name),
+                loan_count, len(loans),
+            )
+            member_number = len(member_ids)
+            member_ids.append(member.member_id)
+            for loan in loans:
+                loan_records += _LOAN.pack(
+                    book_numbers[loan.book.id], member_number,
+                    loan.borrowed_day, loan.due_day,
+                )
+            loan_count += len(loans)
+
+        meta_ref = strings.add(json.dumps(meta or {}))
+        books_offset = f.tell()
+        f.write(book_records)
+        members_offset = f.tell()
+        f.write(member_records)
+        loans_offset = f.tell()
+        f.write(loan_records)
+        book_index_offset = f.tell()
+        f.write(_sorted_index(book_ids))
+        member_index_offset = f.tell()
+        f.write(_sorted_index(member_ids))
+
+        f.seek(0)
+        f.write(_HEADER.pack(
+            MAGIC, VERSION, len(book_ids), len(member_ids), loan_count,
+            strings_offset, books_offset, members_offset, loans_offset,
+            book_index_offset, member_index_offset, *meta_ref,
+        ))
+
+
+def _sorted_index(ids):
+    """Return record numbers ordered by the UTF-8 bytes of their IDs."""
+    order = sorted(range(len(ids)), key=lambda i: ids[i].encode())
+    return array("I", order).tobytes()
+
+
+class _StringWriter:
+    """Appends strings to the string table and returns their references."""
+
+    def __init__(self, file):
+        self._file = file
+        self._start = file.tell()
+        self._position = 0
+
+    def add(self, text):
+        """Write a string and return its (offset, length) reference."""
+        data = text.encode()
+        self._file.write(data)
+        offset = self._position
+        self._position += len(data)
+        return self._start + offset, len(data)
+
+
+class BinarySnapshot:
+    """
+    Memory-mapped, read-only view of a binary snapshot file.
+
+    Nothing is parsed when the snapshot is opened apart from the header;
+    records are decoded only when asked for.
+
+    Attributes:
+        book_count (int): Number of book records.
+        member_count (int): Number of member records.
+        loan_count (int): Number of loan records.
+        meta (dict): Extra metadata stored with the snapshot.
+    """
+
+    def __init__(self, filename):
+        """
+        Open a snapshot file.
+
+        Args:
+            filename (str): Path to the snapshot file.
+
+        Raises:
+            ValueError: If the file is not a binary snapshot of a supported version.
+        """
+        with open(filename, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise ValueError(f"'{filename}' is not a binary library snapshot.")
+        (
+            magic, version, self.book_count, self.member_count, self.loan_count,
+            _, self._books, self._members, self._loans,
+            self._book_index, self._member_index, meta_offset, meta_length,
+        ) = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"'{filename}' is not a binary library snapshot.")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"Unsupported snapshot version {version}.")
+        self.meta = json.loads(self._string(meta_offset, meta_length))
+
+    def close(self):
+        """Unmap the file."""
+        self._map.close()
+
+    def find_book(self, book_id):
+        """
+        Find the record number of a book.
+
+        Args:
+            book_id (str): The book ID.
+
+        Returns:
+            int: The record number, or None if not found.
+        """
+        return self._find(
+            book_id, self._book_index, self.book_count,
+            self._books, _BOOK.size, _BOOK_ID_OFFSET,
+        )
+
+    def find_member(self, member_id):
+        """
+        Find the record number of a member.
+
+        Args:
+            member_id (str): The member ID.
+
+        Returns:
+            int: The record number, or None if not found.
+        """
+        return self._find(
+            member_id, self._member_index, self.member_count,
+            self._members, _MEMBER.size, _MEMBER_ID_OFFSET,
+        )
+
+    def book_id(self, number):
+        """Return the ID of a book record."""
+        return self._ref(self._books + number * _BOOK.size + _BOOK_ID_OFFSET)
+
+    def member_id(self, number):
+        """Return the ID of a member record."""
+        return self._ref(self._members + number * _MEMBER.size + _MEMBER_ID_OFFSET)
+
+    def book(self, number):
+        """
+        Build the book stored in a record.
+
+        Args:
+            number (int): The record number.
+
+        Returns:
+            Book: A new PhysicalBook or EBook.
+        """
+        (
+            kind, copies, size, id_offset, id_length,
+            title_offset, title_length, author_offset, author_length,
+        ) = _BOOK.unpack_from(self._map, self._books + number * _BOOK.size)
+        book_id = self._string(id_offset, id_length)
+        title = self._string(title_offset, title_length)
+        author = self._string(author_offset, author_length)
+        if kind == _PHYSICAL:
+            return PhysicalBook(book_id, title, author, copies)
+        return EBook(book_id, title, author, size)
+
+    def member(self, number):
+        """
+        Read a member record.
+
+        Args:
+            number (int): The record number.
+
+        Returns:
+            tuple: (member_id, name, loans), where loans is a list of
+                (book record number, borrowed_day, due_day) tuples.
+        """
+        (
+            id_offset, id_length, name_offset, name_length, first_loan, loan_count,
+        ) = _MEMBER.unpack_from(self._map, self._members + number * _MEMBER.size)
+        loans = [
+            (book_number, borrowed_day, due_day)
+            for book_number, _, borrowed_day, due_day in _LOAN.iter_unpack(
+                self._map[
+                    self._loans + first_loan * _LOAN.size:
+                    self._loans + (first_loan + loan_count) * _LOAN.size
+                ]
+            )
+        ]
+        return (
+            self._string(id_offset, id_length),
+            self._string(name_offset, name_length),
+            loans,
+        )
+
+    def book_ids(self):
+        """Yield book IDs in record order."""
+        for number in range(self.book_count):
+            yield self.book_id(number)
+
+    def member_ids(self):
+        """Yield member IDs in record order."""
+        for number in range(self.member_count):
+            yield self.member_id(number)
+
+    def _find(self, key, index, count, records, size, id_offset):
+        """Binary search a sorted index for a record whose ID equals key."""
+        target = key.encode()
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            (number,) = struct.unpack_from("<I", self._map, index + middle * 4)
+            offset, length = _REF.unpack_from(self._map, records + number * size + id_offset)
+            candidate = self._map[offset:offset + length]
+            if candidate < target:
+                low = middle + 1
+            elif candidate > target:
+                high = middle
+            else:
+                return number
+        return None
+
+    def _ref(self, position):
+        """Decode the string referenced at a position."""
+        return self._string(*_REF.unpack_from(self._map, position))
+
+    def _string(self, offset, length):
+        """Decode a string from the string table."""
+        return self._map[offset:offset + length].decode()
+
+
+class SnapshotMap(MutableMapping):
+    """
+    Mapping backed by a binary snapshot, built lazily on first access.
+
+    Entries are decoded from the snapshot the first time they are looked up
+    and kept afterwards. New entries can be added and existing ones replaced
+    or removed, as with a dict. Iteration yields snapshot entries in record
+    order, followed by entries added later.
+
+    Attributes:
+        _count (int): Number of entries in the snapshot.
+        _find (callable): Returns the record number for a key, or None.
+        _key_at (callable): Returns the key of a record number.
+        _build (callable): Builds the value for a record number.
+        _loaded (dict): Entries decoded or added so far.
+        _extra (dict): Keys added that are not in the snapshot.
+        _removed (set): Snapshot keys that were removed.
+    """
+
+    def __init__(self, count, find, key_at, build):
+        """
+        Initialize a SnapshotMap.
+
+        Args:
+            count (int): Number of entries in the snapshot.
+            find (callable): Returns the record number for a key, or None.
+            key_at (callable): Returns the key of a record number.
+            build (callable): Builds the value for a record number.
+        """
+        self._count = count
+        self._find = find
+        self._key_at = key_at
+        self._build = build
+        self._loaded = {}
+        self._extra = {}
+        self._removed = set()
+        self._lock = RLock()
+
+    def get(self, key, default=None):
+        """Return the value for a key, building it if needed, or default."""
+        value = self._loaded.get(key)
+        if value is not None:
+            return value
+        with self._lock:
+            if key in self._loaded:
+                return self._loaded[key]
+            if key in self._removed:
+                return default
+            number = self._find(key)
+            if number is None:
+                return default
+            value = self._loaded[key] = self._build(number)
+            return value
+
+    def __getitem__(self, key):
+        """Return the value for a key, building it if needed."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        """Add or replace an entry."""
+        with self._lock:
+            if key in self._removed:
+                self._removed.discard(key)
+            elif key not in self._loaded and key not in self._extra:
+                if self._find(key) is None:
+                    self._extra[key] = None
+            self._loaded[key] = value
+
+    def __delitem__(self, key):
+        """Remove an entry."""
+        with self._lock:
+            if key not in self:
+                raise KeyError(key)
+            self._loaded.pop(key, None)
+            if key in self._extra:
+                del self._extra[key]
+            else:
+                self._removed.add(key)
+
+    def __contains__(self, key):
+        """Check whether a key is present, without building its value."""
+        if key in self._loaded or key in self._extra:
+            return True
+        if key in self._removed:
+            return False
+        return self._find(key) is not None
+
+    def __iter__(self):
+        """Iterate over keys: snapshot records first, then added entries."""
+        for number in range(self._count):
+            key = self._key_at(number)
+            if key not in self._removed:
+                yield key
+        yield from list(self._extra)
+
+    def __reversed__(self):
+        """Iterate over keys in reverse: added entries first, then snapshot records."""
+        yield from list(reversed(self._extra))
+        for number in range(self._count - 1, -1, -1):
+            key = self._key_at(number)
+            if key not in self._removed:
+                yield key
+
+    def __len__(self):
+        """Return the number of entries."""
+        return self._count - len(self._removed) + len(self._extra)
+
+    def values(self):
+        """Return every value, building the remaining ones in record order."""
+        return self.load_all().values()
+
+    def items(self):
+        """Return every (key, value) pair, building the remaining values in record order."""
+        return self.load_all().items()
+
+    def load_all(self):
+        """
+        Build every remaining entry, walking the snapshot in record order.
+
+        Returns:
+            dict: All entries, in iteration order.
+        """
+        with self._lock:
+            loaded = self._loaded
+            entries = {}
+            for number in range(self._count):
+                key = self._key_at(number)
+                if key in self._removed:
+                    continue
+                value = loaded.get(key)
+                if value is None:
+                    value = loaded[key] = self._build(number)
+                entries[key] = value
+            for key in self._extra:
+                entries[key] = loaded[key]
+            return entries
+
+    def is_fully_loaded(self):
+        """Check whether every snapshot entry has been built."""
+        return len(self._loaded) == len(self)
+
+    def clear(self):
+        """Remove all entries and detach from the snapshot."""
+        with self._lock:
+            self._count = 0
+            self._find = _not_found
+            self._loaded.clear()
+            self._extra.clear()
+            self._removed.clear()
+
+
+_MISSING = object()
+
+
+def _not_found(key):
+    """Find function of a map with no snapshot behind it."""
+    return None
@@ -4,9 +4,24 @@ Book module for the Smart Library Management System.
 Defines abstract base class Book and concrete implementations (PhysicalBook, EBook).
 """
 
+import sys
 from abc import ABC, abstractmethod
 
 
+def intern_text(value):
+    """
+    Intern a string so equal values share one object.
+
+    Args:
+        value: The value to intern. Anything other than a str (such as a
+            title stored as a number in a file) is returned unchanged.
+
+    Returns:
+        The interned string, or the value itself.
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
 class Book(ABC):
     """
     Abstract base class representing a generic book in the library.
@@ -14,12 +29,18 @@ class Book(ABC):
     This class defines the common interface for all book types.
     Subclasses must implement borrow() and return_book() methods.
 
+    Titles and authors are interned, so every book by the same author (or
+    every edition of the same title) shares one string, however the book
+    was created: directly, loaded from a file, or imported.
+
     Attributes:
         _id (str): Unique identifier for the book.
         _title (str): Title of the book.
         _author (str): Author of the book.
     """
 
+    __slots__ = ("_id", "_title", "_author")
+
     def __init__(self, book_id, title, author):
         """
         Initialize a Book instance.
@@ -30,8 +51,8 @@ class Book(ABC):
             author (str): Author of the book.
         """
         self._id = book_id
-        self._title = title
-        self._author = author
+        self._title = intern_text(title)
+        self._author = intern_text(author)
 
     @property
     def id(self):
@@ -48,6 +69,15 @@ class Book(ABC):
         """Get the book author."""
         return self._author
 
+    def can_borrow(self):
+        """
+        Check whether the book can currently be borrowed.
+
+        Returns:
+            bool: True by default; subclasses with limited copies override this.
+        """
+        return True
+
     @abstractmethod
     def borrow(self):
         """
@@ -100,6 +130,8 @@ class PhysicalBook(Book):
         _available_copies (int): Number of available copies.
     """
 
+    __slots__ = ("_available_copies",)
+
     def __init__(self, book_id, title, author, available_copies):
         """
         Initialize a PhysicalBook instance.
@@ -123,6 +155,15 @@ class PhysicalBook(Book):
         """Get the number of available copies."""
         return self._available_copies
 
+    def can_borrow(self):
+        """
+        Check whether a copy is available to borrow.
+
+        Returns:
+            bool: True if at least one copy is available.
+        """
+        return self._available_copies > 0
+
     def borrow(self):
         """
         Decrease the number of available copies by 1.
@@ -174,6 +215,8 @@ class EBook(Book):
         _file_size_mb (float): Size of the e-book file in megabytes.
     """
 
+    __slots__ = ("_file_size_mb",)
+
     def __init__(self, book_id, title, author, file_size_mb):
         """
         Initialize an EBook instance.
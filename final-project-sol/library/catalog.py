@@ -0,0 +1,220 @@
+"""
+Catalog module for the Smart Library Management System.
+
+Provides a compact, column-oriented store for large book catalogs.
+"""
+
+from array import array
+from collections.abc import MutableMapping
+from .book import PhysicalBook, EBook, intern_text
+
+_PHYSICAL = 0
+_EBOOK = 1
+_DELETED = -1
+
+
+class ColumnarCatalog(MutableMapping):
+    """
+    Column-oriented mapping from book IDs to books.
+
+    Instead of keeping one object per book, the catalog stores IDs, titles,
+    and authors in parallel lists (with strings interned, so repeated authors
+    are stored once) and copy counts and file sizes in typed arrays. Books are
+    handed out as lightweight views that read and write the columns directly,
+    so they behave exactly like PhysicalBook and EBook objects.
+
+    The catalog can be passed to Library as its book store.
+
+    Attributes:
+        _rows (dict): Maps book IDs to row numbers.
+        _ids (list): Book IDs by row.
+        _titles (list): Book titles by row.
+        _authors (list): Book authors by row.
+        _kinds (array): Book type code by row.
+        _copies (array): Available copies by row (physical books).
+        _sizes (array): File size in megabytes by row (e-books).
+    """
+
+    def __init__(self, books=()):
+        """
+        Initialize a ColumnarCatalog.
+
+        Args:
+            books (iterable, optional): Books to add initially.
+        """
+        self._rows = {}
+        self._ids = []
+        self._titles = []
+        self._authors = []
+        self._kinds = array("b")
+        self._copies = array("q")
+        self._sizes = array("d")
+        for book in books:
+            self.add(book)
+
+    def add(self, book):
+        """
+        Store a book under its own ID.
+
+        Args:
+            book (Book): A PhysicalBook or EBook.
+        """
+        self[book.id] = book
+
+    def __setitem__(self, book_id, book):
+        """
+        Store a book, replacing any book with the same ID.
+
+        Raises:
+            ValueError: If the key differs from the book ID.
+            TypeError: If the book is neither a PhysicalBook nor an EBook.
+        """
+        if book_id != book.id:
+            raise ValueError(f"Key '{book_id}' does not match book ID '{book.id}'.")
+        if isinstance(book, PhysicalBook):
+            kind, copies, size = _PHYSICAL, book.available_copies, 0.0
+        elif isinstance(book, EBook):
+            kind, copies, size = _EBOOK, 0, book.file_size_mb
+        else:
+            raise TypeError(f"Cannot store {type(book).__name__} in a catalog.")
+
+        title = intern_text(book.title)
+        author = intern_text(book.author)
+        row = self._rows.get(book_id)
+        if row is None:
+            self._rows[book_id] = len(self._ids)
+            self._ids.append(book_id)
+            self._titles.append(title)
+            self._authors.append(author)
+            self._kinds.append(kind)
+            self._copies.append(copies)
+            self._sizes.append(size)
+        else:
+            self._titles[row] = title
+            self._authors[row] = author
+            self._kinds[row] = kind
+            self._copies[row] = copies
+            self._sizes[row] = size
+
+    def __getitem__(self, book_id):
+        """Return a view of the book with the given ID."""
+        row = self._rows[book_id]
+        if self._kinds[row] == _PHYSICAL:
+            return CatalogPhysicalBook(self, row)
+        return CatalogEBook(self, row)
+
+    def __delitem__(self, book_id):
+        """Remove a book; its row is left empty."""
+        row = self._rows.pop(book_id)
+        self._kinds[row] = _DELETED
+        self._titles[row] = self._authors[row] = None
+
+    def __iter__(self):
+        """Iterate over book IDs in insertion order."""
+        return iter(self._rows)
+
+    def __reversed__(self):
+        """Iterate over book IDs, most recently added first."""
+        return reversed(self._rows)
+
+    def __len__(self):
+        """Return the number of books."""
+        return len(self._rows)
+
+    def __contains__(self, book_id):
+        """Check whether a book ID is stored, without building a view."""
+        return book_id in self._rows
+
+    def clear(self):
+        """Remove all books."""
+        self._rows.clear()
+        self._ids.clear()
+        self._titles.clear()
+        self._authors.clear()
+        del self._kinds[:]
+        del self._copies[:]
+        del self._sizes[:]
+
+
+class CatalogPhysicalBook(PhysicalBook):
+    """
+    View of a physical book stored in a ColumnarCatalog.
+
+    Reads and writes go straight to the catalog columns, so borrowing
+    through a view updates the stored copy count.
+    """
+
+    __slots__ = ("_catalog", "_row")
+
+    def __init__(self, catalog, row):
+        """
+        Initialize a view of a catalog row.
+
+        Args:
+            catalog (ColumnarCatalog): The catalog holding the book.
+            row (int): The book's row number.
+        """
+        self._catalog = catalog
+        self._row = row
+
+    @property
+    def _id(self):
+        """Read the book ID from the catalog."""
+        return self._catalog._ids[self._row]
+
+    @property
+    def _title(self):
+        """Read the title from the catalog."""
+        return self._catalog._titles[self._row]
+
+    @property
+    def _author(self):
+        """Read the author from the catalog."""
+        return self._catalog._authors[self._row]
+
+    @property
+    def _available_copies(self):
+        """Read the available copies from the catalog."""
+        return self._catalog._copies[self._row]
+
+    @_available_copies.setter
+    def _available_copies(self, value):
+        """Write the available copies to the catalog."""
+        self._catalog._copies[self._row] = value
+
+
+class CatalogEBook(EBook):
+    """View of an e-book stored in a ColumnarCatalog."""
+
+    __slots__ = ("_catalog", "_row")
+
+    def __init__(self, catalog, row):
+        """
+        Initialize a view of a catalog row.
+
+        Args:
+            catalog (ColumnarCatalog): The catalog holding the book.
+            row (int): The book's row number.
+        """
+        self._catalog = catalog
+        self._row = row
+
+    @property
+    def _id(self):
+        """Read the book ID from the catalog."""
+        return self._catalog._ids[self._row]
+
+    @property
+    def _title(self):
+        """Read the title from the catalog."""
+        return self._catalog._titles[self._row]
+
+    @property
+    def _author(self):
+        """Read the author from the catalog."""
+        return self._catalog._authors[self._row]
+
+    @property
+    def _file_size_mb(self):
+        """Read the file size from the catalog."""
+        return self._catalog._sizes[self._row]
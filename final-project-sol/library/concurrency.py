@@ -0,0 +1,314 @@
+"""
+Concurrency module for the Smart Library Management System.
+
+Provides a thread-safe Library with fine-grained locking.
+"""
+
+import threading
+from contextlib import contextmanager
+from .library import Library
+
+# Number of locks members, and separately books, are spread over.
+_STRIPES = 256
+
+
+class SharedLock:
+    """
+    Lock that can be held by many threads at once, or by one thread exclusively.
+
+    Exclusive holders may re-acquire the lock, in either mode, from the same
+    thread, so exclusive operations can call other locked operations.
+    Threads waiting for exclusive mode go first: new shared holders wait
+    behind them, so a steady stream of borrows cannot starve a save. Shared
+    holders must therefore not acquire the lock again in shared mode.
+
+    Attributes:
+        _condition (threading.Condition): Guards the fields below.
+        _readers (int): Number of shared holders.
+        _writer (int): Thread ID of the exclusive holder, or None.
+        _depth (int): Re-entry depth of the exclusive holder.
+        _waiting_writers (int): Number of threads waiting for exclusive mode.
+    """
+
+    def __init__(self):
+        """Initialize an unlocked SharedLock."""
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._depth = 0
+        self._waiting_writers = 0
+
+    @contextmanager
+    def shared(self):
+        """Hold the lock in shared mode for the duration of a with block."""
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._depth += 1
+            else:
+                while self._writer is not None or self._waiting_writers:
+                    self._condition.wait()
+                self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                if self._writer == me:
+                    self._depth -= 1
+                else:
+                    self._readers -= 1
+                    if not self._readers:
+                        self._condition.notify_all()
+
+    @contextmanager
+    def exclusive(self):
+        """Hold the lock in exclusive mode for the duration of a with block."""
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._depth += 1
+            else:
+                self._waiting_writers += 1
+                try:
+                    while self._writer is not None or self._readers:
+                        self._condition.wait()
+                finally:
+                    self._waiting_writers -= 1
+                self._writer = me
+                self._depth = 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._depth -= 1
+                if not self._depth:
+                    self._writer = None
+                    self._condition.notify_all()
+
+
+class ConcurrentLibrary(Library):
+    """
+    Library that can be shared between threads.
+
+    Borrows, returns, and holds lock only the member and book involved, always
+    in the same order (member first, then book), so operations on different
+    books run in parallel without deadlocks and copy counts can never be
+    oversubscribed. Members and books share a fixed number of locks by ID
+    hash (lock striping), so memory stays bounded however many IDs, real or
+    not, are requested. A book's hold queue is only changed under the book's
+    lock, and a returned copy is handed to the next waiting member before
+    that lock is released.
+    Adding books and members takes a short structure lock, and whole-library
+    operations (save, load, catalog imports, recover, compact, binary
+    snapshots, cached loads) lock the library exclusively. Background saves
+    only lock it exclusively for the moment it takes to freeze the state.
+
+    Attributes:
+        _state_lock (SharedLock): Shared by ordinary operations, exclusive for
+            whole-library operations.
+        _structure_lock (threading.RLock): Guards adding books and members and
+            the search index.
+        _index_lock (threading.Lock): Guards indexes shared by all loans and
+            the inventory totals.
+        _journal_lock (threading.Lock): Serializes journal appends.
+        _member_locks (list): Locks for members, picked by ID hash.
+        _book_locks (list): Locks for books, picked by ID hash.
+    """
+
+    def __init__(self, book_store=None):
+        """
+        Initialize an empty ConcurrentLibrary.
+
+        Args:
+            book_store (MutableMapping, optional): Empty mapping used to store
+                books by ID. Defaults to a dict.
+        """
+        self._state_lock = SharedLock()
+        self._structure_lock = threading.RLock()
+        self._index_lock = threading.Lock()
+        self._journal_lock = threading.Lock()
+        self._member_locks = [threading.Lock() for _ in range(_STRIPES)]
+        self._book_locks = [threading.Lock() for _ in range(_STRIPES)]
+        super().__init__(book_store)
+
+    @contextmanager
+    def _locked(self, member_id, book_id):
+        """Hold the locks for one member and one book, in the fixed order."""
+        with self._state_lock.shared():
+            with _lock_for(self._member_locks, member_id):
+                with _lock_for(self._book_locks, book_id):
+                    yield
+
+    def add_book(self, book):
+        """Add a book to the library (see Library.add_book)."""
+        with self._state_lock.shared(), self._structure_lock, self._index_lock:
+            super().add_book(book)
+
+    def add_member(self, member):
+        """Add a member to the library (see Library.add_member)."""
+        with self._state_lock.shared(), self._structure_lock:
+            super().add_member(member)
+
+    def borrow_book(self, member_id, book_id):
+        """Record a member borrowing a book (see Library.borrow_book)."""
+        with self._locked(member_id, book_id):
+            super().borrow_book(member_id, book_id)
+
+    def return_book(self, member_id, book_id):
+        """Record a member returning a book (see Library.return_book)."""
+        with self._locked(member_id, book_id):
+            super().return_book(member_id, book_id)
+
+    def place_hold(self, member_id, book_id):
+        """Queue a member for a book (see Library.place_hold)."""
+        with self._locked(member_id, book_id):
+            return super().place_hold(member_id, book_id)
+
+    def cancel_hold(self, member_id, book_id):
+        """Take a member out of a book's queue (see Library.cancel_hold)."""
+        with self._locked(member_id, book_id):
+            super().cancel_hold(member_id, book_id)
+
+    def _try_borrow(self, member_id, book_id):
+        """Borrow a book for a batch, holding its locks."""
+        with self._locked(member_id, book_id):
+            return super()._try_borrow(member_id, book_id)
+
+    def _try_return(self, member_id, book_id):
+        """Return a book for a batch, holding its locks."""
+        with self._locked(member_id, book_id):
+            return super()._try_return(member_id, book_id)
+
+    def _record_borrow(self, member, book, date_borrowed=None, due_date=None):
+        """Record a borrow while holding the shared index lock."""
+        with self._index_lock:
+            return super()._record_borrow(member, book, date_borrowed, due_date)
+
+    def _record_return(self, member, book):
+        """Record a return while holding the shared index lock."""
+        with self._index_lock:
+            super()._record_return(member, book)
+
+    def _restore_loan(self, loan, index_due=True):
+        """Restore a loan from a snapshot while holding the shared index lock."""
+        with self._index_lock:
+            super()._restore_loan(loan, index_due)
+
+    def overdue_loans(self, today=None, limit=None):
+        """Get overdue loans (see Library.overdue_loans)."""
+        self._materialize()
+        with self._index_lock:
+            return super().overdue_loans(today, limit)
+
+    def next_due_loans(self, n):
+        """Get the loans due back soonest (see Library.next_due_loans)."""
+        self._materialize()
+        with self._index_lock:
+            return super().next_due_loans(n)
+
+    def inventory(self):
+        """Get running totals (see Library.inventory)."""
+        self._materialize()
+        with self._structure_lock, self._index_lock:
+            return super().inventory()
+
+    def verify_inventory(self):
+        """Check the running totals while holding the library exclusively."""
+        self._materialize()
+        with self._state_lock.exclusive():
+            return super().verify_inventory()
+
+    def page_books(self, limit=20, cursor=None):
+        """Get one page of books (see Library.page_books)."""
+        with self._state_lock.shared(), self._structure_lock:
+            return super().page_books(limit, cursor)
+
+    def page_members(self, limit=20, cursor=None):
+        """Get one page of members (see Library.page_members)."""
+        with self._state_lock.shared(), self._structure_lock:
+            return super().page_members(limit, cursor)
+
+    def search(self, query, offset=0, limit=20):
+        """Search books by title and author (see Library.search)."""
+        self._materialize()
+        with self._structure_lock:
+            return super().search(query, offset, limit)
+
+    def snapshot(self):
+        """
+        Take a snapshot while holding the library exclusively.
+
+        Only opening the snapshot holds the library, so no change is half
+        made when it starts; reading it afterwards does not. Iterating the
+        live books, members, or loans views while other threads modify the
+        library can fail; iterate a snapshot instead.
+        """
+        self._materialize()
+        with self._state_lock.exclusive():
+            return super().snapshot()
+
+    def import_catalog(self, filename, fmt=None, chunk_size=10000):
+        """Import a catalog file while holding the library exclusively."""
+        self._materialize()
+        with self._state_lock.exclusive():
+            return super().import_catalog(filename, fmt, chunk_size)
+
+    def save_to_file(self, filename, streaming=None):
+        """Save the library state while holding the library exclusively."""
+        with self._state_lock.exclusive():
+            super().save_to_file(filename, streaming)
+
+    def _freeze(self):
+        """Freeze the state for a background save while holding the library exclusively."""
+        with self._state_lock.exclusive():
+            return super()._freeze()
+
+    def load_from_file(self, filename, lazy=False):
+        """Load the library state while holding the library exclusively."""
+        with self._state_lock.exclusive():
+            super().load_from_file(filename, lazy)
+
+    def recover(self, snapshot_filename, journal_filename):
+        """Recover from a snapshot and journal while holding the library exclusively."""
+        with self._state_lock.exclusive():
+            return super().recover(snapshot_filename, journal_filename)
+
+    def compact(self, snapshot_filename):
+        """Compact the journal while holding the library exclusively."""
+        with self._state_lock.exclusive():
+            super().compact(snapshot_filename)
+
+    def save_binary(self, filename):
+        """Save a binary snapshot while holding the library exclusively."""
+        with self._state_lock.exclusive():
+            super().save_binary(filename)
+
+    def open_snapshot(self, filename):
+        """Open a binary snapshot while holding the library exclusively."""
+        with self._state_lock.exclusive():
+            super().open_snapshot(filename)
+
+    def load_cached(self, filename, cache_filename=None):
+        """Load through a snapshot cache while holding the library exclusively."""
+        with self._state_lock.exclusive():
+            return super().load_cached(filename, cache_filename)
+
+    def _materialize(self):
+        """
+        Finish loading a lazily opened snapshot while holding the library exclusively.
+
+        Callers must not hold the structure, index, or member and book locks.
+        """
+        if self._snapshot is not None or self._pending_loans:
+            with self._state_lock.exclusive():
+                super()._materialize()
+
+    def _log(self, record):
+        """Number and append a journal record while holding the journal lock."""
+        with self._journal_lock:
+            super()._log(record)
+
+
+def _lock_for(locks, key):
+    """Return the lock striped to a key."""
+    return locks[hash(key) % len(locks)]
@@ -0,0 +1,416 @@
+"""
+Copy-on-write module for the Smart Library Management System.
+
+Provides point-in-time versions of a library that can be saved in the
+background or read as snapshots while the library keeps changing.
+"""
+
+import threading
+from collections.abc import Mapping
+from functools import partial
+from itertools import islice
+from . import storage
+from .loan import Loan
+from .member import Member
+
+_CHUNK = 1024
+_SKIP_RATIO = 64
+
+
+class FrozenVersion:
+    """
+    Point-in-time version of a library, kept by copy-on-write.
+
+    Freezing copies nothing. While the version is open, the library reports
+    every change before making it, and the version keeps the old state of
+    whatever is about to change: a book's record or a member's record (with
+    the member's loans) before its first change, and the holds before any
+    queue first changes. Reading the version returns the kept state where
+    there is one, and the live state otherwise.
+
+    Books and members are never removed from a library, and mappings keep
+    insertion order, so the books and members in the version are the first
+    entries of the live mappings, as many as there were when it was frozen.
+    Additions are not copied; reading stops at that count instead, and the
+    IDs added are noted so that looking one up finds nothing.
+
+    Records are read live first and the kept state checked afterwards, so a
+    change racing with the read is always caught: if it started before the
+    check, its old state was kept before it started.
+
+    Attributes:
+        journal_seq (int): Sequence number of the last journaled mutation
+            when the version was frozen.
+        finished (threading.Event): Set once the version is no longer read.
+        _live (dict): The library's books and members mappings, by name.
+        _sizes (dict): Number of entries in each mapping when frozen, by name.
+        _added (dict): IDs added to each mapping since it was frozen, by name.
+        _books (dict): Book records kept before their first change, by ID.
+        _members (dict): (member record, loan records) pairs kept before
+            the member's first change, by ID.
+        _holds (list): Hold records kept before the first change to any
+            queue, or None.
+        _lock (threading.Lock): Serializes keeping the holds with reading them.
+    """
+
+    def __init__(self, books, members, journal_seq=0):
+        """
+        Freeze a version of a library.
+
+        Args:
+            books (MutableMapping): The library's books by ID.
+            members (MutableMapping): The library's members by ID.
+            journal_seq (int, optional): The library's journal sequence number.
+        """
+        self.journal_seq = journal_seq
+        self.finished = threading.Event()
+        self._live = {"books": books, "members": members}
+        self._sizes = {"books": len(books), "members": len(members)}
+        self._added = {"books": set(), "members": set()}
+        self._books = {}
+        self._members = {}
+        self._holds = None
+        self._lock = threading.Lock()
+
+    def keep_added(self, name, keys):
+        """
+        Note IDs about to be added to the books or members mapping.
+
+        Args:
+            name (str): "books" or "members".
+            keys (iterable): The IDs being added.
+        """
+        self._added[name].update(keys)
+
+    def get(self, name, key):
+        """
+        Look up a book or member in the version.
+
+        Args:
+            name (str): "books" or "members".
+            key (str): The book or member ID.
+
+        Returns:
+            The live book or member, or None if it was not in the library
+            when the version was frozen.
+        """
+        value = self._live[name].get(key)
+        if value is None or key in self._added[name]:
+            return None
+        return value
+
+    def size(self, name):
+        """Return the number of books or members in the version."""
+        return self._sizes[name]
+
+    def keep_book(self, book):
+        """Keep a book's record before its first change."""
+        if book.id not in self._books:
+            self._books.setdefault(book.id, book.to_dict())
+
+    def keep_member(self, member, loans):
+        """
+        Keep a member's record and loan records before the member's first change.
+
+        Args:
+            member (Member): The member about to change.
+            loans (LoanIndex): The library's loans.
+        """
+        # A member can change in two threads at once (a borrow and a hold
+        # being handed to them), so the first record kept wins.
+        if member.member_id not in self._members:
+            self._members.setdefault(member.member_id, self._member_records(member, loans))
+
+    def keep_holds(self, records):
+        """
+        Keep the hold records before any queue first changes.
+
+        Args:
+            records (callable): Returns the library's current hold records.
+        """
+        if self._holds is None:
+            with self._lock:
+                if self._holds is None:
+                    self._holds = list(records())
+
+    def values(self, name):
+        """
+        Iterate over the books or members in the version.
+
+        Entries are read from the live mapping in chunks, up to its size
+        when the version was frozen. An addition between chunks invalidates
+        the mapping's iterator, so reading then resumes from a new one,
+        skipping the entries already read. Chunks grow with the position so
+        that skipping costs little per entry read, however often the
+        library adds books or members during the save.
+
+        Args:
+            name (str): "books" or "members".
+
+        Yields:
+            The books or members, in insertion order.
+        """
+        mapping = self._live[name]
+        size = self._sizes[name]
+        position = 0
+        entries = None
+        while position < size:
+            count = min(max(_CHUNK, position // _SKIP_RATIO), size - position)
+            if entries is None or len(mapping) != length:
+                length = len(mapping)
+                entries = islice(iter(mapping.values()), position, None)
+            try:
+                chunk = list(islice(entries, count))
+            except RuntimeError:
+                # The mapping grew while the chunk was read.
+                entries = None
+                continue
+            if not chunk:
+                return
+            position += len(chunk)
+            yield from chunk
+
+    def book_record(self, book):
+        """Return a book's record as of the version."""
+        record = book.to_dict()
+        return self._books.get(book.id, record)
+
+    def member_records(self, member, loans):
+        """
+        Return a member's record and loan records as of the version.
+
+        Args:
+            member (Member): The member.
+            loans (LoanIndex): The library's loans.
+
+        Returns:
+            tuple: (member record, list of loan records).
+        """
+        records = self._member_records(member, loans)
+        return self._members.get(member.member_id, records)
+
+    def hold_records(self, records):
+        """
+        Return the hold records as of the version.
+
+        Args:
+            records (callable): Returns the library's current hold records.
+
+        Returns:
+            list: The hold records.
+        """
+        with self._lock:
+            if self._holds is not None:
+                return self._holds
+            return list(records())
+
+    @staticmethod
+    def _member_records(member, loans):
+        """Read a member's live record and loan records."""
+        record = member.to_dict()
+        member_id = member.member_id
+        loan_records = []
+        for book_id in record["borrowed_books"]:
+            loan = loans.get(member_id, book_id)
+            if loan is not None:
+                loan_records.append(loan.to_dict())
+        return record, loan_records
+
+
+class FrozenMapping(Mapping):
+    """
+    Read-only mapping of the books or members in a frozen version.
+
+    A value is built the first time it is looked up, from its record as of
+    the version, and kept. Iterating over the keys or taking the length
+    builds nothing.
+
+    Attributes:
+        _version (FrozenVersion): The version read.
+        _name (str): "books" or "members".
+        _key (callable): Returns the key of a live book or member.
+        _build (callable): Builds the value for a live book or member.
+        _built (dict): Values built so far, by key.
+    """
+
+    def __init__(self, version, name, key, build):
+        """
+        Initialize a FrozenMapping.
+
+        Args:
+            version (FrozenVersion): The version to read.
+            name (str): "books" or "members".
+            key (callable): Returns the key of a live book or member.
+            build (callable): Builds the value for a live book or member.
+        """
+        self._version = version
+        self._name = name
+        self._key = key
+        self._build = build
+        self._built = {}
+
+    def __getitem__(self, key):
+        """Return the value for a key, building it if needed."""
+        value = self._built.get(key)
+        if value is not None:
+            return value
+        live = self._version.get(self._name, key)
+        if live is None:
+            raise KeyError(key)
+        return self._built.setdefault(key, self._build(live))
+
+    def __contains__(self, key):
+        """Check whether a key is present, without building its value."""
+        return self._version.get(self._name, key) is not None
+
+    def __iter__(self):
+        """Iterate over the keys in insertion order."""
+        key = self._key
+        return (key(value) for value in self._version.values(self._name))
+
+    def __len__(self):
+        """Return the number of entries."""
+        return self._version.size(self._name)
+
+
+class LibrarySnapshot:
+    """
+    Point-in-time picture of a library's books, members, and loans.
+
+    Taking a snapshot copies nothing: it opens a FrozenVersion, for which
+    the library keeps the old record of a book or member the first time it
+    changes. Books and members are built from their records as of the
+    snapshot the first time they are looked up, and the loans the first
+    time they are read, so none of them are the library's objects and none
+    of them change. The library keeps records for the snapshot until it is
+    discarded.
+
+    Attributes:
+        books (FrozenMapping): Read-only mapping of book IDs to books.
+        members (FrozenMapping): Read-only mapping of member IDs to members.
+        _version (FrozenVersion): The version read.
+        _loan_index (LoanIndex): The library's loans, to read loan records.
+        _loans (tuple): The loans, once built, or None.
+    """
+
+    __slots__ = ("books", "members", "_version", "_loan_index", "_loans", "__weakref__")
+
+    def __init__(self, version, loans):
+        """
+        Take a snapshot.
+
+        Args:
+            version (FrozenVersion): A version the library keeps records for.
+            loans (LoanIndex): The library's loans.
+        """
+        self._version = version
+        self._loan_index = loans
+        self._loans = None
+        # The builders refer to the version and the mappings, not to the
+        # snapshot, so that dropping the snapshot frees it straight away.
+        self.books = FrozenMapping(version, "books", _book_id, partial(_build_book, version))
+        self.members = FrozenMapping(
+            version, "members", _member_id, partial(_build_member, version, loans, self.books)
+        )
+
+    @property
+    def loans(self):
+        """Get the active loans as of the snapshot, grouped by member, as a tuple."""
+        if self._loans is None:
+            loans = []
+            for member in self._version.values("members"):
+                records = self._version.member_records(member, self._loan_index)[1]
+                if records:
+                    copy = self.members[member.member_id]
+                    for record in records:
+                        loans.append(Loan(
+                            self.books[record["book_id"]],
+                            copy,
+                            record["date_borrowed"],
+                            record["due_date"],
+                        ))
+            self._loans = tuple(loans)
+        return self._loans
+
+    def __str__(self):
+        """Return a readable summary of the snapshot."""
+        return (
+            f"Snapshot: {len(self.books)} books, {len(self.members)} members, "
+            f"and {len(self.loans)} active loans"
+        )
+
+
+def _build_book(version, book):
+    """Build a book as of a version."""
+    return storage.book_from_dict(version.book_record(book))
+
+
+def _build_member(version, loans, books, member):
+    """Build a member as of a version, borrowing books from the version's mapping."""
+    record = version.member_records(member, loans)[0]
+    copy = Member(record["member_id"], record["name"])
+    for book_id in record["borrowed_books"]:
+        copy.borrow_book(books[book_id])
+    return copy
+
+
+def _book_id(book):
+    """Return a book's ID."""
+    return book.id
+
+
+def _member_id(member):
+    """Return a member's ID."""
+    return member.member_id
+
+
+class BackgroundSave:
+    """
+    Handle for a save running in a background thread.
+
+    Attributes:
+        _thread (threading.Thread): The thread doing the save.
+        _error (BaseException): The exception the save raised, or None.
+    """
+
+    def __init__(self, target):
+        """
+        Start a save in a new thread.
+
+        Args:
+            target (callable): Does the save.
+        """
+        self._error = None
+        self._thread = threading.Thread(target=self._run, args=(target,), name="library-save")
+        self._thread.start()
+
+    def _run(self, target):
+        """Run the save, keeping any exception for wait()."""
+        try:
+            target()
+        except BaseException as e:
+            self._error = e
+
+    def done(self):
+        """Check whether the save has finished."""
+        return not self._thread.is_alive()
+
+    def wait(self, timeout=None):
+        """
+        Wait for the save to finish.
+
+        Args:
+            timeout (float, optional): Seconds to wait. Defaults to no limit.
+
+        Returns:
+            bool: True if the save finished, False on timeout.
+
+        Raises:
+            Exception: Whatever the save raised, if it failed.
+        """
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            return False
+        if self._error is not None:
+            raise self._error
+        return True
@@ -0,0 +1,118 @@
+"""
+Deferred module for the Smart Library Management System.
+
+Provides a mapping whose entries can have work deferred until first access.
+"""
+
+from collections.abc import MutableMapping
+from threading import RLock
+
+
+class DeferredMap(MutableMapping):
+    """
+    Mapping that runs deferred work for an entry the first time it is read.
+
+    Items deferred for a key are collected in a list and handed, together
+    with the entry's value, to the resolve function on the next get or
+    item lookup of that key. Checking membership, iterating over keys, and
+    taking the length never resolve anything.
+
+    Attributes:
+        _data (dict): The entries.
+        _deferred (dict): Maps keys to the items deferred for them.
+        _resolve (callable): Called as resolve(value, items) to do the work.
+        _lock (threading.RLock): Guards resolution.
+    """
+
+    def __init__(self, resolve):
+        """
+        Initialize an empty DeferredMap.
+
+        Args:
+            resolve (callable): Called as resolve(value, items) with an entry
+                and the items deferred for it, when the entry is first read.
+        """
+        self._data = {}
+        self._deferred = {}
+        self._resolve = resolve
+        self._lock = RLock()
+
+    def defer(self, key, item):
+        """
+        Defer an item for a key until the key is next read.
+
+        Args:
+            key: The key the item belongs to.
+            item: Anything the resolve function understands.
+        """
+        items = self._deferred.get(key)
+        if items is None:
+            self._deferred[key] = [item]
+        else:
+            items.append(item)
+
+    def resolve_all(self):
+        """
+        Resolve every deferred item.
+
+        Returns:
+            dict: The entries, as a plain dictionary.
+        """
+        for key in list(self._deferred):
+            self._settle(key)
+        return self._data
+
+    def get(self, key, default=None):
+        """Return the value for a key after resolving its deferred items, or default."""
+        if self._deferred:
+            self._settle(key)
+        return self._data.get(key, default)
+
+    def __getitem__(self, key):
+        """Return the value for a key after resolving its deferred items."""
+        if self._deferred:
+            self._settle(key)
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        """Add or replace an entry."""
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        """Remove an entry and anything deferred for it."""
+        del self._data[key]
+        self._deferred.pop(key, None)
+
+    def __contains__(self, key):
+        """Check whether a key is present, without resolving anything."""
+        return key in self._data
+
+    def __iter__(self):
+        """Iterate over keys in insertion order."""
+        return iter(self._data)
+
+    def __reversed__(self):
+        """Iterate over keys, most recently added first."""
+        return reversed(self._data)
+
+    def __len__(self):
+        """Return the number of entries."""
+        return len(self._data)
+
+    def clear(self):
+        """Remove all entries and deferred items."""
+        self._data.clear()
+        self._deferred.clear()
+
+    def _settle(self, key):
+        """Resolve the items deferred for one key, if any."""
+        if key not in self._deferred:
+            return
+        with self._lock:
+            items = self._deferred.get(key)
+            if items is None:
+                return
+            # Stay listed as deferred until resolved, so other readers wait.
+            if key in self._data:
+                self._resolve(self._data[key], items)
+            del self._deferred[key]
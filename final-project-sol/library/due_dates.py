@@ -0,0 +1,106 @@
+"""
+Due dates module for the Smart Library Management System.
+
+Provides a priority queue of active loans ordered by due date.
+"""
+
+import heapq
+from itertools import count
+
+
+class DueDateIndex:
+    """
+    Min-heap of active loans ordered by due date.
+
+    Returned loans are not removed from the heap right away; they are skipped
+    when encountered and purged once they make up half of the heap. Queries do
+    not modify the heap: they walk it best-first, so finding the k earliest
+    loans costs O(k log k) instead of touching every loan.
+
+    Attributes:
+        _loans (LoanIndex): The active loans, used to recognize returned ones.
+        _heap (list): Heap of (due_day, sequence, loan) entries.
+        _stale (int): Number of entries for loans that were returned.
+    """
+
+    def __init__(self, loans):
+        """
+        Initialize an empty DueDateIndex.
+
+        Args:
+            loans (LoanIndex): The library's active loans.
+        """
+        self._loans = loans
+        self._heap = []
+        self._stale = 0
+        self._sequence = count()
+
+    def push(self, loan):
+        """
+        Add an active loan.
+
+        Args:
+            loan (Loan): The loan to add.
+        """
+        heapq.heappush(self._heap, (loan.due_day, next(self._sequence), loan))
+
+    def discard(self, loan):
+        """
+        Note that a loan is no longer active.
+
+        Args:
+            loan (Loan): The returned loan.
+        """
+        self._stale += 1
+        if self._stale * 2 > len(self._heap):
+            self.rebuild()
+
+    def rebuild(self):
+        """Rebuild the heap from the active loans in linear time."""
+        sequence = self._sequence
+        self._heap = [(loan.due_day, next(sequence), loan) for loan in self._loans]
+        heapq.heapify(self._heap)
+        self._stale = 0
+
+    def clear(self):
+        """Remove all loans."""
+        self._heap = []
+        self._stale = 0
+
+    def earliest(self, limit=None, before_day=None):
+        """
+        Yield active loans in due date order.
+
+        Args:
+            limit (int, optional): Maximum number of loans to yield.
+            before_day (int, optional): Only yield loans due before this day ordinal.
+
+        Yields:
+            Loan: Active loans, earliest due first.
+        """
+        heap = self._heap
+        if not heap or limit == 0:
+            return
+        found = 0
+        frontier = [(heap[0][0], heap[0][1], 0)]
+        while frontier:
+            due_day, _, position = heapq.heappop(frontier)
+            if before_day is not None and due_day >= before_day:
+                return
+            loan = heap[position][2]
+            if self._is_active(loan):
+                yield loan
+                found += 1
+                if found == limit:
+                    return
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child][0], heap[child][1], child))
+
+    def _is_active(self, loan):
+        """Check whether a loan in the heap has not been returned."""
+        return self._loans.get(loan.member.member_id, loan.book.id) is loan
+
+    def __len__(self):
+        """Return the number of active loans."""
+        return len(self._heap) - self._stale
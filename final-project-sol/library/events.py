@@ -0,0 +1,250 @@
+"""
+Events module for the Smart Library Management System.
+
+Provides an in-process change event stream. The library publishes an event
+for every change to a bounded ring buffer, and any number of subscribers read
+from it by sequence number at their own pace.
+"""
+
+import threading
+import time
+
+
+class Event:
+    """
+    Represents one change to the library.
+
+    Attributes:
+        seq (int): Sequence number, starting at 1 and increasing by 1.
+        kind (str): One of the kinds listed in Event.KINDS.
+        book_id (str): The book involved, or None.
+        member_id (str): The member involved, or None.
+        timestamp (float): When the event was published, in seconds since the epoch.
+    """
+
+    BOOK_ADDED = "book_added"
+    MEMBER_ADDED = "member_added"
+    BOOK_BORROWED = "book_borrowed"
+    BOOK_RETURNED = "book_returned"
+    HOLD_PLACED = "hold_placed"
+    HOLD_CANCELLED = "hold_cancelled"
+    # The whole library was replaced (load, snapshot, or recovery), so
+    # subscribers keeping their own copy must rebuild it.
+    LIBRARY_LOADED = "library_loaded"
+
+    KINDS = (
+        BOOK_ADDED,
+        MEMBER_ADDED,
+        BOOK_BORROWED,
+        BOOK_RETURNED,
+        HOLD_PLACED,
+        HOLD_CANCELLED,
+        LIBRARY_LOADED,
+    )
+
+    __slots__ = ("seq", "kind", "book_id", "member_id", "timestamp")
+
+    def __init__(self, seq, kind, book_id=None, member_id=None, timestamp=None):
+        """
+        Initialize an Event instance.
+
+        Args:
+            seq (int): Sequence number.
+            kind (str): The kind of change.
+            book_id (str, optional): The book involved.
+            member_id (str, optional): The member involved.
+            timestamp (float, optional): When the change happened. Defaults to now.
+        """
+        self.seq = seq
+        self.kind = kind
+        self.book_id = book_id
+        self.member_id = member_id
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    def to_dict(self):
+        """
+        Convert the event to a dictionary.
+
+        Returns:
+            dict: Dictionary with the event's fields.
+        """
+        return {
+            "seq": self.seq,
+            "kind": self.kind,
+            "book_id": self.book_id,
+            "member_id": self.member_id,
+            "timestamp": self.timestamp,
+        }
+
+    def __str__(self):
+        """Return a readable string representation of the event."""
+        involved = ", ".join(
+            f"{name} {value}"
+            for name, value in (("member", self.member_id), ("book", self.book_id))
+            if value is not None
+        )
+        return f"#{self.seq} {self.kind}" + (f": {involved}" if involved else "")
+
+    def __eq__(self, other):
+        """Compare events by all of their fields."""
+        if not isinstance(other, Event):
+            return False
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+
+class EventBus:
+    """
+    Bounded ring buffer of library events.
+
+    Publishing never waits for subscribers: once the buffer is full, each
+    new event overwrites the oldest one. Subscribers remember the sequence
+    number they have read up to, so a slow subscriber can tell how many
+    events it missed and resynchronize instead of holding the library up.
+
+    Attributes:
+        capacity (int): The number of events kept.
+        _buffer (list): The events, event seq stored at seq % capacity.
+        _last_seq (int): Sequence number of the newest event, 0 if none.
+        _condition (threading.Condition): Guards the buffer and wakes
+            waiting readers.
+        _waiting (int): Number of readers waiting for an event.
+    """
+
+    def __init__(self, capacity=65536):
+        """
+        Initialize an empty EventBus.
+
+        Args:
+            capacity (int, optional): The number of events kept. Defaults to 65536.
+
+        Raises:
+            ValueError: If capacity is not positive.
+        """
+        if capacity < 1:
+            raise ValueError("Capacity must be positive.")
+        self.capacity = capacity
+        self._buffer = [None] * capacity
+        self._last_seq = 0
+        self._condition = threading.Condition(threading.Lock())
+        self._waiting = 0
+
+    @property
+    def last_seq(self):
+        """Get the sequence number of the newest event, or 0 if none."""
+        return self._last_seq
+
+    @property
+    def first_seq(self):
+        """Get the sequence number of the oldest event still kept."""
+        return max(1, self._last_seq - self.capacity + 1)
+
+    def publish(self, kind, book_id=None, member_id=None):
+        """
+        Add an event, overwriting the oldest one if the buffer is full.
+
+        Args:
+            kind (str): The kind of change.
+            book_id (str, optional): The book involved.
+            member_id (str, optional): The member involved.
+
+        Returns:
+            Event: The published event.
+        """
+        with self._condition:
+            seq = self._last_seq + 1
+            event = Event(seq, kind, book_id, member_id)
+            self._buffer[seq % self.capacity] = event
+            self._last_seq = seq
+            if self._waiting:
+                self._condition.notify_all()
+        return event
+
+    def read(self, after=0, limit=None, timeout=None):
+        """
+        Get the events newer than a sequence number, oldest first.
+
+        Events that were already overwritten are skipped; compare the first
+        event's seq with after + 1 to detect them.
+
+        Args:
+            after (int, optional): Sequence number already read. Defaults to 0.
+            limit (int, optional): Maximum number of events. Defaults to all.
+            timeout (float, optional): Seconds to wait for an event if none is
+                newer than after. Defaults to not waiting.
+
+        Returns:
+            list: The events.
+        """
+        with self._condition:
+            if timeout is not None and self._last_seq <= after:
+                self._waiting += 1
+                try:
+                    self._condition.wait_for(lambda: self._last_seq > after, timeout)
+                finally:
+                    self._waiting -= 1
+            start = max(after + 1, self.first_seq)
+            stop = self._last_seq + 1
+            if limit is not None:
+                stop = min(stop, start + limit)
+            buffer, capacity = self._buffer, self.capacity
+            return [buffer[seq % capacity] for seq in range(start, stop)]
+
+    def subscribe(self, from_start=False):
+        """
+        Start following the event stream.
+
+        Args:
+            from_start (bool, optional): Whether to begin with the oldest kept
+                event instead of the next one published. Defaults to False.
+
+        Returns:
+            Subscription: The new subscription.
+        """
+        position = self.first_seq - 1 if from_start else self._last_seq
+        return Subscription(self, position)
+
+
+class Subscription:
+    """
+    A reader's position in an EventBus.
+
+    Attributes:
+        position (int): Sequence number of the last event read.
+        missed (int): Number of events overwritten before they were read.
+        _bus (EventBus): The bus being read.
+    """
+
+    def __init__(self, bus, position):
+        """
+        Initialize a Subscription.
+
+        Args:
+            bus (EventBus): The bus to read.
+            position (int): Sequence number of the last event already read.
+        """
+        self._bus = bus
+        self.position = position
+        self.missed = 0
+
+    def poll(self, limit=None, timeout=None):
+        """
+        Get the events published since the last poll.
+
+        Args:
+            limit (int, optional): Maximum number of events. Defaults to all.
+            timeout (float, optional): Seconds to wait if there are none.
+                Defaults to not waiting.
+
+        Returns:
+            list: The events, oldest first.
+        """
+        events = self._bus.read(self.position, limit, timeout)
+        if events:
+            self.missed += events[0].seq - self.position - 1
+            self.position = events[-1].seq
+        return events
+
+    @property
+    def lag(self):
+        """Get the number of published events not read yet."""
+        return self._bus.last_seq - self.position
@@ -0,0 +1,143 @@
+"""
+Holds module for the Smart Library Management System.
+
+Provides a first-in, first-out queue of members waiting for a book.
+"""
+
+from bisect import bisect_left, insort
+from collections import deque
+
+
+class HoldQueue:
+    """
+    First-in, first-out queue of members waiting for one book.
+
+    Every hold gets an increasing ticket number. A member's position is
+    their ticket minus the tickets already served, less the cancelled
+    tickets ahead of them, so positions are found without walking the
+    queue. Cancelled holds stay in the queue and are skipped when they
+    reach the front.
+
+    Attributes:
+        _tickets (dict): Maps waiting member IDs to their tickets.
+        _order (deque): (ticket, member_id) pairs in arrival order,
+            including cancelled ones.
+        _next (int): The next ticket to hand out.
+        _base (int): The lowest ticket that may still be waiting.
+        _cancelled (list): Sorted cancelled tickets not below _base.
+    """
+
+    __slots__ = ("_tickets", "_order", "_next", "_base", "_cancelled")
+
+    def __init__(self):
+        """Initialize an empty HoldQueue."""
+        self._tickets = {}
+        self._order = deque()
+        self._next = 0
+        self._base = 0
+        self._cancelled = []
+
+    def push(self, member_id):
+        """
+        Add a member to the back of the queue.
+
+        Args:
+            member_id (str): The waiting member.
+
+        Returns:
+            int: The member's position, starting at 1.
+
+        Raises:
+            ValueError: If the member is already waiting.
+        """
+        if member_id in self._tickets:
+            raise ValueError(f"Member '{member_id}' is already waiting.")
+        ticket = self._next
+        self._next += 1
+        self._tickets[member_id] = ticket
+        self._order.append((ticket, member_id))
+        return len(self._tickets)
+
+    def pop(self):
+        """
+        Remove and return the member at the front of the queue.
+
+        Returns:
+            str: The member ID, or None if nobody is waiting.
+        """
+        while self._order:
+            ticket, member_id = self._order.popleft()
+            self._advance(ticket + 1)
+            if self._tickets.get(member_id) == ticket:
+                del self._tickets[member_id]
+                return member_id
+        return None
+
+    def peek(self):
+        """
+        Return the member at the front of the queue without removing them.
+
+        Returns:
+            str: The member ID, or None if nobody is waiting.
+        """
+        order = self._order
+        while order:
+            ticket, member_id = order[0]
+            if self._tickets.get(member_id) == ticket:
+                return member_id
+            order.popleft()
+            self._advance(ticket + 1)
+        return None
+
+    def remove(self, member_id):
+        """
+        Cancel a member's hold.
+
+        Args:
+            member_id (str): The waiting member.
+
+        Returns:
+            bool: True if the member was waiting.
+        """
+        ticket = self._tickets.pop(member_id, None)
+        if ticket is None:
+            return False
+        insort(self._cancelled, ticket)
+        return True
+
+    def position(self, member_id):
+        """
+        Get a member's position in the queue.
+
+        Args:
+            member_id (str): The member ID.
+
+        Returns:
+            int: The position, starting at 1, or None if the member is not waiting.
+        """
+        ticket = self._tickets.get(member_id)
+        if ticket is None:
+            return None
+        return ticket - self._base - bisect_left(self._cancelled, ticket) + 1
+
+    def _advance(self, base):
+        """Note that every ticket below base has left the queue."""
+        self._base = base
+        if self._cancelled and self._cancelled[0] < base:
+            del self._cancelled[:bisect_left(self._cancelled, base)]
+
+    def __contains__(self, member_id):
+        """Check whether a member is waiting."""
+        return member_id in self._tickets
+
+    def __len__(self):
+        """Return the number of waiting members."""
+        return len(self._tickets)
+
+    def __iter__(self):
+        """Iterate over waiting member IDs, front first."""
+        tickets = self._tickets
+        return (
+            member_id for ticket, member_id in list(self._order)
+            if tickets.get(member_id) == ticket
+        )
@@ -0,0 +1,174 @@
+"""
+Importer module for the Smart Library Management System.
+
+Reads book catalogs from CSV or JSON lines files for bulk import.
+
+Both formats use the field names of the save format: type, id, title,
+author, and available_copies (physical books) or file_size_mb (e-books).
+CSV files need a header row; fields a row's type does not use may be left
+empty.
+"""
+
+import csv
+import json
+import math
+import os
+from . import storage
+
+FORMATS = ("csv", "jsonl")
+
+_EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+def detect_format(filename):
+    """
+    Work out a catalog file's format from its extension.
+
+    Args:
+        filename (str): Path to the catalog file.
+
+    Returns:
+        str: "csv" or "jsonl".
+
+    Raises:
+        ValueError: If the extension is not recognized.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in _EXTENSIONS:
+        raise ValueError(f"Cannot tell the format of '{filename}'; pass csv or jsonl.")
+    return _EXTENSIONS[extension]
+
+
+def read_rows(file, fmt):
+    """
+    Read the rows of a catalog file.
+
+    Args:
+        file: A text file opened for reading (with newline="" for CSV).
+        fmt (str): "csv" or "jsonl".
+
+    Yields:
+        tuple: Pairs of (line number, row dict). The row is None if the
+            line is not a JSON object. Blank JSON lines are skipped.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "jsonl":
+        loads = json.loads
+        for number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                row = loads(line)
+            except ValueError:
+                row = None
+            yield number, row if isinstance(row, dict) else None
+    else:
+        raise ValueError(f"Unknown catalog format '{fmt}'.")
+
+
+def book_from_row(row):
+    """
+    Build a book from a catalog row.
+
+    Numbers may be given as strings, as they are in CSV files. The rest of
+    the validation is left to the PhysicalBook and EBook constructors.
+
+    Args:
+        row (dict): The row, keyed by field name.
+
+    Returns:
+        Book: A PhysicalBook or EBook instance.
+
+    Raises:
+        ValueError: If the row is missing a field or holds an invalid value.
+    """
+    data = {}
+    for field in ("type", "id", "title", "author"):
+        value = row.get(field)
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError(f"Missing {field}.")
+        data[field] = value.strip()
+    if data["type"] == "PhysicalBook":
+        data["available_copies"] = _to_int(row.get("available_copies"), "available_copies")
+    elif data["type"] == "EBook":
+        data["file_size_mb"] = _to_float(row.get("file_size_mb"), "file_size_mb")
+    return storage.book_from_dict(data)
+
+
+class ImportReport:
+    """
+    Represents the outcome of a bulk import.
+
+    Attributes:
+        imported (int): Number of books added to the library.
+        rejected (list): (line number, book ID, reason) tuples for the rows
+            that were not imported, in file order. The book ID is None when
+            the row has none.
+    """
+
+    def __init__(self):
+        """Initialize an empty ImportReport."""
+        self.imported = 0
+        self.rejected = []
+
+    @property
+    def ok(self):
+        """Check whether every row was imported."""
+        return not self.rejected
+
+    def reject(self, line, book_id, reason):
+        """
+        Record a rejected row.
+
+        Args:
+            line (int): The row's line number in the file.
+            book_id (str): The row's book ID, or None.
+            reason (str): Why the row was rejected.
+        """
+        self.rejected.append((line, book_id, reason))
+
+    def save_rejected(self, filename):
+        """
+        Write the rejected rows to a CSV file.
+
+        Args:
+            filename (str): Path to the output file.
+        """
+        with open(filename, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("line", "id", "reason"))
+            writer.writerows(self.rejected)
+
+    def __str__(self):
+        """Return a readable summary of the import."""
+        return f"Imported {self.imported} books; rejected {len(self.rejected)} rows."
+
+
+def _to_int(value, field):
+    """Convert a row value to a whole number."""
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            pass
+    elif isinstance(value, int) and not isinstance(value, bool):
+        return value
+    raise ValueError(f"Invalid {field} {value!r}.")
+
+
+def _to_float(value, field):
+    """Convert a row value to a finite number."""
+    if isinstance(value, str):
+        try:
+            value = float(value.strip())
+        except ValueError:
+            pass
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+        return value
+    raise ValueError(f"Invalid {field} {value!r}.")
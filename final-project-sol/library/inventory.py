@@ -0,0 +1,98 @@
+"""
+Inventory module for the Smart Library Management System.
+
+Provides running totals over the book collection.
+"""
+
+from .book import PhysicalBook
+
+
+class InventoryStats:
+    """
+    Running totals over a book collection, updated as books change.
+
+    The library reports every added book and every change to a physical
+    book's copy count, so reading the totals never needs a scan.
+    recount() computes the same totals from scratch, for verification.
+
+    Attributes:
+        physical_titles (int): Number of physical books.
+        ebook_titles (int): Number of e-books.
+        available_copies (int): Copies of physical books on the shelf.
+        checked_out_titles (int): Physical books with no copies available.
+    """
+
+    FIELDS = ("physical_titles", "ebook_titles", "available_copies", "checked_out_titles")
+
+    def __init__(self):
+        """Initialize InventoryStats for an empty collection."""
+        self.clear()
+
+    def clear(self):
+        """Reset all totals to zero."""
+        self.physical_titles = 0
+        self.ebook_titles = 0
+        self.available_copies = 0
+        self.checked_out_titles = 0
+
+    def add_book(self, book):
+        """
+        Count a book added to the collection.
+
+        Args:
+            book (Book): The added book.
+        """
+        if isinstance(book, PhysicalBook):
+            self.physical_titles += 1
+            self.available_copies += book.available_copies
+            if book.available_copies == 0:
+                self.checked_out_titles += 1
+        else:
+            self.ebook_titles += 1
+
+    def copies_changed(self, book, delta):
+        """
+        Count a change to a book's available copies.
+
+        Must be called after the change, with the amount it changed by.
+        Changes to e-books are ignored.
+
+        Args:
+            book (Book): The book whose copies changed.
+            delta (int): The change in available copies (-1 for a borrow,
+                +1 for a return).
+        """
+        if not isinstance(book, PhysicalBook):
+            return
+        self.available_copies += delta
+        after = book.available_copies
+        before = after - delta
+        if before == 0 and after != 0:
+            self.checked_out_titles -= 1
+        elif before != 0 and after == 0:
+            self.checked_out_titles += 1
+
+    @classmethod
+    def recount(cls, books):
+        """
+        Compute the totals for a collection from scratch.
+
+        Args:
+            books (iterable): The books in the collection.
+
+        Returns:
+            InventoryStats: The totals.
+        """
+        stats = cls()
+        for book in books:
+            stats.add_book(book)
+        return stats
+
+    def to_dict(self):
+        """
+        Convert the totals to a dictionary.
+
+        Returns:
+            dict: Maps each field name to its value.
+        """
+        return {field: getattr(self, field) for field in self.FIELDS}
@@ -0,0 +1,153 @@
+"""
+Journal module for the Smart Library Management System.
+
+Provides an append-only write-ahead log of library mutations.
+"""
+
+import json
+import os
+
+
+class Journal:
+    """
+    Append-only log of library mutations.
+
+    Each record is written as one compact JSON line. Records are flushed to
+    disk with fsync in batches (group commit): every batch_size records, or
+    whenever sync() is called. Records appended since the last sync may be
+    lost in a crash; everything before it is durable.
+
+    Attributes:
+        _filename (str): Path to the journal file.
+        _batch_size (int): Number of records written between fsync calls.
+        _file: The open journal file.
+        _pending (int): Number of records written since the last fsync.
+    """
+
+    def __init__(self, filename, batch_size=64):
+        """
+        Open a journal for appending.
+
+        Anything after the last complete record is removed first.
+
+        Args:
+            filename (str): Path to the journal file. It is created if missing.
+            batch_size (int, optional): Number of records per fsync. Defaults to 64.
+
+        Raises:
+            ValueError: If batch_size is less than 1.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1.")
+        self._filename = filename
+        self._batch_size = batch_size
+        Journal.repair(filename)
+        self._file = open(filename, "a")
+        self._pending = 0
+        self._encode = json.JSONEncoder(separators=(",", ":")).encode
+
+    @property
+    def filename(self):
+        """Get the journal file path."""
+        return self._filename
+
+    @property
+    def pending(self):
+        """Get the number of records not yet synced to disk."""
+        return self._pending
+
+    def append(self, record):
+        """
+        Append a record to the journal.
+
+        Args:
+            record (dict): The record to append.
+        """
+        self._file.write(self._encode(record) + "\n")
+        self._pending += 1
+        if self._pending >= self._batch_size:
+            self.sync()
+
+    def sync(self):
+        """Flush all written records and fsync them to disk."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def truncate(self):
+        """Discard all records, e.g. after they were folded into a snapshot."""
+        self._file.truncate(0)
+        self._file.seek(0)
+        self.sync()
+
+    def close(self):
+        """Sync any pending records and close the journal."""
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self):
+        """Return the journal for use in a with statement."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the journal when leaving a with statement."""
+        self.close()
+
+    @staticmethod
+    def read(filename):
+        """
+        Read the records in a journal file.
+
+        Reading stops at the first incomplete or corrupt line, which is what a
+        crash in the middle of a write leaves behind.
+
+        Args:
+            filename (str): Path to the journal file.
+
+        Yields:
+            dict: Journal records in the order they were written.
+        """
+        for record, _ in Journal._records(filename):
+            yield record
+
+    @staticmethod
+    def repair(filename):
+        """
+        Cut a journal file off after its last complete record.
+
+        Args:
+            filename (str): Path to the journal file.
+
+        Returns:
+            int: The number of bytes removed.
+        """
+        if not os.path.exists(filename):
+            return 0
+        end = 0
+        for _, end in Journal._records(filename):
+            pass
+        size = os.path.getsize(filename)
+        if size > end:
+            with open(filename, "r+b") as f:
+                f.truncate(end)
+                f.flush()
+                os.fsync(f.fileno())
+        return size - end
+
+    @staticmethod
+    def _records(filename):
+        """Yield (record, offset just past it) for each complete, valid record."""
+        if not os.path.exists(filename):
+            return
+        end = 0
+        with open(filename, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    return
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    return
+                end += len(line)
+                yield record, end
@@ -4,10 +4,27 @@ Library module for the Smart Library Management System.
 Provides the main Library class that coordinates all library operations.
 """
 
+import base64
 import json
-from .book import PhysicalBook, EBook
+import os
+import weakref
+from datetime import date
+from itertools import islice
+from . import importer, storage
 from .member import Member
-from .loan import Loan
+from .loan import Loan, to_day
+from .loan_index import LoanIndex
+from .journal import Journal
+from .events import Event
+from .results import OperationResult
+from .search import SearchIndex
+from .due_dates import DueDateIndex
+from .inventory import InventoryStats
+from .deferred import DeferredMap
+from .holds import HoldQueue
+from .cow import FrozenVersion, BackgroundSave, LibrarySnapshot
+from .views import KeyOrder, LiveMapping
+from .binary_snapshot import BinarySnapshot, SnapshotMap, write_snapshot
 from .exceptions import (
     BookNotAvailableError,
     BookNotFoundError,
@@ -16,6 +33,22 @@ from .exceptions import (
 )
 
 
+# Attributes holding the library's contents, replaced as a whole on load.
+_STATE = (
+    "_books",
+    "_members",
+    "_loans",
+    "_due",
+    "_search",
+    "_stats",
+    "_holds",
+    "_snapshot",
+    "_pending_loans",
+    "_journal_seq",
+    "_versions",
+)
+
+
 class Library:
     """
     Represents a library and manages all library operations.
@@ -24,31 +57,88 @@ class Library:
     It handles borrowing, returning, persistence, and data queries.
 
     Attributes:
-        _books (dict): Dictionary mapping book IDs to Book objects.
+        _books (dict): Dictionary mapping book IDs to Book objects. Any mutable
+            mapping works, such as a ColumnarCatalog for very large catalogs.
+        _book_store (type): Class of the book store, used to create an empty
+            one whenever the library is reloaded.
         _members (dict): Dictionary mapping member IDs to Member objects.
-        _loans (list): List of Loan objects tracking all borrowing events.
+        _loans (LoanIndex): Keyed store of Loan objects tracking all active loans.
+        _journal (Journal): Optional write-ahead log receiving every mutation.
+        _journal_seq (int): Sequence number of the last journaled mutation.
+        _events (EventBus): Optional bus receiving an event for every change.
+        _search (SearchIndex): Search index over book titles and authors.
+        _due (DueDateIndex): Active loans ordered by due date.
+        _stats (InventoryStats): Running totals over the books.
+        _holds (dict): Maps book IDs to the HoldQueue of members waiting for them.
+        _snapshot (BinarySnapshot): Binary snapshot that books and members are
+            still being loaded from lazily, or None.
+        _pending_loans (int): Loans read from a snapshot or file that are not
+            restored yet.
+        _frozen (FrozenVersion): Version being saved in the background, or None.
+        _versions (weakref.WeakSet): Open versions, for the background save
+            and for snapshots, that keep records of what changes.
+        _key_orders (dict): KeyOrder of the books or members mapping, by
+            listing name, kept between pages.
     """
 
-    def __init__(self):
-        """Initialize an empty Library."""
-        self._books = {}
+    def __init__(self, book_store=None):
+        """
+        Initialize an empty Library.
+
+        Args:
+            book_store (MutableMapping, optional): Empty mapping used to store
+                books by ID, such as a ColumnarCatalog. Defaults to a dict.
+        """
+        self._books = {} if book_store is None else book_store
+        self._book_store = type(self._books)
         self._members = {}
-        self._loans = []
+        self._loans = LoanIndex()
+        self._journal = None
+        self._journal_seq = 0
+        self._events = None
+        self._search = SearchIndex()
+        self._due = DueDateIndex(self._loans)
+        self._stats = InventoryStats()
+        self._holds = {}
+        self._snapshot = None
+        self._pending_loans = 0
+        self._frozen = None
+        self._versions = weakref.WeakSet()
+        self._key_orders = {}
 
     @property
     def books(self):
-        """Get all books as a dictionary."""
-        return self._books.copy()
+        """Get a read-only, live mapping of book IDs to books (no copy)."""
+        return LiveMapping(lambda: self._books)
 
     @property
     def members(self):
-        """Get all members as a dictionary."""
-        return self._members.copy()
+        """Get a read-only, live mapping of member IDs to members (no copy)."""
+        return LiveMapping(lambda: self._members)
 
     @property
     def loans(self):
-        """Get all loans as a list."""
-        return self._loans.copy()
+        """Get a read-only, live sequence of all loans (no copy)."""
+        self._materialize()
+        return self._loans.view()
+
+    def snapshot(self):
+        """
+        Take a point-in-time snapshot of the library's books, members, and loans.
+
+        Unlike the books, members, and loans views, the snapshot does not
+        change as the library does, so readers can work through it while
+        the library keeps being updated. Nothing is copied up front: the
+        snapshot is a copy-on-write version, like a background save's, and
+        its books, members, and loans are built as they are read.
+
+        Returns:
+            LibrarySnapshot: The snapshot.
+        """
+        self._materialize()
+        version = FrozenVersion(self._books, self._members, self._journal_seq)
+        self._versions.add(version)
+        return LibrarySnapshot(version, self._loans)
 
     def add_book(self, book):
         """
@@ -62,7 +152,16 @@ class Library:
         """
         if book.id in self._books:
             raise ValueError(f"A book with ID '{book.id}' already exists.")
+        if self._journal is not None:
+            self._log({"op": "add_book", "book": book.to_dict()})
+        if self._versions:
+            for version in self._versions:
+                version.keep_added("books", (book.id,))
         self._books[book.id] = book
+        self._stats.add_book(book)
+        self._search.add(book)
+        if self._events is not None:
+            self._events.publish(Event.BOOK_ADDED, book.id)
 
     def add_member(self, member):
         """
@@ -76,7 +175,118 @@ class Library:
         """
         if member.member_id in self._members:
             raise ValueError(f"A member with ID '{member.member_id}' already exists.")
+        if self._journal is not None:
+            self._log({"op": "add_member", "member_id": member.member_id, "name": member.name})
+        if self._versions:
+            for version in self._versions:
+                version.keep_added("members", (member.member_id,))
         self._members[member.member_id] = member
+        if self._events is not None:
+            self._events.publish(Event.MEMBER_ADDED, None, member.member_id)
+
+    def import_catalog(self, filename, fmt=None, chunk_size=10000):
+        """
+        Add every valid book in a CSV or JSON lines catalog file.
+
+        The file is read in chunks. Each chunk is validated as a whole and
+        its books are added in one pass; the search index is built once at
+        the end. Rows that fail validation, and rows whose ID is already in
+        the library or earlier in the file, are skipped and reported
+        instead of stopping the import. If the file itself cannot be read
+        part-way (for example, it is not valid UTF-8), the error propagates
+        and the books of the chunks before it stay added and searchable.
+
+        Args:
+            filename (str): Path to the catalog file.
+            fmt (str, optional): "csv" or "jsonl". Defaults to the format
+                implied by the file extension.
+            chunk_size (int, optional): Number of rows validated and added
+                at a time. Defaults to 10000.
+
+        Returns:
+            ImportReport: The number of books imported and the rejected rows.
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist.
+            ValueError: If the format is unknown, or the file cannot be decoded.
+        """
+        if fmt is None:
+            fmt = importer.detect_format(filename)
+        self._materialize()
+        report = importer.ImportReport()
+        imported = []
+        try:
+            with open(filename, "r", newline="") as f:
+                rows = importer.read_rows(f, fmt)
+                while True:
+                    chunk = list(islice(rows, chunk_size))
+                    if not chunk:
+                        break
+                    books = self._validate_rows(chunk, report)
+                    logged = books if self._journal is None else {}
+                    try:
+                        if self._journal is not None:
+                            for book_id, book in books.items():
+                                self._log({"op": "add_book", "book": book.to_dict()})
+                                logged[book_id] = book
+                    finally:
+                        # If appending to the journal fails, only the books
+                        # already journaled are added before the error propagates.
+                        self._add_imported(logged, imported)
+        finally:
+            # Books from earlier chunks stay added if reading fails part-way,
+            # so they must be searchable too.
+            self._search.add_many(imported)
+        report.imported = len(imported)
+        return report
+
+    def _add_imported(self, books, imported):
+        """
+        Add a chunk of imported books, which are already journaled.
+
+        Args:
+            books (dict): The books to add, by ID.
+            imported (list): Books imported so far; the new ones are appended.
+        """
+        if self._versions:
+            for version in self._versions:
+                version.keep_added("books", books)
+        self._books.update(books)
+        for book in books.values():
+            self._stats.add_book(book)
+        if self._events is not None:
+            for book_id in books:
+                self._events.publish(Event.BOOK_ADDED, book_id)
+        imported.extend(books.values())
+
+    def _validate_rows(self, chunk, report):
+        """
+        Build the books for a chunk of catalog rows.
+
+        Args:
+            chunk (list): (line number, row) pairs.
+            report (ImportReport): Receives the rejected rows.
+
+        Returns:
+            dict: The new books by ID, in file order.
+        """
+        books = {}
+        existing = self._books
+        for line, row in chunk:
+            if row is None:
+                report.reject(line, None, "Not a JSON object.")
+                continue
+            try:
+                book = importer.book_from_row(row)
+            except ValueError as e:
+                book_id = row.get("id")
+                report.reject(line, book_id if isinstance(book_id, str) else None, str(e))
+                continue
+            if book.id in books or book.id in existing:
+                report.reject(line, book.id, f"A book with ID '{book.id}' already exists.")
+                continue
+            books[book.id] = book
+        return books
 
     def borrow_book(self, member_id, book_id):
         """
@@ -100,30 +310,103 @@ class Library:
             BookNotAvailableError: If no copies are available (for physical books).
             InvalidOperationError: If the member already has this book borrowed.
         """
-        if member_id not in self._members:
-            raise MemberNotFoundError(f"Member with ID '{member_id}' not found.")
-        if book_id not in self._books:
-            raise BookNotFoundError(f"Book with ID '{book_id}' not found.")
+        self._borrow(member_id, book_id)
 
-        member = self._members[member_id]
-        book = self._books[book_id]
+    def _borrow(self, member_id, book_id, date_borrowed=None, due_date=None):
+        """
+        Record a member borrowing a book on a given date.
+
+        Args:
+            member_id (str): The ID of the member borrowing the book.
+            book_id (str): The ID of the book to borrow.
+            date_borrowed (str, optional): Date in ISO format. Defaults to today.
+            due_date (str, optional): Date in ISO format. Defaults to the
+                standard loan period after the date borrowed.
+
+        Returns:
+            Loan: The new loan.
+        """
+        member = self._members.get(member_id)
+        book = self._books.get(book_id)
+        error = self._check_borrow(member_id, member, book_id, book)
+        if error is not None:
+            raise error[0](error[1])
+
+        return self._record_borrow(member, book, date_borrowed, due_date)
+
+    def _check_borrow(self, member_id, member, book_id, book):
+        """
+        Check whether a borrow can proceed, without raising.
+
+        Args:
+            member_id (str): The requested member ID.
+            member (Member): The member found for the ID, or None.
+            book_id (str): The requested book ID.
+            book (Book): The book found for the ID, or None.
+
+        Returns:
+            tuple: (exception class, message) describing the failure,
+                or None if the borrow can proceed.
+        """
+        if member is None:
+            return MemberNotFoundError, f"Member with ID '{member_id}' not found."
+        if book is None:
+            return BookNotFoundError, f"Book with ID '{book_id}' not found."
 
         # Check if member already has this book
-        if any(b.id == book_id for b in member.borrowed_books):
-            raise InvalidOperationError(
-                f"Member {member.name} already has '{book.title}' borrowed."
+        if member.has_borrowed(book_id):
+            return (
+                InvalidOperationError,
+                f"Member {member.name} already has '{book.title}' borrowed.",
             )
 
-        # Try to borrow the book
-        try:
-            book.borrow()
-        except Exception as e:
-            raise BookNotAvailableError(str(e))
+        # Check if a copy is available
+        if not book.can_borrow():
+            return BookNotAvailableError, f"No copies of '{book.title}' are available."
+        return None
+
+    def _keep(self, member, book):
+        """Keep the member's and book's records for open versions before they change."""
+        if self._versions:
+            for version in self._versions:
+                version.keep_book(book)
+                version.keep_member(member, self._loans)
+
+    def _record_borrow(self, member, book, date_borrowed=None, due_date=None):
+        """
+        Record a borrow that has passed _check_borrow().
+
+        Journals the borrow, borrows the book, adds it to the member's
+        borrowed list, and creates the loan.
+
+        Args:
+            member (Member): The member borrowing the book.
+            book (Book): The borrowed book.
+            date_borrowed (str, optional): Date in ISO format. Defaults to today.
+            due_date (str, optional): Date in ISO format. Defaults to the
+                standard loan period after the date borrowed.
 
-        # Add to member's borrowed list and create loan
+        Returns:
+            Loan: The new loan.
+        """
+        loan = Loan(book, member, date_borrowed, due_date)
+        if self._journal is not None:
+            self._log({
+                "op": "borrow",
+                "member_id": member.member_id,
+                "book_id": book.id,
+                "date_borrowed": loan.date_borrowed,
+                "due_date": loan.due_date,
+            })
+        self._keep(member, book)
+        book.borrow()
         member.borrow_book(book)
-        loan = Loan(book, member)
-        self._loans.append(loan)
+        self._loans.add(loan)
+        self._stats.copies_changed(book, -1)
+        self._due.push(loan)
+        if self._events is not None:
+            self._events.publish(Event.BOOK_BORROWED, book.id, member.member_id)
+        return loan
 
     def return_book(self, member_id, book_id):
         """
@@ -135,6 +418,7 @@ class Library:
         3. Increases available copies (for physical books)
         4. Removes the book from the member's borrowed list
         5. Removes the corresponding Loan record
+        6. Lends the copy to the first member waiting for it, if any
 
         Args:
             member_id (str): The ID of the member returning the book.
@@ -145,28 +429,343 @@ class Library:
             BookNotFoundError: If the book doesn't exist.
             InvalidOperationError: If the member doesn't have this book borrowed.
         """
-        if member_id not in self._members:
-            raise MemberNotFoundError(f"Member with ID '{member_id}' not found.")
-        if book_id not in self._books:
-            raise BookNotFoundError(f"Book with ID '{book_id}' not found.")
+        self._hand_off(self._return(member_id, book_id))
+
+    def _return(self, member_id, book_id):
+        """
+        Record a member returning a book, without handing it to a waiting member.
 
-        member = self._members[member_id]
-        book = self._books[book_id]
+        Args:
+            member_id (str): The ID of the member returning the book.
+            book_id (str): The ID of the book to return.
+
+        Returns:
+            Book: The returned book.
+        """
+        member = self._members.get(member_id)
+        book = self._books.get(book_id)
+        error = self._check_return(member_id, member, book_id, book)
+        if error is not None:
+            raise error[0](error[1])
+        self._record_return(member, book)
+        return book
+
+    def _check_return(self, member_id, member, book_id, book):
+        """
+        Check whether a return can proceed, without raising.
+
+        Args:
+            member_id (str): The requested member ID.
+            member (Member): The member found for the ID, or None.
+            book_id (str): The requested book ID.
+            book (Book): The book found for the ID, or None.
+
+        Returns:
+            tuple: (exception class, message) describing the failure,
+                or None if the return can proceed.
+        """
+        if member is None:
+            return MemberNotFoundError, f"Member with ID '{member_id}' not found."
+        if book is None:
+            return BookNotFoundError, f"Book with ID '{book_id}' not found."
 
         # Check if member has this book
-        if not any(b.id == book_id for b in member.borrowed_books):
-            raise InvalidOperationError(
-                f"Member {member.name} does not have '{book.title}' borrowed."
+        if (member_id, book_id) not in self._loans:
+            return (
+                InvalidOperationError,
+                f"Member {member.name} does not have '{book.title}' borrowed.",
             )
+        return None
+
+    def _record_return(self, member, book):
+        """
+        Return a book and remove its loan record.
 
-        # Return the book
+        Args:
+            member (Member): The member returning the book.
+            book (Book): The returned book.
+        """
+        if self._journal is not None:
+            self._log({"op": "return", "member_id": member.member_id, "book_id": book.id})
+        self._keep(member, book)
         book.return_book()
         member.return_book(book)
+        self._stats.copies_changed(book, 1)
 
         # Remove the loan record
-        self._loans = [
-            loan for loan in self._loans
-            if not (loan.book.id == book_id and loan.member.member_id == member_id)
+        self._due.discard(self._loans.remove(member.member_id, book.id))
+        if self._events is not None:
+            self._events.publish(Event.BOOK_RETURNED, book.id, member.member_id)
+
+    def borrow_many(self, requests):
+        """
+        Process many borrows in one pass.
+
+        Each request is checked and applied in order, exactly as borrow_book
+        would, but failures are reported in the results instead of raised.
+
+        Args:
+            requests (iterable): Pairs of (member_id, book_id).
+
+        Returns:
+            list: One OperationResult per request, in request order.
+        """
+        return [self._try_borrow(member_id, book_id) for member_id, book_id in requests]
+
+    def return_many(self, requests):
+        """
+        Process many returns in one pass.
+
+        Each request is checked and applied in order, exactly as return_book
+        would, but failures are reported in the results instead of raised.
+
+        Args:
+            requests (iterable): Pairs of (member_id, book_id).
+
+        Returns:
+            list: One OperationResult per request, in request order.
+        """
+        return [self._try_return(member_id, book_id) for member_id, book_id in requests]
+
+    def place_hold(self, member_id, book_id):
+        """
+        Put a member in the queue for a book that has no copies available.
+
+        When a copy is returned, it is lent to the first member in the queue.
+
+        Args:
+            member_id (str): The ID of the waiting member.
+            book_id (str): The ID of the book.
+
+        Returns:
+            int: The member's position in the queue, starting at 1.
+
+        Raises:
+            MemberNotFoundError: If the member doesn't exist.
+            BookNotFoundError: If the book doesn't exist.
+            InvalidOperationError: If a copy is available, or the member
+                already has the book borrowed or on hold.
+        """
+        member = self._members.get(member_id)
+        book = self._books.get(book_id)
+        error = self._check_hold(member_id, member, book_id, book)
+        if error is not None:
+            raise error[0](error[1])
+        if self._journal is not None:
+            self._log({"op": "hold", "member_id": member_id, "book_id": book_id})
+        if self._frozen is not None:
+            self._frozen.keep_holds(self._iter_holds)
+        queue = self._holds.get(book_id)
+        if queue is None:
+            queue = self._holds[book_id] = HoldQueue()
+        position = queue.push(member_id)
+        if self._events is not None:
+            self._events.publish(Event.HOLD_PLACED, book_id, member_id)
+        return position
+
+    def _check_hold(self, member_id, member, book_id, book):
+        """
+        Check whether a hold can be placed, without raising.
+
+        Returns:
+            tuple: (exception class, message) describing the failure,
+                or None if the hold can be placed.
+        """
+        if member is None:
+            return MemberNotFoundError, f"Member with ID '{member_id}' not found."
+        if book is None:
+            return BookNotFoundError, f"Book with ID '{book_id}' not found."
+        if member.has_borrowed(book_id):
+            return (
+                InvalidOperationError,
+                f"Member {member.name} already has '{book.title}' borrowed.",
+            )
+        if member_id in self._holds.get(book_id, ()):
+            return (
+                InvalidOperationError,
+                f"Member {member.name} is already waiting for '{book.title}'.",
+            )
+        if book.can_borrow():
+            return (
+                InvalidOperationError,
+                f"'{book.title}' is available; borrow it instead.",
+            )
+        return None
+
+    def cancel_hold(self, member_id, book_id):
+        """
+        Take a member out of the queue for a book.
+
+        Args:
+            member_id (str): The ID of the waiting member.
+            book_id (str): The ID of the book.
+
+        Raises:
+            InvalidOperationError: If the member is not waiting for the book.
+        """
+        queue = self._holds.get(book_id)
+        if queue is None or member_id not in queue:
+            raise InvalidOperationError(
+                f"Member with ID '{member_id}' is not waiting for book '{book_id}'."
+            )
+        if self._journal is not None:
+            self._log({"op": "cancel_hold", "member_id": member_id, "book_id": book_id})
+        if self._frozen is not None:
+            self._frozen.keep_holds(self._iter_holds)
+        queue.remove(member_id)
+        if not queue:
+            del self._holds[book_id]
+        if self._events is not None:
+            self._events.publish(Event.HOLD_CANCELLED, book_id, member_id)
+
+    def hold_position(self, member_id, book_id):
+        """
+        Get a member's position in the queue for a book.
+
+        Args:
+            member_id (str): The member ID.
+            book_id (str): The book ID.
+
+        Returns:
+            int: The position, starting at 1, or None if the member is not waiting.
+        """
+        queue = self._holds.get(book_id)
+        return None if queue is None else queue.position(member_id)
+
+    def hold_count(self, book_id):
+        """
+        Count the members waiting for a book.
+
+        Args:
+            book_id (str): The book ID.
+
+        Returns:
+            int: The number of waiting members.
+        """
+        return len(self._holds.get(book_id, ()))
+
+    def _hand_off(self, book):
+        """
+        Lend a returned copy to the first member waiting for it.
+
+        Args:
+            book (Book): The returned book.
+
+        Returns:
+            Loan: The new loan, or None if nobody was waiting.
+        """
+        queue = self._holds.get(book.id)
+        if queue and self._frozen is not None:
+            self._frozen.keep_holds(self._iter_holds)
+        while queue:
+            member = self._members.get(queue.peek())
+            loan = None
+            if member is not None and not member.has_borrowed(book.id) and book.can_borrow():
+                # The hold only ends once the borrow is journaled and recorded.
+                loan = self._record_borrow(member, book)
+            queue.pop()
+            if not queue:
+                del self._holds[book.id]
+            if loan is not None:
+                return loan
+        return None
+
+    def _try_borrow(self, member_id, book_id):
+        """
+        Borrow a book, reporting failure as a result instead of raising.
+
+        Args:
+            member_id (str): The ID of the member borrowing the book.
+            book_id (str): The ID of the book to borrow.
+
+        Returns:
+            OperationResult: The outcome of the borrow.
+        """
+        member = self._members.get(member_id)
+        book = self._books.get(book_id)
+        error = self._check_borrow(member_id, member, book_id, book)
+        if error is not None:
+            return OperationResult(member_id, book_id, *error)
+        self._record_borrow(member, book)
+        return OperationResult(member_id, book_id)
+
+    def _try_return(self, member_id, book_id):
+        """
+        Return a book, reporting failure as a result instead of raising.
+
+        Args:
+            member_id (str): The ID of the member returning the book.
+            book_id (str): The ID of the book to return.
+
+        Returns:
+            OperationResult: The outcome of the return.
+        """
+        member = self._members.get(member_id)
+        book = self._books.get(book_id)
+        error = self._check_return(member_id, member, book_id, book)
+        if error is not None:
+            return OperationResult(member_id, book_id, *error)
+        self._record_return(member, book)
+        self._hand_off(book)
+        return OperationResult(member_id, book_id)
+
+    def inventory(self):
+        """
+        Get running totals over books, loans, and members.
+
+        The totals are kept up to date as books are added, borrowed, and
+        returned, so this costs the same however large the library is.
+
+        Returns:
+            dict: titles, physical_titles, ebook_titles, available_copies,
+                checked_out_titles (physical books with no copies left),
+                members, active_loans, members_with_loans, and
+                loans_per_member (the average over all members).
+        """
+        self._materialize()
+        stats = self._stats.to_dict()
+        stats["titles"] = len(self._books)
+        stats["members"] = len(self._members)
+        stats["active_loans"] = len(self._loans)
+        stats["members_with_loans"] = self._loans.borrower_count()
+        stats["loans_per_member"] = (
+            len(self._loans) / len(self._members) if self._members else 0.0
+        )
+        return stats
+
+    def loan_count(self, member_id):
+        """
+        Count the active loans held by a member.
+
+        Args:
+            member_id (str): The member ID.
+
+        Returns:
+            int: Number of active loans.
+        """
+        self._resolve_member(member_id)
+        return self._loans.count_for_member(member_id)
+
+    def verify_inventory(self):
+        """
+        Check the running totals against a full recount.
+
+        Returns:
+            list: Descriptions of totals that do not match; empty if all do.
+        """
+        self._materialize()
+        expected = InventoryStats.recount(self._books.values()).to_dict()
+        expected["active_loans"] = sum(
+            len(member.borrowed_books) for member in self._members.values()
+        )
+        expected["members_with_loans"] = sum(
+            1 for member in self._members.values() if member.borrowed_books
+        )
+        actual = self.inventory()
+        return [
+            f"{name}: running total {actual[name]} != recount {value}"
+            for name, value in expected.items()
+            if actual[name] != value
         ]
 
     def list_books(self):
@@ -187,6 +786,78 @@ class Library:
         """
         return list(self._members.values())
 
+    def page_books(self, limit=20, cursor=None):
+        """
+        Get one page of books, in the order they were added.
+
+        Only the books on the page are built, so paging through a large
+        catalog never holds it all in a list.
+
+        Args:
+            limit (int, optional): Maximum number of books. Defaults to 20.
+            cursor (str, optional): Token returned with the previous page.
+                Defaults to the first page.
+
+        Returns:
+            tuple: (list of Book objects, cursor for the next page or None
+                if this is the last one).
+
+        Raises:
+            ValueError: If the cursor is malformed, belongs to another
+                listing, or no longer matches the library (for example,
+                after a load).
+        """
+        return self._page("books", self._books, limit, cursor)
+
+    def page_members(self, limit=20, cursor=None):
+        """
+        Get one page of members, in the order they were added.
+
+        Args:
+            limit (int, optional): Maximum number of members. Defaults to 20.
+            cursor (str, optional): Token returned with the previous page.
+                Defaults to the first page.
+
+        Returns:
+            tuple: (list of Member objects, cursor for the next page or None
+                if this is the last one).
+
+        Raises:
+            ValueError: If the cursor is malformed, belongs to another
+                listing, or no longer matches the library.
+        """
+        return self._page("members", self._members, limit, cursor)
+
+    def _page(self, kind, mapping, limit, cursor):
+        """
+        Get one page of a mapping's values, in key order.
+
+        The cursor records the position after the page and the key just
+        before that position, so a cursor from a different listing or a
+        library whose contents changed underneath it is detected. Keys are
+        found by position through a KeyOrder kept between pages, so a page
+        costs time proportional to its size, wherever it is.
+        """
+        if limit < 1:
+            raise ValueError("Page limit must be positive.")
+        offset, last_key = 0, None
+        if cursor is not None:
+            offset, last_key = _decode_cursor(kind, cursor)
+        order = self._key_orders.get(kind)
+        if order is None or order.mapping is not mapping:
+            order = self._key_orders[kind] = KeyOrder(mapping)
+        page_keys = order.keys(max(offset - 1, 0), offset + limit + 1)
+        if offset:
+            if not page_keys or page_keys[0] != last_key:
+                raise ValueError("The cursor no longer matches the library; start again.")
+            del page_keys[0]
+        more = len(page_keys) > limit
+        del page_keys[limit:]
+        page = [mapping[key] for key in page_keys]
+        if not more:
+            return page, None
+        return page, _encode_cursor(kind, offset + limit, page_keys[-1])
+
     def get_book_by_id(self, book_id):
         """
         Retrieve a book by its ID.
@@ -211,36 +882,252 @@ class Library:
         """
         return self._members.get(member_id)
 
-    def save_to_file(self, filename):
+    def get_loan(self, member_id, book_id):
+        """
+        Retrieve the active loan of a book to a member.
+
+        Args:
+            member_id (str): The member ID.
+            book_id (str): The book ID.
+
+        Returns:
+            Loan: The loan object, or None if not found.
+        """
+        self._resolve_member(member_id)
+        return self._loans.get(member_id, book_id)
+
+    def loans_for_member(self, member_id):
+        """
+        Get all active loans held by a member.
+
+        Args:
+            member_id (str): The member ID.
+
+        Returns:
+            list: List of Loan objects.
+        """
+        self._resolve_member(member_id)
+        return self._loans.for_member(member_id)
+
+    def _resolve_member(self, member_id):
+        """Look a member up so that loans still deferred by a lazy load are restored."""
+        self._members.get(member_id)
+
+    def loans_for_book(self, book_id):
+        """
+        Get all active loans of a book.
+
+        Args:
+            book_id (str): The book ID.
+
+        Returns:
+            list: List of Loan objects.
+        """
+        self._materialize()
+        return self._loans.for_book(book_id)
+
+    def overdue_loans(self, today=None, limit=None):
+        """
+        Get active loans that are past their due date.
+
+        Args:
+            today (optional): The current date as an ISO string or datetime.date.
+                Defaults to today.
+            limit (int, optional): Maximum number of loans to return.
+
+        Returns:
+            list: Overdue Loan objects, most overdue first.
+        """
+        self._materialize()
+        today_day = to_day(today or date.today())
+        return list(self._due.earliest(limit, before_day=today_day))
+
+    def next_due_loans(self, n):
+        """
+        Get the active loans that are due back soonest.
+
+        Args:
+            n (int): Number of loans to return.
+
+        Returns:
+            list: Up to n Loan objects, earliest due date first.
+        """
+        self._materialize()
+        return list(self._due.earliest(n))
+
+    def search(self, query, offset=0, limit=20):
+        """
+        Search books by title and author.
+
+        Every word of the query must match; the last word may be a prefix,
+        so partially typed queries return results. Title matches rank above
+        author matches.
+
+        Args:
+            query (str): The search text.
+            offset (int, optional): Number of ranked results to skip. Defaults to 0.
+            limit (int, optional): Maximum number of results. Defaults to 20.
+
+        Returns:
+            list: Matching Book objects for the requested page, best first.
+        """
+        self._materialize()
+        return [
+            self._books[book_id]
+            for book_id in self._search.search(query, offset, limit)
+        ]
+
+    def save_to_file(self, filename, streaming=None):
         """
         Save the library state to a JSON file.
 
         Serializes all books, members, and loans to a JSON file.
         The JSON preserves book types for correct deserialization.
 
+        In streaming mode, records are written one per line as they are
+        serialized (see the storage module), so the whole document is never
+        held in memory.
+
         Args:
             filename (str): Path to the output JSON file.
+            streaming (bool, optional): Whether to use the streaming format.
+                Defaults to True for ".jsonl" files and False otherwise.
 
         Returns:
             None
         """
-        data = {
-            "books": [book.to_dict() for book in self._books.values()],
-            "members": [member.to_dict() for member in self._members.values()],
-            "loans": [loan.to_dict() for loan in self._loans],
-        }
+        if streaming is None:
+            streaming = filename.endswith(".jsonl")
+        self._materialize()
+
+        meta = {"journal_seq": self._journal_seq} if self._journal_seq else None
+        self._write_sections(filename, streaming, self._iter_sections(), meta)
+
+    def save_in_background(self, filename, streaming=None):
+        """
+        Save the library state in a background thread.
+
+        The current state is frozen without copying anything, and the
+        library keeps working while it is written: the first time a book,
+        member, or hold queue changes during the save, its old state is
+        kept for the save (copy-on-write), and books and members added
+        during the save are left out. The file holds exactly the state at
+        the time of the call. It is written under a temporary name and
+        renamed when complete, so a failed save leaves the previous file as
+        it was, and the temporary file is removed.
+
+        Args:
+            filename (str): Path to the output JSON file.
+            streaming (bool, optional): Whether to use the streaming format.
+                Defaults to True for ".jsonl" files and False otherwise.
+
+        Returns:
+            BackgroundSave: Handle to wait for the save and see whether it failed.
+
+        Raises:
+            InvalidOperationError: If a background save is already running.
+        """
+        if streaming is None:
+            streaming = filename.endswith(".jsonl")
+        self._materialize()
+        version = self._freeze()
+
+        def save():
+            temporary = filename + ".tmp"
+            try:
+                meta = {"journal_seq": version.journal_seq} if version.journal_seq else None
+                self._write_sections(temporary, streaming, self._frozen_sections(version), meta)
+                os.replace(temporary, filename)
+            except BaseException:
+                if os.path.exists(temporary):
+                    os.remove(temporary)
+                raise
+            finally:
+                self._frozen = None
+                self._versions.discard(version)
+                version.finished.set()
+
+        return BackgroundSave(save)
+
+    def _freeze(self):
+        """
+        Freeze the current state for a background save.
+
+        Returns:
+            FrozenVersion: The frozen version.
+
+        Raises:
+            InvalidOperationError: If a background save is already running.
+        """
+        if self._frozen is not None:
+            raise InvalidOperationError("A background save is already running.")
+        self._frozen = FrozenVersion(self._books, self._members, self._journal_seq)
+        self._versions.add(self._frozen)
+        return self._frozen
+
+    def _frozen_sections(self, version):
+        """Yield (section name, record generator) pairs for a frozen version."""
+        loans = self._loans
+        yield "books", (version.book_record(book) for book in version.values("books"))
+        yield "members", (
+            version.member_records(member, loans)[0] for member in version.values("members")
+        )
+        # The second pass over the members sees the same records as the
+        # first: any member changed in between was kept before changing.
+        yield "loans", (
+            record
+            for member in version.values("members")
+            for record in version.member_records(member, loans)[1]
+        )
+        holds = version.hold_records(self._iter_holds)
+        if holds:
+            yield "holds", iter(holds)
+
+    def _write_sections(self, filename, streaming, sections, meta):
+        """
+        Write (section name, record iterable) pairs to a file.
+
+        Args:
+            filename (str): Path to the output file.
+            streaming (bool): Whether to use the streaming format.
+            sections (iterable): The sections, in order.
+            meta (dict): Metadata to write, or None.
+        """
+        if streaming:
+            # A large buffer means fewer flushes, each of which gives up the GIL
+            # and, in a background save, waits behind every busy thread to get it back.
+            with open(filename, "w", buffering=1 << 20) as f:
+                storage.write_jsonl(f, sections, meta)
+            return
+
+        data = {name: list(records) for name, records in sections}
+        if meta:
+            data["meta"] = meta
         with open(filename, "w") as f:
             json.dump(data, f, indent=2)
 
-    def load_from_file(self, filename):
+    def load_from_file(self, filename, lazy=False):
         """
         Load the library state from a JSON file.
 
         Deserializes books, members, and loans from a JSON file.
         Reconstructs the in-memory data structures correctly.
+        Both the streaming and the original JSON formats are accepted;
+        streaming files are read one record at a time.
+
+        With lazy=True, loan records are grouped by member while reading,
+        and a member's loans are only attached when the member is first
+        looked up (or when an operation needs every loan, such as the loans
+        property, due date queries, inventory, or saving), so loading skips
+        that work entirely.
 
         Args:
             filename (str): Path to the input JSON file.
+            lazy (bool, optional): Whether to defer attaching loans to
+                members until they are used. Defaults to False.
+
+        The file is read into new, empty structures. If reading fails, they
+        are discarded and the library keeps its previous state.
 
         Raises:
             FileNotFoundError: If the file doesn't exist.
@@ -250,49 +1137,494 @@ class Library:
             None
         """
         with open(filename, "r") as f:
-            data = json.load(f)
+            previous = self._detach_state()
+            try:
+                if lazy:
+                    self._members = DeferredMap(self._resolve_loans)
 
-        # Clear current data
-        self._books = {}
+                for section, record in storage.read_records(f):
+                    self._load_record(section, record, lazy)
+                self._due.rebuild()
+                self._search.add_many(self._books.values())
+            except BaseException:
+                self._restore_state(previous)
+                raise
+        self._release_state(previous)
+        if self._events is not None:
+            self._events.publish(Event.LIBRARY_LOADED)
+
+    def _clear(self):
+        """Remove all books, members, and loans, once any background save has finished."""
+        self._release_state(self._detach_state())
+
+    def _detach_state(self):
+        """
+        Set the library's contents aside and start again from empty structures.
+
+        Waits for any background save to finish first, since it reads the
+        contents being set aside.
+
+        Returns:
+            dict: The previous contents, for _restore_state() or _release_state().
+        """
+        frozen = self._frozen
+        if frozen is not None:
+            frozen.finished.wait()
+        previous = {name: getattr(self, name) for name in _STATE}
+        self._books = self._book_store()
         self._members = {}
-        self._loans = []
-
-        # Load books
-        for book_data in data.get("books", []):
-            if book_data["type"] == "PhysicalBook":
-                book = PhysicalBook(
-                    book_data["id"],
-                    book_data["title"],
-                    book_data["author"],
-                    book_data["available_copies"],
-                )
-            elif book_data["type"] == "EBook":
-                book = EBook(
-                    book_data["id"],
-                    book_data["title"],
-                    book_data["author"],
-                    book_data["file_size_mb"],
-                )
-            self._books[book.id] = book
+        self._loans = LoanIndex()
+        self._due = DueDateIndex(self._loans)
+        self._search = SearchIndex()
+        self._stats = InventoryStats()
+        self._holds = {}
+        self._snapshot = None
+        self._pending_loans = 0
+        self._journal_seq = 0
+        self._versions = weakref.WeakSet()
+        self._key_orders = {}
+        return previous
+
+    def _restore_state(self, previous):
+        """Put back contents set aside by _detach_state(), discarding the current ones."""
+        for name, value in previous.items():
+            setattr(self, name, value)
 
-        # Load members
-        for member_data in data.get("members", []):
-            member = Member(member_data["member_id"], member_data["name"])
+    def _release_state(self, previous):
+        """Discard contents set aside by _detach_state()."""
+        if previous["_snapshot"] is not None:
+            previous["_snapshot"].close()
+
+    def _iter_sections(self):
+        """Yield (section name, record generator) pairs for streaming output."""
+        yield "books", (book.to_dict() for book in self._books.values())
+        yield "members", (member.to_dict() for member in self._members.values())
+        yield "loans", (loan.to_dict() for loan in self._loans)
+        if self._holds:
+            yield "holds", self._iter_holds()
+
+    def _iter_holds(self):
+        """Yield a record for every hold, each book's queue in order."""
+        for book_id, queue in self._holds.items():
+            for member_id in queue:
+                yield {"book_id": book_id, "member_id": member_id}
+
+    def _load_record(self, section, record, lazy=False):
+        """
+        Restore a single serialized record into the library.
+
+        Args:
+            section (str): The section the record belongs to.
+            record (dict): The serialized record.
+            lazy (bool, optional): Whether to defer attaching loans to their
+                members (see load_from_file). Defaults to False.
+        """
+        if section == "meta":
+            self._journal_seq = record.get("journal_seq", 0)
+        elif section == "books":
+            book = storage.book_from_dict(record)
+            self._books[book.id] = book
+            self._stats.add_book(book)
+        elif section == "members":
+            member = Member(record["member_id"], record["name"])
             self._members[member.member_id] = member
+        elif section == "loans":
+            # Reconstruct relationships
+            member_id = record["member_id"]
+            if member_id in self._members and record["book_id"] in self._books:
+                if lazy:
+                    self._members.defer(member_id, record)
+                    self._pending_loans += 1
+                else:
+                    loan = self._loan_from_dict(record, self._members[member_id])
+                    self._restore_loan(loan, index_due=False)
+
+        elif section == "holds":
+            book_id, member_id = record["book_id"], record["member_id"]
+            if book_id in self._books and member_id in self._members:
+                self._holds.setdefault(book_id, HoldQueue()).push(member_id)
+
+    def _loan_from_dict(self, record, member):
+        """Build a loan of one of the library's books from its serialized record."""
+        return Loan(
+            self._books[record["book_id"]],
+            member,
+            record["date_borrowed"],
+            record.get("due_date"),
+        )
+
+    def _resolve_loans(self, member, records):
+        """
+        Restore a member's deferred loans from their serialized records.
 
-        # Load loans and reconstruct relationships
-        for loan_data in data.get("loans", []):
-            book = self._books.get(loan_data["book_id"])
-            member = self._members.get(loan_data["member_id"])
-            if book and member:
-                loan = Loan(book, member, loan_data["date_borrowed"])
-                self._loans.append(loan)
-                member.borrow_book(book)
+        Args:
+            member (Member): The member holding the loans.
+            records (list): The member's loan records.
+        """
+        for record in records:
+            self._restore_loan(self._loan_from_dict(record, member))
+        self._pending_loans -= len(records)
+
+    def save_binary(self, filename):
+        """
+        Save the library state to a binary snapshot file.
+
+        Binary snapshots can be opened with open_snapshot(), which loads
+        books and members lazily.
+
+        Args:
+            filename (str): Path to the output file.
+        """
+        self._save_binary(filename, {})
+
+    def _save_binary(self, filename, meta):
+        """Write a binary snapshot, with extra metadata stored alongside."""
+        self._materialize()
+        if self._journal_seq:
+            meta["journal_seq"] = self._journal_seq
+        if self._holds:
+            meta["holds"] = [[book_id, list(queue)] for book_id, queue in self._holds.items()]
+        write_snapshot(
+            filename,
+            self._books.values(),
+            self._members.values(),
+            self._loans.for_member,
+            meta,
+        )
+
+    def open_snapshot(self, filename):
+        """
+        Replace the library state with a binary snapshot, loaded lazily.
+
+        The file is memory-mapped and nothing is decoded up front. A book or
+        member (with its loans) is built the first time it is looked up, for
+        example by get_book_by_id, get_member_by_id, borrow_book, or
+        return_book. Operations that need every loan or book (such as the
+        loans property, search, due date queries, and saving) finish loading
+        everything first. A library created with a custom book_store (such
+        as a ColumnarCatalog) loads the whole snapshot into that store
+        instead, so the store is kept.
+
+        Args:
+            filename (str): Path to a file written by save_binary().
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist.
+            ValueError: If the file is not a binary snapshot.
+        """
+        self._open_snapshot(BinarySnapshot(filename))
+
+    def _open_snapshot(self, snapshot):
+        """Replace the library state with an opened binary snapshot."""
+        self._clear()
+        self._snapshot = snapshot
+        self._pending_loans = snapshot.loan_count
+        self._journal_seq = snapshot.meta.get("journal_seq", 0)
+        for book_id, member_ids in snapshot.meta.get("holds", ()):
+            queue = self._holds[book_id] = HoldQueue()
+            for member_id in member_ids:
+                queue.push(member_id)
+        self._books = SnapshotMap(
+            snapshot.book_count, snapshot.find_book, snapshot.book_id, snapshot.book
+        )
+        self._members = SnapshotMap(
+            snapshot.member_count,
+            snapshot.find_member,
+            snapshot.member_id,
+            self._member_from_snapshot,
+        )
+        if self._book_store is not dict:
+            # Books handed out by a snapshot are not in the custom store, so
+            # move everything into it now rather than loading lazily.
+            self._materialize()
+        if self._events is not None:
+            self._events.publish(Event.LIBRARY_LOADED)
+
+    def load_cached(self, filename, cache_filename=None):
+        """
+        Load the library state from a file, through a binary snapshot cache.
+
+        The first load reads the file with load_from_file() and saves the
+        result as a binary snapshot next to it, tagged with the file's
+        modification time and size. Later loads of the unchanged file open
+        the snapshot instead, which is lazy and skips parsing altogether.
+        A file changed without its modification time or size changing is
+        not noticed. Failing to write the cache does not fail the load.
+
+        Args:
+            filename (str): Path to the input file.
+            cache_filename (str, optional): Path to the cache. Defaults to
+                the input path with ".cache" appended.
+
+        Returns:
+            bool: True if the cache was used.
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist.
+            json.JSONDecodeError: If the file is not valid JSON.
+        """
+        if cache_filename is None:
+            cache_filename = filename + ".cache"
+        stat = os.stat(filename)
+        source = [stat.st_mtime_ns, stat.st_size]
+        try:
+            snapshot = BinarySnapshot(cache_filename)
+        except (OSError, ValueError):
+            snapshot = None
+        if snapshot is not None:
+            if snapshot.meta.get("source") == source:
+                self._open_snapshot(snapshot)
+                return True
+            snapshot.close()
+
+        self.load_from_file(filename)
+        temp_filename = cache_filename + ".tmp"
+        try:
+            self._save_binary(temp_filename, {"source": source})
+            os.replace(temp_filename, cache_filename)
+        except OSError:
+            pass
+        return False
+
+    def _member_from_snapshot(self, number):
+        """
+        Build a member and restore its loans from the open binary snapshot.
+
+        Args:
+            number (int): The member's record number.
+
+        Returns:
+            Member: The new member.
+        """
+        member_id, name, loans = self._snapshot.member(number)
+        member = Member(member_id, name)
+        for book_number, borrowed_day, due_day in loans:
+            book = self._books[self._snapshot.book_id(book_number)]
+            self._restore_loan(Loan(book, member, borrowed_day, due_day))
+        self._pending_loans -= len(loans)
+        return member
+
+    def _restore_loan(self, loan, index_due=True):
+        """
+        Add a loan loaded from a file or snapshot to the member and the indexes.
+
+        Args:
+            loan (Loan): The loan to add.
+            index_due (bool, optional): Whether to add it to the due date
+                index. Loading a file passes False and rebuilds the index
+                once at the end instead. Defaults to True.
+        """
+        loan.member.borrow_book(loan.book)
+        self._loans.add(loan)
+        if index_due:
+            self._due.push(loan)
+
+    def _materialize(self):
+        """Finish loading a lazily opened snapshot or file, if there is one."""
+        if self._snapshot is None:
+            if self._pending_loans:
+                self._members = self._members.resolve_all()
+            return
+        # Books first, and in their final store, so restoring each member's
+        # loans finds the stored books instead of searching the snapshot.
+        books = self._books.load_all()
+        if self._book_store is not dict:
+            store = self._book_store()
+            store.update(books)
+            books = store
+        self._books = books
+        members = self._members.load_all()
+        self._snapshot.close()
+        self._snapshot = None
+        self._pending_loans = 0
+        self._members = members
+        self._search.clear()
+        self._search.add_many(books.values())
+        self._stats = InventoryStats.recount(books.values())
+
+    def attach_journal(self, journal):
+        """
+        Start writing every mutation to a journal.
+
+        Mutations are add_book, add_member, borrow_book, return_book, holds,
+        and catalog imports. Each is journaled before it is applied, so a
+        mutation whose record could not be appended is not applied. Loading
+        from a file is not journaled; use recover() to rebuild state from a
+        snapshot and its journal before attaching.
+
+        Args:
+            journal (Journal): The journal to append to.
+        """
+        self._journal = journal
+
+    def detach_journal(self):
+        """
+        Stop journaling mutations.
+
+        Returns:
+            Journal: The previously attached journal, or None.
+        """
+        journal, self._journal = self._journal, None
+        return journal
+
+    def attach_events(self, bus):
+        """
+        Start publishing an event for every change to an event bus.
+
+        Changes are added books and members, borrows (including copies
+        handed to waiting members), returns, and holds placed or cancelled.
+        Replacing the whole library by loading a file or snapshot publishes a
+        single library_loaded event.
+
+        Args:
+            bus (EventBus): The bus to publish to.
+        """
+        self._events = bus
+
+    def detach_events(self):
+        """
+        Stop publishing events.
+
+        Returns:
+            EventBus: The previously attached bus, or None.
+        """
+        bus, self._events = self._events, None
+        return bus
+
+    def recover(self, snapshot_filename, journal_filename):
+        """
+        Restore the library from its latest snapshot and journal.
+
+        Loads the snapshot (if it exists), then replays every journal record
+        newer than the snapshot. An incomplete record left at the end of the
+        journal by a crash is removed from the file, so records appended
+        afterwards can be read back. Replayed mutations are not journaled again,
+        and an attached event bus gets a single library_loaded event at the
+        end instead of one event per change.
+
+        Args:
+            snapshot_filename (str): Path to the snapshot file.
+            journal_filename (str): Path to the journal file.
+
+        Returns:
+            int: The number of journal records replayed.
+        """
+        journal, self._journal = self._journal, None
+        events, self._events = self._events, None
+        replayed = 0
+        try:
+            if os.path.exists(snapshot_filename):
+                self.load_from_file(snapshot_filename)
+            else:
+                self._clear()
+            Journal.repair(journal_filename)
+            for record in Journal.read(journal_filename):
+                if record["seq"] > self._journal_seq:
+                    self._replay(record)
+                    self._journal_seq = record["seq"]
+                    replayed += 1
+        finally:
+            self._journal = journal
+            self._events = events
+        if events is not None:
+            events.publish(Event.LIBRARY_LOADED)
+        return replayed
+
+    def compact(self, snapshot_filename):
+        """
+        Fold the attached journal into a new snapshot.
+
+        The snapshot is written to a temporary file and atomically renamed,
+        then the journal is truncated. If a crash happens in between, recovery
+        skips journal records already contained in the snapshot.
+
+        Args:
+            snapshot_filename (str): Path to the snapshot file.
+
+        Raises:
+            InvalidOperationError: If no journal is attached.
+        """
+        if self._journal is None:
+            raise InvalidOperationError("No journal is attached to compact.")
+        self._journal.sync()
+        temp_filename = snapshot_filename + ".tmp"
+        self.save_to_file(
+            temp_filename, streaming=snapshot_filename.endswith(".jsonl")
+        )
+        os.replace(temp_filename, snapshot_filename)
+        self._journal.truncate()
+
+    def _log(self, record):
+        """
+        Number a mutation record and append it to the attached journal.
+
+        Every mutation calls this after its checks pass and before it
+        changes anything, so if appending fails the error propagates with
+        the library unchanged and the operation can be retried. A record
+        whose append failed may still have reached the disk, in which case
+        recover() applies it; its sequence number is never reused.
+        """
+        self._journal_seq += 1
+        record["seq"] = self._journal_seq
+        self._journal.append(record)
+
+    def _replay(self, record):
+        """
+        Apply a single journal record.
+
+        Args:
+            record (dict): The journal record.
+
+        Raises:
+            ValueError: If the operation is unknown.
+        """
+        op = record["op"]
+        if op == "add_book":
+            self.add_book(storage.book_from_dict(record["book"]))
+        elif op == "add_member":
+            self.add_member(Member(record["member_id"], record["name"]))
+        elif op == "borrow":
+            self._borrow(
+                record["member_id"],
+                record["book_id"],
+                record["date_borrowed"],
+                record.get("due_date"),
+            )
+            # A copy handed to a waiting member is journaled as a borrow
+            # right after its return, so the hold ends here.
+            queue = self._holds.get(record["book_id"])
+            if queue is not None and queue.remove(record["member_id"]) and not queue:
+                del self._holds[record["book_id"]]
+        elif op == "return":
+            self._return(record["member_id"], record["book_id"])
+        elif op == "hold":
+            self.place_hold(record["member_id"], record["book_id"])
+        elif op == "cancel_hold":
+            self.cancel_hold(record["member_id"], record["book_id"])
+        else:
+            raise ValueError(f"Unknown journal operation '{op}'.")
 
     def __str__(self):
         """Return a readable summary of the library."""
         return (
             f"Library with {len(self._books)} books, "
             f"{len(self._members)} members, "
-            f"and {len(self._loans)} active loans"
+            f"and {len(self._loans) + self._pending_loans} active loans"
         )
+
+
+def _encode_cursor(kind, offset, last_key):
+    """Build the opaque continuation token for a listing position."""
+    raw = json.dumps([kind, offset, last_key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(kind, cursor):
+    """Read a continuation token back into (offset, last key)."""
+    try:
+        token_kind, offset, last_key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError, AttributeError):
+        raise ValueError("Invalid cursor.") from None
+    if token_kind != kind or not isinstance(offset, int) or offset < 1:
+        raise ValueError(f"Invalid cursor for {kind}.")
+    return offset, last_key
@@ -4,7 +4,25 @@ Loan module for the Smart Library Management System.
 Represents a borrowing event linking a book, member, and date.
 """
 
-from datetime import datetime
+from datetime import date
+
+
+def to_day(value):
+    """
+    Convert a date to an integer day ordinal.
+
+    Args:
+        value: A date in ISO format ("%Y-%m-%d"), a datetime.date, or an
+            integer day ordinal.
+
+    Returns:
+        int: The proleptic Gregorian ordinal of the day.
+    """
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        return date.fromisoformat(value).toordinal()
+    return value.toordinal()
 
 
 class Loan:
@@ -14,13 +32,19 @@ class Loan:
     A loan records when a member borrows a book. It requires both a book and a member
     to exist (composition). A loan is created when borrowing succeeds.
 
+    Dates are stored as integer day ordinals, so comparing and sorting loans by
+    date needs no parsing.
+
     Attributes:
         book (Book): The borrowed book.
         member (Member): The member who borrowed the book.
-        date_borrowed (str): The date when the book was borrowed (ISO format).
+        borrowed_day (int): Day ordinal of the date the book was borrowed.
+        due_day (int): Day ordinal of the date the book is due back.
     """
 
-    def __init__(self, book, member, date_borrowed=None):
+    LOAN_PERIOD_DAYS = 14
+
+    def __init__(self, book, member, date_borrowed=None, due_date=None):
         """
         Initialize a Loan instance.
 
@@ -28,6 +52,8 @@ class Loan:
             book (Book): The book being borrowed.
             member (Member): The member borrowing the book.
             date_borrowed (str, optional): Date in ISO format. Defaults to today's date.
+            due_date (str, optional): Date in ISO format. Defaults to
+                LOAN_PERIOD_DAYS after the date borrowed.
 
         Raises:
             ValueError: If book or member is None.
@@ -36,25 +62,53 @@ class Loan:
             raise ValueError("Loan requires both a book and a member.")
         self.book = book
         self.member = member
-        self.date_borrowed = date_borrowed or datetime.now().strftime("%Y-%m-%d")
+        self.borrowed_day = to_day(date_borrowed or date.today())
+        if due_date is None:
+            self.due_day = self.borrowed_day + self.LOAN_PERIOD_DAYS
+        else:
+            self.due_day = to_day(due_date)
+
+    @property
+    def date_borrowed(self):
+        """Get the date borrowed in ISO format."""
+        return date.fromordinal(self.borrowed_day).isoformat()
+
+    @property
+    def due_date(self):
+        """Get the due date in ISO format."""
+        return date.fromordinal(self.due_day).isoformat()
+
+    def is_overdue(self, today=None):
+        """
+        Check whether the loan is past its due date.
+
+        Args:
+            today (optional): The current date (see to_day). Defaults to today.
+
+        Returns:
+            bool: True if the due date is before today.
+        """
+        return self.due_day < to_day(today or date.today())
 
     def to_dict(self):
         """
         Convert the loan to a dictionary representation.
 
         Returns:
-            dict: Dictionary with book ID, member ID, and date borrowed.
+            dict: Dictionary with book ID, member ID, date borrowed, and due date.
         """
         return {
             "book_id": self.book.id,
             "member_id": self.member.member_id,
             "date_borrowed": self.date_borrowed,
+            "due_date": self.due_date,
         }
 
     def __str__(self):
         """Return a readable string representation of the loan."""
         return (
             f"Loan: {self.member.name} borrowed '{self.book.title}' on {self.date_borrowed}"
+            f", due {self.due_date}"
         )
 
     def __eq__(self, other):
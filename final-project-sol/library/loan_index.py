@@ -0,0 +1,186 @@
+"""
+Loan index module for the Smart Library Management System.
+
+Provides a keyed store of active loans with constant-time lookups.
+"""
+
+from .views import DictValuesSequence
+
+
+class LoanIndex:
+    """
+    Keyed store of active loans.
+
+    Loans are stored by their (member_id, book_id) pair, with secondary
+    indexes by member and by book, so that adding, removing, and looking up
+    a loan are all constant-time operations. Insertion order is preserved.
+
+    Attributes:
+        _loans (dict): Maps (member_id, book_id) to Loan objects.
+        _by_member (dict): Maps member IDs to {book_id: Loan} dictionaries.
+        _by_book (dict): Maps book IDs to {member_id: Loan} dictionaries.
+        _changes (int): Number of times loans were added or removed.
+        _ordered (tuple): (_changes when listed, list of the loans), kept
+            for indexing into view() until the loans change.
+    """
+
+    def __init__(self):
+        """Initialize an empty LoanIndex."""
+        self._loans = {}
+        self._by_member = {}
+        self._by_book = {}
+        self._changes = 0
+        self._ordered = (-1, [])
+
+    def add(self, loan):
+        """
+        Add a loan to the index.
+
+        Args:
+            loan (Loan): The loan to add.
+
+        Raises:
+            ValueError: If a loan for the same member and book already exists.
+        """
+        member_id = loan.member.member_id
+        book_id = loan.book.id
+        key = (member_id, book_id)
+        if key in self._loans:
+            raise ValueError(
+                f"A loan of book '{book_id}' to member '{member_id}' already exists."
+            )
+        self._loans[key] = loan
+        self._changes += 1
+        self._by_member.setdefault(member_id, {})[book_id] = loan
+        self._by_book.setdefault(book_id, {})[member_id] = loan
+
+    def remove(self, member_id, book_id):
+        """
+        Remove a loan from the index.
+
+        Args:
+            member_id (str): The ID of the member holding the loan.
+            book_id (str): The ID of the borrowed book.
+
+        Returns:
+            Loan: The removed loan.
+
+        Raises:
+            KeyError: If no such loan exists.
+        """
+        loan = self._loans.pop((member_id, book_id))
+        self._changes += 1
+
+        member_loans = self._by_member[member_id]
+        del member_loans[book_id]
+        if not member_loans:
+            del self._by_member[member_id]
+
+        book_loans = self._by_book[book_id]
+        del book_loans[member_id]
+        if not book_loans:
+            del self._by_book[book_id]
+
+        return loan
+
+    def get(self, member_id, book_id):
+        """
+        Retrieve a loan by member and book.
+
+        Args:
+            member_id (str): The member ID.
+            book_id (str): The book ID.
+
+        Returns:
+            Loan: The loan object, or None if not found.
+        """
+        return self._loans.get((member_id, book_id))
+
+    def for_member(self, member_id):
+        """
+        Get all loans held by a member.
+
+        Args:
+            member_id (str): The member ID.
+
+        Returns:
+            list: List of Loan objects held by the member.
+        """
+        return list(self._by_member.get(member_id, {}).values())
+
+    def for_book(self, book_id):
+        """
+        Get all loans of a book.
+
+        Args:
+            book_id (str): The book ID.
+
+        Returns:
+            list: List of Loan objects for the book.
+        """
+        return list(self._by_book.get(book_id, {}).values())
+
+    def count_for_member(self, member_id):
+        """
+        Count the loans held by a member.
+
+        Args:
+            member_id (str): The member ID.
+
+        Returns:
+            int: Number of active loans held by the member.
+        """
+        return len(self._by_member.get(member_id, ()))
+
+    def borrower_count(self):
+        """
+        Count the members holding at least one loan.
+
+        Returns:
+            int: Number of members with active loans.
+        """
+        return len(self._by_member)
+
+    def view(self):
+        """
+        Get a read-only view of the loans that reflects later changes.
+
+        Returns:
+            DictValuesSequence: The loans in the order they were added;
+                membership tests and indexing take constant time.
+        """
+        return DictValuesSequence(self._loans, _loan_key, self._listed)
+
+    def _listed(self):
+        """Return the loans as a list, listing them again only after they changed."""
+        changes, loans = self._ordered
+        if changes != self._changes:
+            # Read the count first, so a change made while listing is seen next time.
+            changes = self._changes
+            loans = list(self._loans.values())
+            self._ordered = (changes, loans)
+        return loans
+
+    def clear(self):
+        """Remove all loans from the index."""
+        self._loans.clear()
+        self._changes += 1
+        self._by_member.clear()
+        self._by_book.clear()
+
+    def __contains__(self, key):
+        """Check whether a (member_id, book_id) pair has an active loan."""
+        return key in self._loans
+
+    def __len__(self):
+        """Return the number of active loans."""
+        return len(self._loans)
+
+    def __iter__(self):
+        """Iterate over loans in the order they were added."""
+        return iter(self._loans.values())
+
+
+def _loan_key(loan):
+    """Return the (member_id, book_id) key of a loan."""
+    return loan.member.member_id, loan.book.id
@@ -4,6 +4,8 @@ Member module for the Smart Library Management System.
 Represents a library member and their borrowing history.
 """
 
+from .views import DictValuesSequence
+
 
 class Member:
     """
@@ -15,7 +17,8 @@ class Member:
     Attributes:
         _member_id (str): Unique identifier for the member.
         _name (str): Full name of the member.
-        _borrowed_books (list): List of books currently borrowed by the member.
+        _borrowed_books (dict): Maps book IDs to the books currently borrowed
+            by the member, in the order they were borrowed.
     """
 
     def __init__(self, member_id, name):
@@ -28,7 +31,7 @@ class Member:
         """
         self._member_id = member_id
         self._name = name
-        self._borrowed_books = []
+        self._borrowed_books = {}
 
     @property
     def member_id(self):
@@ -42,8 +45,20 @@ class Member:
 
     @property
     def borrowed_books(self):
-        """Get the list of currently borrowed books."""
-        return self._borrowed_books.copy()
+        """Get a read-only view of the currently borrowed books."""
+        return DictValuesSequence(self._borrowed_books, key=_book_key)
+
+    def has_borrowed(self, book_id):
+        """
+        Check whether the member currently has a book borrowed.
+
+        Args:
+            book_id (str): The book ID.
+
+        Returns:
+            bool: True if the book is borrowed by this member.
+        """
+        return book_id in self._borrowed_books
 
     def borrow_book(self, book):
         """
@@ -55,11 +70,11 @@ class Member:
         Raises:
             ValueError: If the member already has this book borrowed.
         """
-        if any(b.id == book.id for b in self._borrowed_books):
+        if book.id in self._borrowed_books:
             raise ValueError(
                 f"Member {self._name} already has '{book.title}' borrowed."
             )
-        self._borrowed_books.append(book)
+        self._borrowed_books[book.id] = book
 
     def return_book(self, book):
         """
@@ -71,13 +86,10 @@ class Member:
         Raises:
             ValueError: If the member does not have this book borrowed.
         """
-        for i, b in enumerate(self._borrowed_books):
-            if b.id == book.id:
-                self._borrowed_books.pop(i)
-                return
-        raise ValueError(
-            f"Member {self._name} does not have '{book.title}' borrowed."
-        )
+        if self._borrowed_books.pop(book.id, None) is None:
+            raise ValueError(
+                f"Member {self._name} does not have '{book.title}' borrowed."
+            )
 
     def to_dict(self):
         """
@@ -89,7 +101,7 @@ class Member:
         return {
             "member_id": self._member_id,
             "name": self._name,
-            "borrowed_books": [book.id for book in self._borrowed_books],
+            "borrowed_books": list(self._borrowed_books),
         }
 
     def __str__(self):
@@ -101,3 +113,8 @@ class Member:
         if not isinstance(other, Member):
             return False
         return self._member_id == other._member_id
+
+
+def _book_key(book):
+    """Return the key under which a book is stored in a member's borrowed books."""
+    return book.id
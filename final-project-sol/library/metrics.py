@@ -0,0 +1,215 @@
+"""
+Metrics module for the Smart Library Management System.
+
+Provides optional instrumentation that counts calls, errors, and latencies
+of Library operations.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds of the latency histogram buckets, in seconds.
+BUCKETS = (
+    0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005,
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Metrics:
+    """
+    Per-operation call counts, error counts, and latency histograms.
+
+    Instrumentation is attached to a single library instance by replacing its
+    operation methods with timed wrappers, and detached by removing them
+    again. A library without metrics attached runs its original methods, so
+    instrumentation costs nothing when it is off.
+
+        metrics = Metrics()
+        metrics.attach(library)
+        ...
+        print(metrics.report())
+
+    Attributes:
+        _operations (dict): Maps operation names to their statistics.
+        _lock (threading.Lock): Guards the statistics.
+    """
+
+    OPERATIONS = (
+        "add_book",
+        "add_member",
+        "borrow_book",
+        "return_book",
+        "borrow_many",
+        "return_many",
+        "save_to_file",
+        "load_from_file",
+    )
+
+    def __init__(self):
+        """Initialize empty Metrics."""
+        self._operations = {}
+        self._lock = threading.Lock()
+
+    def attach(self, library, operations=None):
+        """
+        Start recording a library's operations.
+
+        Operations the library performs on itself (such as journal replay
+        during recover) are recorded too.
+
+        Args:
+            library (Library): The library to instrument.
+            operations (iterable, optional): Method names to instrument.
+                Defaults to OPERATIONS.
+        """
+        for name in operations or self.OPERATIONS:
+            setattr(library, name, self._wrap(name, getattr(library, name)))
+
+    def detach(self, library):
+        """
+        Stop recording a library's operations.
+
+        Args:
+            library (Library): A library previously passed to attach().
+        """
+        for name, value in list(vars(library).items()):
+            if getattr(value, "__metrics__", None) is self:
+                delattr(library, name)
+
+    def record(self, operation, seconds, error=None):
+        """
+        Record one call of an operation.
+
+        Args:
+            operation (str): The operation name.
+            seconds (float): How long the call took.
+            error (str, optional): Name of the exception raised, if any.
+        """
+        with self._lock:
+            stats = self._operations.get(operation)
+            if stats is None:
+                stats = self._operations[operation] = {
+                    "calls": 0,
+                    "errors": {},
+                    "seconds": 0.0,
+                    "buckets": [0] * (len(BUCKETS) + 1),
+                }
+            stats["calls"] += 1
+            stats["seconds"] += seconds
+            stats["buckets"][bisect_left(BUCKETS, seconds)] += 1
+            if error is not None:
+                stats["errors"][error] = stats["errors"].get(error, 0) + 1
+
+    def snapshot(self):
+        """
+        Export the current statistics.
+
+        Returns:
+            dict: Maps each operation name to a dictionary with calls, errors
+                (counts by exception name), error_rate, seconds (total time),
+                and buckets (a list of (upper bound, count) pairs, the last
+                bound being None for slower calls).
+        """
+        with self._lock:
+            result = {}
+            for operation, stats in self._operations.items():
+                errors = dict(stats["errors"])
+                result[operation] = {
+                    "calls": stats["calls"],
+                    "errors": errors,
+                    "error_rate": sum(errors.values()) / stats["calls"],
+                    "seconds": stats["seconds"],
+                    "buckets": list(zip(BUCKETS + (None,), stats["buckets"])),
+                }
+            return result
+
+    def reset(self):
+        """Discard all recorded statistics."""
+        with self._lock:
+            self._operations.clear()
+
+    def report(self):
+        """
+        Render the statistics in the Prometheus text exposition format.
+
+        Returns:
+            str: The report.
+        """
+        lines = [
+            "# TYPE library_operation_calls_total counter",
+            "# TYPE library_operation_errors_total counter",
+            "# TYPE library_operation_duration_seconds histogram",
+        ]
+        for operation, stats in sorted(self.snapshot().items()):
+            label = f'operation="{operation}"'
+            lines.append(f"library_operation_calls_total{{{label}}} {stats['calls']}")
+            for error, count in sorted(stats["errors"].items()):
+                lines.append(
+                    f'library_operation_errors_total{{{label},error="{error}"}} {count}'
+                )
+            cumulative = 0
+            for bound, count in stats["buckets"]:
+                cumulative += count
+                le = "+Inf" if bound is None else repr(bound)
+                lines.append(
+                    f'library_operation_duration_seconds_bucket{{{label},le="{le}"}} {cumulative}'
+                )
+            lines.append(f"library_operation_duration_seconds_sum{{{label}}} {stats['seconds']:.9f}")
+            lines.append(f"library_operation_duration_seconds_count{{{label}}} {stats['calls']}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port=0, host="127.0.0.1"):
+        """
+        Serve report() over HTTP at /metrics from a background thread.
+
+        Args:
+            port (int, optional): Port to listen on. Defaults to any free port.
+            host (str, optional): Address to bind. Defaults to localhost only.
+
+        Returns:
+            ThreadingHTTPServer: The running server; its server_address holds
+                the actual port. Call shutdown() on it to stop serving.
+        """
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.report().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def _wrap(self, operation, method):
+        """Return a wrapper of method that records each call."""
+        record = self.record
+        clock = time.perf_counter
+
+        @wraps(method)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                result = method(*args, **kwargs)
+            except Exception as e:
+                record(operation, clock() - start, type(e).__name__)
+                raise
+            record(operation, clock() - start)
+            return result
+
+        timed.__metrics__ = self
+        return timed
@@ -0,0 +1,70 @@
+"""
+Results module for the Smart Library Management System.
+
+Represents the outcome of a single operation in a batch.
+"""
+
+
+class OperationResult:
+    """
+    Represents the outcome of one operation in a batch.
+
+    Batch operations report failures as results instead of raising, so the
+    error is described by the exception class that the single-item operation
+    would have raised, together with its message.
+
+    Attributes:
+        member_id (str): The member ID given for the operation.
+        book_id (str): The book ID given for the operation.
+        error (type): The exception class describing the failure, or None on success.
+        message (str): The failure message, or None on success.
+    """
+
+    __slots__ = ("member_id", "book_id", "error", "message")
+
+    def __init__(self, member_id, book_id, error=None, message=None):
+        """
+        Initialize an OperationResult instance.
+
+        Args:
+            member_id (str): The member ID given for the operation.
+            book_id (str): The book ID given for the operation.
+            error (type, optional): The exception class describing the failure.
+            message (str, optional): The failure message.
+        """
+        self.member_id = member_id
+        self.book_id = book_id
+        self.error = error
+        self.message = message
+
+    @property
+    def ok(self):
+        """Check whether the operation succeeded."""
+        return self.error is None
+
+    def raise_error(self):
+        """
+        Raise the exception for a failed operation.
+
+        Raises:
+            Exception: The recorded exception class with its message.
+        """
+        if self.error is not None:
+            raise self.error(self.message)
+
+    def __str__(self):
+        """Return a readable string representation of the result."""
+        if self.error is None:
+            return f"OK: member {self.member_id}, book {self.book_id}"
+        return f"{self.error.__name__}: {self.message}"
+
+    def __eq__(self, other):
+        """Compare results by all of their fields."""
+        if not isinstance(other, OperationResult):
+            return False
+        return (
+            self.member_id == other.member_id
+            and self.book_id == other.book_id
+            and self.error is other.error
+            and self.message == other.message
+        )
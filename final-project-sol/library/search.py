@@ -0,0 +1,150 @@
+"""
+Search module for the Smart Library Management System.
+
+Provides a full-text and prefix search index over book titles and authors.
+"""
+
+import heapq
+import re
+from bisect import bisect_left, insort
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+TITLE_WEIGHT = 2
+AUTHOR_WEIGHT = 1
+
+
+def tokenize(text):
+    """
+    Split text into lowercase search tokens.
+
+    Args:
+        text (str): The text to split. Other values, such as a title
+            stored as a number, are converted to text first.
+
+    Returns:
+        list: The tokens, in order of appearance.
+    """
+    return _TOKEN_PATTERN.findall(str(text).lower())
+
+
+class SearchIndex:
+    """
+    Inverted index over book titles and authors.
+
+    Each token maps to the IDs of the books containing it, weighted so that
+    title matches rank above author matches. A sorted list of all tokens
+    supports prefix queries with binary search, for typeahead.
+
+    Attributes:
+        _postings (dict): Maps tokens to {book_id: weight} dictionaries.
+        _tokens (list): Sorted list of all indexed tokens.
+    """
+
+    def __init__(self):
+        """Initialize an empty SearchIndex."""
+        self._postings = {}
+        self._tokens = []
+
+    def add(self, book):
+        """
+        Index a single book.
+
+        Args:
+            book (Book): The book to index.
+        """
+        for token in self._index_book(book):
+            insort(self._tokens, token)
+
+    def add_many(self, books):
+        """
+        Index many books at once, sorting the token list only once.
+
+        Args:
+            books (iterable): The books to index.
+        """
+        new_tokens = []
+        for book in books:
+            new_tokens.extend(self._index_book(book))
+        if new_tokens:
+            self._tokens.extend(new_tokens)
+            self._tokens.sort()
+
+    def clear(self):
+        """Remove all books from the index."""
+        self._postings.clear()
+        self._tokens.clear()
+
+    def search(self, query, offset=0, limit=20):
+        """
+        Find books matching every word of a query.
+
+        All words but the last must match a token exactly; the last word
+        matches any token it is a prefix of, so partially typed queries work.
+        Results are ranked by score (title matches count double), then by ID.
+
+        Args:
+            query (str): The search text.
+            offset (int, optional): Number of ranked results to skip. Defaults to 0.
+            limit (int, optional): Maximum number of results. Defaults to 20.
+
+        Returns:
+            list: Matching book IDs for the requested page, best first.
+        """
+        words = tokenize(query)
+        if not words or limit <= 0:
+            return []
+
+        scored = [self._postings.get(word, {}) for word in words[:-1]]
+        scored.append(self._prefix_scores(words[-1]))
+        scored.sort(key=len)
+        if not scored[0]:
+            return []
+
+        scores = dict(scored[0])
+        for postings in scored[1:]:
+            scores = {
+                book_id: score + postings[book_id]
+                for book_id, score in scores.items()
+                if book_id in postings
+            }
+            if not scores:
+                return []
+
+        ranked = heapq.nsmallest(
+            offset + limit, scores.items(), key=lambda item: (-item[1], item[0])
+        )
+        return [book_id for book_id, _ in ranked[offset:]]
+
+    def _prefix_scores(self, prefix):
+        """Return {book_id: best weight} for all tokens starting with a prefix."""
+        scores = {}
+        tokens = self._tokens
+        i = bisect_left(tokens, prefix)
+        while i < len(tokens) and tokens[i].startswith(prefix):
+            for book_id, weight in self._postings[tokens[i]].items():
+                if weight > scores.get(book_id, 0):
+                    scores[book_id] = weight
+            i += 1
+        return scores
+
+    def _index_book(self, book):
+        """Add a book's postings and return the tokens that are new to the index."""
+        weights = {}
+        for token in tokenize(book.title):
+            weights[token] = TITLE_WEIGHT
+        for token in tokenize(book.author):
+            weights[token] = max(weights.get(token, 0), AUTHOR_WEIGHT)
+
+        new_tokens = []
+        for token, weight in weights.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                new_tokens.append(token)
+            postings[book.id] = weight
+        return new_tokens
+
+    def __len__(self):
+        """Return the number of distinct indexed tokens."""
+        return len(self._tokens)
@@ -0,0 +1,603 @@
+"""
+Sharding module for the Smart Library Management System.
+
+Provides a Library partitioned across worker processes.
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+import zlib
+from . import storage
+from .library import Library
+from .loan import Loan
+from .results import OperationResult
+from .exceptions import (
+    BookNotAvailableError,
+    BookNotFoundError,
+    MemberNotFoundError,
+    InvalidOperationError,
+)
+
+MANIFEST = "shards.json"
+
+# The order in which Library checks a request, for reporting the same error.
+_ERROR_ORDER = (
+    MemberNotFoundError,
+    BookNotFoundError,
+    InvalidOperationError,
+    BookNotAvailableError,
+)
+
+
+def shard_of(key, shards):
+    """
+    Return the shard that owns an ID.
+
+    Uses CRC-32 rather than hash(), which is randomized per process.
+
+    Args:
+        key (str): A book or member ID.
+        shards (int): Number of shards.
+
+    Returns:
+        int: The shard number.
+    """
+    return zlib.crc32(key.encode()) % shards
+
+
+class ShardedLibrary:
+    """
+    Library partitioned across worker processes by ID hash.
+
+    Each shard is a process holding the books and members whose IDs hash to
+    it. Borrows and returns are routed to the shard owning the member and
+    book. When they live on different shards, a two-phase protocol keeps the
+    shards consistent: both shards check the request first, the book's shard
+    reserving a copy, and the change is committed on both only if both
+    checks pass; otherwise the reservation is released. The member's shard
+    keeps the loan, with a reference copy of the book.
+
+    Each call is a round trip to the worker processes, so throughput scales
+    with the number of cores when work is submitted in batches with
+    borrow_many and return_many, which every shard processes in parallel.
+
+    Use it as a context manager, or call close() to stop the workers:
+
+        with ShardedLibrary(shards=4) as library:
+            library.add_member(Member("M001", "Alice"))
+
+    Attributes:
+        shards (int): Number of shards.
+        _connections (list): Pipe connections to the shard processes.
+        _processes (list): The shard processes.
+        _lock (threading.Lock): Serializes calls from different threads.
+    """
+
+    def __init__(self, shards=None, context=None):
+        """
+        Start the shard processes.
+
+        Args:
+            shards (int, optional): Number of shards. Defaults to the CPU count.
+            context (multiprocessing.context.BaseContext, optional): The
+                multiprocessing context used to start workers. Defaults to
+                the platform default.
+        """
+        self.shards = shards or os.cpu_count() or 1
+        context = context or multiprocessing.get_context()
+        self._connections = []
+        self._processes = []
+        self._lock = threading.Lock()
+        for _ in range(self.shards):
+            parent, child = context.Pipe()
+            process = context.Process(target=_serve, args=(child,), daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+
+    def __enter__(self):
+        """Return the library when entering a with block."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop the shard processes when leaving a with block."""
+        self.close()
+
+    def close(self):
+        """Stop the shard processes."""
+        with self._lock:
+            for connection in self._connections:
+                try:
+                    connection.send(None)
+                except OSError:
+                    pass
+                connection.close()
+            for process in self._processes:
+                process.join()
+            self._connections = []
+            self._processes = []
+
+    def shard_for(self, key):
+        """Return the shard that owns a book or member ID."""
+        return shard_of(key, self.shards)
+
+    def add_book(self, book):
+        """Add a book to its shard (see Library.add_book)."""
+        self._call(self.shard_for(book.id), "add_book", book)
+
+    def add_member(self, member):
+        """Add a member to its shard (see Library.add_member)."""
+        self._call(self.shard_for(member.member_id), "add_member", member)
+
+    def get_book_by_id(self, book_id):
+        """Get a copy of a book from its shard (see Library.get_book_by_id)."""
+        return self._call(self.shard_for(book_id), "get_book_by_id", book_id)
+
+    def get_member_by_id(self, member_id):
+        """Get a copy of a member from its shard (see Library.get_member_by_id)."""
+        return self._call(self.shard_for(member_id), "get_member_by_id", member_id)
+
+    def loan_count(self, member_id):
+        """Count a member's loans (see Library.loan_count)."""
+        return self._call(self.shard_for(member_id), "loan_count", member_id)
+
+    def borrow_book(self, member_id, book_id):
+        """Record a member borrowing a book (see Library.borrow_book)."""
+        self.borrow_many([(member_id, book_id)])[0].raise_error()
+
+    def return_book(self, member_id, book_id):
+        """Record a member returning a book (see Library.return_book)."""
+        self.return_many([(member_id, book_id)])[0].raise_error()
+
+    def borrow_many(self, requests):
+        """
+        Process many borrows across all shards.
+
+        Requests whose member and book share a shard are applied first, in
+        order, by that shard; the remaining requests then go through the
+        two-phase protocol as one batch.
+
+        Args:
+            requests (iterable): Pairs of (member_id, book_id).
+
+        Returns:
+            list: One OperationResult per request, in request order.
+        """
+        return self._batch(list(requests), "borrow_many", self._borrow_across)
+
+    def return_many(self, requests):
+        """
+        Process many returns across all shards.
+
+        Args:
+            requests (iterable): Pairs of (member_id, book_id).
+
+        Returns:
+            list: One OperationResult per request, in request order.
+        """
+        return self._batch(list(requests), "return_many", self._return_across)
+
+    def inventory(self):
+        """
+        Get running totals summed over all shards (see Library.inventory).
+
+        Returns:
+            dict: The combined totals.
+        """
+        totals = {}
+        for stats in self._all("inventory"):
+            for name, value in stats.items():
+                totals[name] = totals.get(name, 0) + value
+        totals["loans_per_member"] = (
+            totals["active_loans"] / totals["members"] if totals.get("members") else 0.0
+        )
+        return totals
+
+    def verify_inventory(self):
+        """
+        Check every shard's running totals (see Library.verify_inventory).
+
+        Returns:
+            list: Mismatches, each prefixed with its shard number.
+        """
+        return [
+            f"shard {shard}: {problem}"
+            for shard, problems in enumerate(self._all("verify_inventory"))
+            for problem in problems
+        ]
+
+    def save(self, directory):
+        """
+        Snapshot every shard, in parallel, into one file per shard.
+
+        Args:
+            directory (str): Directory to write the snapshots to; created if needed.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self._all("save_to_file", lambda shard: (_shard_file(directory, shard),))
+        with open(os.path.join(directory, MANIFEST), "w") as f:
+            json.dump({"shards": self.shards}, f)
+
+    def load(self, directory):
+        """
+        Load every shard from snapshots written by save().
+
+        Args:
+            directory (str): Directory holding the snapshots.
+
+        Raises:
+            FileNotFoundError: If the snapshots don't exist.
+            ValueError: If they were written with a different number of shards.
+        """
+        with open(os.path.join(directory, MANIFEST)) as f:
+            shards = json.load(f)["shards"]
+        if shards != self.shards:
+            raise ValueError(
+                f"Snapshot has {shards} shards, but this library has {self.shards}."
+            )
+        self._all("load_from_file", lambda shard: (_shard_file(directory, shard),))
+
+    def _batch(self, requests, local_method, across):
+        """Route same-shard requests to their shard, then run the rest across shards."""
+        results = [None] * len(requests)
+        local = {}
+        crossing = []
+        for position, (member_id, book_id) in enumerate(requests):
+            shard = self.shard_for(member_id)
+            if shard == self.shard_for(book_id):
+                local.setdefault(shard, []).append(position)
+            else:
+                crossing.append(position)
+        with self._lock:
+            replies = self._scatter({
+                shard: (local_method, [requests[p] for p in positions])
+                for shard, positions in local.items()
+            })
+            for shard, positions in local.items():
+                for position, result in zip(positions, replies[shard]):
+                    results[position] = result
+            if crossing:
+                for position, result in zip(crossing, across([requests[p] for p in crossing])):
+                    results[position] = result
+        return results
+
+    def _borrow_across(self, requests):
+        """Borrow with the two-phase protocol; members and books on different shards."""
+        by_member, by_book = self._group(requests)
+        replies = self._scatter(
+            {shard: ("prepare_borrow", [requests[i] for i in items]) for shard, items in by_member.items()},
+            {shard: ("reserve_copies", [requests[i][1] for i in items]) for shard, items in by_book.items()},
+        )
+        member_checks = _spread(by_member, replies[0], len(requests))
+        book_checks = _spread(by_book, replies[1], len(requests))
+
+        results = []
+        commits, aborts, releases = {}, {}, {}
+        for i, (member_id, book_id) in enumerate(requests):
+            member_error, book_check = member_checks[i], book_checks[i]
+            book_error = book_check if isinstance(book_check, tuple) else None
+            error = _first_error(member_error, book_error)
+            member_shard, book_shard = self.shard_for(member_id), self.shard_for(book_id)
+            if error is None:
+                commits.setdefault(member_shard, []).append((member_id, book_check))
+                results.append(OperationResult(member_id, book_id))
+                continue
+            if member_error is None:
+                aborts.setdefault(member_shard, []).append((member_id, book_id))
+            if book_error is None:
+                releases.setdefault(book_shard, []).append(book_id)
+            results.append(OperationResult(member_id, book_id, *error))
+
+        self._scatter(
+            {shard: ("commit_borrow", items) for shard, items in commits.items()},
+            {shard: ("abort_borrow", items) for shard, items in aborts.items()},
+            {shard: ("release_copies", items) for shard, items in releases.items()},
+        )
+        return results
+
+    def _return_across(self, requests):
+        """Return with the two-phase protocol; members and books on different shards."""
+        by_member, by_book = self._group(requests)
+        replies = self._scatter(
+            {shard: ("check_returns", [requests[i] for i in items]) for shard, items in by_member.items()},
+            {shard: ("find_books", [requests[i][1] for i in items]) for shard, items in by_book.items()},
+        )
+        member_checks = _spread(by_member, replies[0], len(requests))
+        book_checks = _spread(by_book, replies[1], len(requests))
+
+        results = []
+        releases, returns = {}, {}
+        for i, (member_id, book_id) in enumerate(requests):
+            error = _first_error(member_checks[i], book_checks[i])
+            if error is not None:
+                results.append(OperationResult(member_id, book_id, *error))
+                continue
+            releases.setdefault(self.shard_for(member_id), []).append((member_id, book_id))
+            returns.setdefault(self.shard_for(book_id), []).append(book_id)
+            results.append(OperationResult(member_id, book_id))
+
+        self._scatter(
+            {shard: ("release_loans", items) for shard, items in releases.items()},
+            {shard: ("return_copies", items) for shard, items in returns.items()},
+        )
+        return results
+
+    def _group(self, requests):
+        """Group request positions by member shard and by book shard."""
+        by_member, by_book = {}, {}
+        for i, (member_id, book_id) in enumerate(requests):
+            by_member.setdefault(self.shard_for(member_id), []).append(i)
+            by_book.setdefault(self.shard_for(book_id), []).append(i)
+        return by_member, by_book
+
+    def _call(self, shard, method, *args):
+        """Call a method on one shard and return its result."""
+        with self._lock:
+            return self._scatter({shard: (method, *args)})[shard]
+
+    def _all(self, method, arguments=lambda shard: ()):
+        """Call a method on every shard in parallel and return the results in shard order."""
+        with self._lock:
+            replies = self._scatter({
+                shard: (method, *arguments(shard)) for shard in range(self.shards)
+            })
+        return [replies[shard] for shard in range(self.shards)]
+
+    def _scatter(self, *rounds):
+        """
+        Send calls to shards, then collect all the replies.
+
+        Each argument maps shard numbers to (method, *args) calls. All calls
+        are sent before any reply is read, so the shards work in parallel.
+        Calls to the same shard run in argument order.
+
+        Returns:
+            With one argument, a dict mapping shard numbers to results;
+            otherwise a list of such dicts, one per argument.
+
+        Raises:
+            Exception: The first exception raised by a shard, after every
+                reply has been collected.
+        """
+        for calls in rounds:
+            for shard, call in calls.items():
+                self._connections[shard].send(call)
+        replies = []
+        error = None
+        for calls in rounds:
+            results = {}
+            for shard in calls:
+                ok, value = self._connections[shard].recv()
+                if ok:
+                    results[shard] = value
+                elif error is None:
+                    error = value
+            replies.append(results)
+        if error is not None:
+            raise error
+        return replies[0] if len(rounds) == 1 else replies
+
+
+class _Shard(Library):
+    """
+    The Library held by one shard process.
+
+    Besides the usual operations, a shard implements its side of the
+    two-phase protocol for loans whose member and book live on different
+    shards. Such loans are kept on the member's shard and refer to a copy
+    of the book made when it was borrowed.
+
+    Attributes:
+        _pending (set): (member_id, book_id) pairs prepared but not yet
+            committed or aborted.
+    """
+
+    def __init__(self):
+        """Initialize an empty shard."""
+        super().__init__()
+        self._pending = set()
+
+    def prepare_borrow(self, requests):
+        """
+        Check the member side of cross-shard borrows.
+
+        Args:
+            requests (list): (member_id, book_id) pairs.
+
+        Returns:
+            list: (exception class, message) for each failed check, or None.
+        """
+        checks = []
+        for member_id, book_id in requests:
+            member = self._members.get(member_id)
+            if member is None:
+                checks.append((MemberNotFoundError, f"Member with ID '{member_id}' not found."))
+            elif member.has_borrowed(book_id) or (member_id, book_id) in self._pending:
+                loan = self._loans.get(member_id, book_id)
+                title = loan.book.title if loan else book_id
+                checks.append((
+                    InvalidOperationError,
+                    f"Member {member.name} already has '{title}' borrowed.",
+                ))
+            else:
+                self._pending.add((member_id, book_id))
+                checks.append(None)
+        return checks
+
+    def reserve_copies(self, book_ids):
+        """
+        Take one copy of each book for cross-shard borrows.
+
+        Args:
+            book_ids (list): The books to reserve, in order.
+
+        Returns:
+            list: For each book, its dictionary if a copy was reserved, or
+                (exception class, message) if not.
+        """
+        replies = []
+        for book_id in book_ids:
+            book = self._books.get(book_id)
+            if book is None:
+                replies.append((BookNotFoundError, f"Book with ID '{book_id}' not found."))
+            elif not book.can_borrow():
+                replies.append((BookNotAvailableError, f"No copies of '{book.title}' are available."))
+            else:
+                book.borrow()
+                self._stats.copies_changed(book, -1)
+                replies.append(book.to_dict())
+        return replies
+
+    def release_copies(self, book_ids):
+        """Give back copies reserved by reserve_copies, for aborted borrows."""
+        self.return_copies(book_ids)
+
+    def commit_borrow(self, items):
+        """
+        Record the member side of committed cross-shard borrows.
+
+        Args:
+            items (list): (member_id, book dictionary) pairs.
+        """
+        for member_id, book_record in items:
+            book = storage.book_from_dict(book_record)
+            self._pending.discard((member_id, book.id))
+            self._add_remote_loan(Loan(book, self._members[member_id]))
+
+    def abort_borrow(self, requests):
+        """Forget prepared cross-shard borrows that were aborted."""
+        for request in requests:
+            self._pending.discard(tuple(request))
+
+    def check_returns(self, requests):
+        """
+        Check the member side of cross-shard returns.
+
+        Args:
+            requests (list): (member_id, book_id) pairs.
+
+        Returns:
+            list: (exception class, message) for each failed check, or None.
+        """
+        checks = []
+        returning = set()
+        for member_id, book_id in requests:
+            member = self._members.get(member_id)
+            if member is None:
+                checks.append((MemberNotFoundError, f"Member with ID '{member_id}' not found."))
+            elif (member_id, book_id) not in self._loans or (member_id, book_id) in returning:
+                checks.append((
+                    InvalidOperationError,
+                    f"Member {member.name} does not have '{book_id}' borrowed.",
+                ))
+            else:
+                returning.add((member_id, book_id))
+                checks.append(None)
+        return checks
+
+    def find_books(self, book_ids):
+        """
+        Check the book side of cross-shard returns.
+
+        Args:
+            book_ids (list): The books being returned.
+
+        Returns:
+            list: (exception class, message) for each missing book, or None.
+        """
+        return [
+            None if book_id in self._books
+            else (BookNotFoundError, f"Book with ID '{book_id}' not found.")
+            for book_id in book_ids
+        ]
+
+    def release_loans(self, requests):
+        """Remove the loans of committed cross-shard returns."""
+        for member_id, book_id in requests:
+            loan = self._loans.remove(member_id, book_id)
+            loan.member.return_book(loan.book)
+            self._due.discard(loan)
+
+    def return_copies(self, book_ids):
+        """Put copies of books back on the shelf."""
+        for book_id in book_ids:
+            book = self._books[book_id]
+            book.return_book()
+            self._stats.copies_changed(book, 1)
+
+    def _add_remote_loan(self, loan):
+        """Add a loan of a book held by another shard."""
+        loan.member.borrow_book(loan.book)
+        self._loans.add(loan)
+        self._due.push(loan)
+
+    def _iter_sections(self):
+        """Yield sections for saving, embedding the book in loans of other shards' books."""
+        for name, records in super()._iter_sections():
+            if name == "loans":
+                records = (self._loan_record(loan) for loan in self._loans)
+            yield name, records
+
+    def _loan_record(self, loan):
+        """Serialize a loan, including the book if another shard holds it."""
+        record = loan.to_dict()
+        if loan.book.id not in self._books:
+            record["book"] = loan.book.to_dict()
+        return record
+
+    def _load_record(self, section, record, lazy=False):
+        """Restore a record, including loans of other shards' books."""
+        if section == "loans" and "book" in record and record["book_id"] not in self._books:
+            member = self._members.get(record["member_id"])
+            if member:
+                self._add_remote_loan(Loan(
+                    storage.book_from_dict(record["book"]),
+                    member,
+                    record["date_borrowed"],
+                    record.get("due_date"),
+                ))
+        else:
+            super()._load_record(section, record, lazy)
+
+
+def _serve(connection):
+    """Run one shard: apply calls received on the connection until told to stop."""
+    shard = _Shard()
+    while True:
+        try:
+            call = connection.recv()
+        except EOFError:
+            return
+        if call is None:
+            return
+        method, *args = call
+        try:
+            reply = (True, getattr(shard, method)(*args))
+        except Exception as e:
+            reply = (False, e)
+        connection.send(reply)
+
+
+def _spread(groups, replies, count):
+    """Put per-shard replies back into request order."""
+    ordered = [None] * count
+    for shard, positions in groups.items():
+        for position, reply in zip(positions, replies[shard]):
+            ordered[position] = reply
+    return ordered
+
+
+def _first_error(*checks):
+    """Return the failed check Library would report first, or None if all passed."""
+    failed = [check for check in checks if check is not None]
+    if not failed:
+        return None
+    return min(failed, key=lambda check: _ERROR_ORDER.index(check[0]))
+
+
+def _shard_file(directory, shard):
+    """Return the snapshot file of a shard."""
+    return os.path.join(directory, f"shard-{shard:03d}.jsonl")
@@ -0,0 +1,137 @@
+"""
+Storage module for the Smart Library Management System.
+
+Provides streaming serialization of library records. The streaming format
+stores one JSON record per line, grouped into books, members, loans, and
+holds sections, so that saving and loading never hold the whole document in
+memory:
+
+    {"format": "library-jsonl", "version": 1}
+    {"section": "books"}
+    {"type": "PhysicalBook", "id": "B001", ...}
+    {"section": "members"}
+    {"member_id": "M001", ...}
+    {"section": "loans"}
+    {"book_id": "B001", "member_id": "M001", ...}
+    {"section": "holds"}
+    {"book_id": "B001", "member_id": "M002"}
+
+The header line may carry extra metadata (such as the journal sequence
+number), which is reported as a "meta" record when reading. The original
+single-document JSON format is still readable; it keeps its metadata under a
+top-level "meta" key.
+"""
+
+import json
+from .book import PhysicalBook, EBook
+
+FORMAT_NAME = "library-jsonl"
+FORMAT_VERSION = 1
+SECTIONS = ("books", "members", "loans", "holds")
+
+
+def book_from_dict(data):
+    """
+    Build a book from its dictionary representation.
+
+    Args:
+        data (dict): Dictionary produced by Book.to_dict().
+
+    Returns:
+        Book: A PhysicalBook or EBook instance.
+
+    Raises:
+        ValueError: If the book type is unknown.
+    """
+    if data["type"] == "PhysicalBook":
+        return PhysicalBook(
+            data["id"], data["title"], data["author"], data["available_copies"]
+        )
+    if data["type"] == "EBook":
+        return EBook(data["id"], data["title"], data["author"], data["file_size_mb"])
+    raise ValueError(f"Unknown book type '{data['type']}'.")
+
+
+def write_jsonl(file, sections, meta=None):
+    """
+    Write sections of records to a file in the streaming format.
+
+    Args:
+        file: A text file opened for writing.
+        sections (iterable): Pairs of (section name, iterable of dicts).
+            Records are consumed lazily, one line at a time.
+        meta (dict, optional): Extra metadata stored in the header line.
+    """
+    dumps = json.JSONEncoder(separators=(",", ":")).encode
+    header = {"format": FORMAT_NAME, "version": FORMAT_VERSION}
+    if meta:
+        header.update(meta)
+    file.write(dumps(header) + "\n")
+    for name, records in sections:
+        file.write(dumps({"section": name}) + "\n")
+        file.writelines(dumps(record) + "\n" for record in records)
+
+
+def read_records(file):
+    """
+    Read records from a file in either the streaming or the original format.
+
+    The streaming format is detected from its header line. Any other content
+    is parsed as a single JSON document for backward compatibility.
+
+    Args:
+        file: A text file opened for reading.
+
+    Yields:
+        tuple: Pairs of (section name, record dict), in file order. A
+            ("meta", dict) pair comes first if the file carries metadata.
+
+    Raises:
+        ValueError: If a streaming file has an unsupported version or a
+            record appears before any section marker.
+        json.JSONDecodeError: If the file is not valid JSON.
+    """
+    first_line = file.readline()
+    header = _parse_header(first_line)
+    if header is None:
+        file.seek(0)
+        data = json.load(file)
+        if data.get("meta"):
+            yield "meta", data["meta"]
+        for name in SECTIONS:
+            for record in data.get(name, []):
+                yield name, record
+        return
+
+    if header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported file version {header.get('version')!r}.")
+    meta = {
+        key: value for key, value in header.items()
+        if key not in ("format", "version")
+    }
+    if meta:
+        yield "meta", meta
+
+    section = None
+    loads = json.loads
+    for line in file:
+        if not line.strip():
+            continue
+        record = loads(line)
+        if len(record) == 1 and "section" in record:
+            section = record["section"]
+        elif section is None:
+            raise ValueError("Record found before any section marker.")
+        else:
+            yield section, record
+
+
+def _parse_header(line):
+    """Return the streaming-format header from a line, or None if absent."""
+    try:
+        header = json.loads(line)
+    except ValueError:
+        return None
+    if isinstance(header, dict) and header.get("format") == FORMAT_NAME:
+        return header
+    return None
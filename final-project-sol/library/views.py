@@ -0,0 +1,221 @@
+"""
+Views module for the Smart Library Management System.
+
+Provides read-only views over internal collections that avoid copying.
+"""
+
+from collections.abc import Mapping, Sequence
+from itertools import islice
+
+
+class DictValuesSequence(Sequence):
+    """
+    Read-only sequence view over the values of a dictionary.
+
+    The view does not copy the underlying dictionary, so it always reflects
+    its current contents. Values are returned in insertion order.
+
+    Indexing takes constant time when the owner provides a list of the
+    values that it keeps until the dictionary changes; building that list
+    after a change costs one pass over the values. Otherwise an index is
+    reached by walking from the nearer end, which suits small dictionaries.
+    Iterating, in either direction, never builds anything.
+
+    Attributes:
+        _data (dict): The dictionary whose values are exposed.
+        _key (callable): Optional function mapping a value to its dictionary key,
+            used to answer membership tests in constant time.
+        _listed (callable): Optional function returning the values as a list,
+            used for indexing.
+    """
+
+    __slots__ = ("_data", "_key", "_listed")
+
+    def __init__(self, data, key=None, listed=None):
+        """
+        Initialize a DictValuesSequence.
+
+        Args:
+            data (dict): The dictionary whose values are exposed.
+            key (callable, optional): Function mapping a value to its key.
+            listed (callable, optional): Function returning the current
+                values as a list, which must not be modified.
+        """
+        self._data = data
+        self._key = key
+        self._listed = listed
+
+    def __len__(self):
+        """Return the number of values."""
+        return len(self._data)
+
+    def __iter__(self):
+        """Iterate over the values in insertion order."""
+        return iter(self._data.values())
+
+    def __reversed__(self):
+        """Iterate over the values, most recently added first."""
+        return reversed(self._data.values())
+
+    def __getitem__(self, index):
+        """
+        Get a value by position, or a list of values for a slice.
+
+        Raises:
+            IndexError: If the position is out of range.
+        """
+        if self._listed is not None:
+            values = self._listed()
+        elif isinstance(index, slice):
+            values = list(self._data.values())
+        else:
+            size = len(self._data)
+            if index < 0:
+                index += size
+            if index < 0 or index >= size:
+                raise IndexError("view index out of range")
+            if index < size // 2:
+                return next(islice(self._data.values(), index, None))
+            return next(islice(reversed(self._data.values()), size - 1 - index, None))
+        try:
+            return values[index]
+        except IndexError:
+            raise IndexError("view index out of range") from None
+
+    def __contains__(self, value):
+        """Check whether a value is present, in constant time when a key function is set."""
+        if self._key is None:
+            return any(item == value for item in self._data.values())
+        try:
+            return self._data.get(self._key(value)) == value
+        except (AttributeError, TypeError):
+            return False
+
+    def __repr__(self):
+        """Return a debug representation listing the values."""
+        return f"{type(self).__name__}({list(self._data.values())!r})"
+
+
+class LiveMapping(Mapping):
+    """
+    Read-only mapping view that always reads the owner's current mapping.
+
+    The view holds a function returning the mapping rather than the mapping
+    itself, so it stays correct when the owner replaces its storage (for
+    example after loading a snapshot). Nothing is copied; keys(), values(),
+    and items() return the underlying mapping's own views.
+
+    Attributes:
+        _source (callable): Returns the mapping to read.
+    """
+
+    __slots__ = ("_source",)
+
+    def __init__(self, source):
+        """
+        Initialize a LiveMapping.
+
+        Args:
+            source (callable): Function returning the mapping to read.
+        """
+        self._source = source
+
+    def __getitem__(self, key):
+        """Return the value for a key."""
+        return self._source()[key]
+
+    def get(self, key, default=None):
+        """Return the value for a key, or default if it is missing."""
+        return self._source().get(key, default)
+
+    def __contains__(self, key):
+        """Check whether a key is present."""
+        return key in self._source()
+
+    def __iter__(self):
+        """Iterate over the keys."""
+        return iter(self._source())
+
+    def __len__(self):
+        """Return the number of entries."""
+        return len(self._source())
+
+    def keys(self):
+        """Return a view of the keys."""
+        return self._source().keys()
+
+    def values(self):
+        """Return a view of the values."""
+        return self._source().values()
+
+    def items(self):
+        """Return a view of the (key, value) pairs."""
+        return self._source().items()
+
+    def __repr__(self):
+        """Return a debug representation listing the entries."""
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+
+class KeyOrder:
+    """
+    Positional access to the keys of a mapping that nothing is removed from.
+
+    Keys are listed from the front only as far as positions are asked for,
+    and kept. Additions go at the end of the mapping, so once it has grown
+    the keys not listed yet are its last ones, and they are all read from
+    the end with reversed() instead. Either way each key is listed once,
+    and reading keys at any position costs time proportional to how many
+    are read.
+
+    Attributes:
+        mapping (Mapping): The mapping whose keys are listed.
+        _keys (list): Keys listed so far, in insertion order.
+        _entries (iterator): Yields the keys not listed yet, while the
+            mapping keeps its length.
+        _size (int): Length of the mapping when _entries was started.
+    """
+
+    __slots__ = ("mapping", "_keys", "_entries", "_size")
+
+    def __init__(self, mapping):
+        """
+        Initialize a KeyOrder.
+
+        Args:
+            mapping (Mapping): The mapping whose keys are listed.
+        """
+        self.mapping = mapping
+        self._keys = []
+        self._entries = iter(mapping)
+        self._size = len(mapping)
+
+    def keys(self, start, stop):
+        """
+        Get the keys at a range of positions.
+
+        Args:
+            start (int): Position of the first key.
+            stop (int): Position after the last key.
+
+        Returns:
+            list: The keys, fewer if the mapping ends before stop.
+        """
+        keys = self._keys
+        if min(stop, len(self.mapping)) > len(keys):
+            if len(self.mapping) != self._size:
+                self._list_rest()
+            else:
+                keys.extend(islice(self._entries, stop - len(keys)))
+        return keys[start:stop]
+
+    def _list_rest(self):
+        """List every key not listed yet, reading them from the end of the mapping."""
+        keys = self._keys
+        rest = len(self.mapping) - len(keys)
+        try:
+            keys.extend(reversed(list(islice(reversed(self.mapping), rest))))
+        except TypeError:
+            # Mappings that cannot be reversed are read from the front.
+            keys.extend(islice(iter(self.mapping), len(keys), None))
+        self._size = len(keys)
@@ -2,8 +2,31 @@
 Smart Library Management System - Console Menu Interface.
 
 A simple text-based menu for interacting with the library system.
+
+Commands can also be run non-interactively from a file (or "-" for stdin),
+one per line, which is handy for scripting and load testing:
+
+    python main.py --batch commands.txt [--quiet]
+
+Batch commands (arguments containing spaces go in quotes; lines starting
+with # are comments):
+
+    add_physical BOOK_ID TITLE AUTHOR COPIES
+    add_ebook BOOK_ID TITLE AUTHOR SIZE_MB
+    add_member MEMBER_ID NAME
+    borrow MEMBER_ID BOOK_ID
+    return MEMBER_ID BOOK_ID
+    list_books
+    list_members
+    list_member_books MEMBER_ID
+    save FILENAME
+    load FILENAME
 """
 
+import shlex
+import sys
+import time
+
 from library import (
     Library,
     PhysicalBook,
@@ -15,6 +38,8 @@ from library import (
     InvalidOperationError,
 )
 
+PAGE_SIZE = 20
+
 
 def print_header(title):
     """Print a formatted header."""
@@ -134,26 +159,41 @@ def return_book(library):
         print(f"✗ Unexpected error: {e}")
 
 
+def print_pages(fetch, empty_message):
+    """
+    Print a listing one page at a time, asking before each further page.
+
+    Args:
+        fetch (callable): Called as fetch(limit, cursor); returns a page of
+            items and the cursor for the next page, like Library.page_books.
+        empty_message (str): Printed if there is nothing to list.
+    """
+    cursor = None
+    number = 0
+    while True:
+        items, cursor = fetch(PAGE_SIZE, cursor)
+        if not items and not number:
+            print(empty_message)
+            return
+        for item in items:
+            number += 1
+            print(f"{number}. {item}")
+        if cursor is None:
+            return
+        if input("-- Press Enter for more, or q to stop: ").strip().lower() == "q":
+            return
+
+
 def list_books(library):
-    """Display all books in the library."""
+    """Display all books in the library, a page at a time."""
     print_header("ALL BOOKS IN LIBRARY")
-    books = library.list_books()
-    if not books:
-        print("No books in the library.")
-    else:
-        for i, book in enumerate(books, 1):
-            print(f"{i}. {book}")
+    print_pages(library.page_books, "No books in the library.")
 
 
 def list_members(library):
-    """Display all members in the library."""
+    """Display all members in the library, a page at a time."""
     print_header("ALL MEMBERS")
-    members = library.list_members()
-    if not members:
-        print("No members registered.")
-    else:
-        for i, member in enumerate(members, 1):
-            print(f"{i}. {member}")
+    print_pages(library.page_members, "No members registered.")
 
 
 def list_member_books(library):
@@ -191,22 +231,209 @@ def save_library(library):
 
 
 def load_library(library):
-    """Load library data from a JSON file."""
+    """Load library data from a JSON file, through its snapshot cache."""
     print_header("LOAD LIBRARY")
     try:
         filename = input("Enter filename (default: data.json): ").strip()
         if not filename:
             filename = "data.json"
-        library.load_from_file(filename)
-        print(f"✓ Library loaded from {filename}")
+        if library.load_cached(filename):
+            print(f"✓ Library loaded from {filename} (cached)")
+        else:
+            print(f"✓ Library loaded from {filename}")
     except FileNotFoundError:
         print(f"✗ File '{filename}' not found.")
     except Exception as e:
         print(f"✗ Error: {e}")
 
 
-def main():
+def batch_add_physical(library, book_id, title, author, copies):
+    """Add a physical book from a batch command."""
+    book = PhysicalBook(book_id, title, author, int(copies))
+    library.add_book(book)
+    return f"✓ Successfully added: {book}"
+
+
+def batch_add_ebook(library, book_id, title, author, file_size):
+    """Add an e-book from a batch command."""
+    book = EBook(book_id, title, author, float(file_size))
+    library.add_book(book)
+    return f"✓ Successfully added: {book}"
+
+
+def batch_add_member(library, member_id, name):
+    """Add a member from a batch command."""
+    member = Member(member_id, name)
+    library.add_member(member)
+    return f"✓ Successfully added: {member}"
+
+
+def batch_borrow(library, member_id, book_id):
+    """Borrow a book from a batch command."""
+    library.borrow_book(member_id, book_id)
+    return f"✓ {member_id} borrowed {book_id}"
+
+
+def batch_return(library, member_id, book_id):
+    """Return a book from a batch command."""
+    library.return_book(member_id, book_id)
+    return f"✓ {member_id} returned {book_id}"
+
+
+def batch_list_books(library):
+    """List all books from a batch command."""
+    books = library.list_books()
+    if not books:
+        return "No books in the library."
+    return "\n".join(f"{i}. {book}" for i, book in enumerate(books, 1))
+
+
+def batch_list_members(library):
+    """List all members from a batch command."""
+    members = library.list_members()
+    if not members:
+        return "No members registered."
+    return "\n".join(f"{i}. {member}" for i, member in enumerate(members, 1))
+
+
+def batch_list_member_books(library, member_id):
+    """List a member's borrowed books from a batch command."""
+    member = library.get_member_by_id(member_id)
+    if not member:
+        raise MemberNotFoundError(f"Member with ID '{member_id}' not found.")
+    if not member.borrowed_books:
+        return f"{member.name} has no borrowed books."
+    return "\n".join(f"{i}. {book}" for i, book in enumerate(member.borrowed_books, 1))
+
+
+def batch_save(library, filename):
+    """Save the library from a batch command."""
+    library.save_to_file(filename)
+    return f"✓ Library saved to {filename}"
+
+
+def batch_load(library, filename):
+    """Load the library from a batch command."""
+    cached = library.load_cached(filename)
+    return f"✓ Library loaded from {filename}" + (" (cached)" if cached else "")
+
+
+BATCH_COMMANDS = {
+    "add_physical": (batch_add_physical, "BOOK_ID TITLE AUTHOR COPIES"),
+    "add_ebook": (batch_add_ebook, "BOOK_ID TITLE AUTHOR SIZE_MB"),
+    "add_member": (batch_add_member, "MEMBER_ID NAME"),
+    "borrow": (batch_borrow, "MEMBER_ID BOOK_ID"),
+    "return": (batch_return, "MEMBER_ID BOOK_ID"),
+    "list_books": (batch_list_books, ""),
+    "list_members": (batch_list_members, ""),
+    "list_member_books": (batch_list_member_books, "MEMBER_ID"),
+    "save": (batch_save, "FILENAME"),
+    "load": (batch_load, "FILENAME"),
+}
+
+
+def run_batch(library, lines, output, quiet=False, flush_every=1000):
+    """
+    Run batch commands against a library.
+
+    Each command's result (or error) is collected in a buffer that is
+    written to the output every flush_every commands, instead of printing
+    line by line.
+
+    Args:
+        library (Library): The library to run the commands against.
+        lines (iterable): The command lines.
+        output: A text file receiving the results.
+        quiet (bool, optional): Whether to write only errors. Defaults to False.
+        flush_every (int, optional): Commands per buffered write. Defaults to 1000.
+
+    Returns:
+        tuple: (commands run, commands failed).
+    """
+    buffer = []
+    commands = failed = 0
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            words = shlex.split(line) if '"' in line or "'" in line else line.split()
+            name, args = words[0], words[1:]
+            if name not in BATCH_COMMANDS:
+                raise ValueError(f"Unknown command '{name}'.")
+            handler, usage = BATCH_COMMANDS[name]
+            if len(args) != len(usage.split()):
+                raise ValueError(f"Usage: {name} {usage}".rstrip())
+            result = handler(library, *args)
+            if not quiet:
+                buffer.append(result)
+        except Exception as e:
+            failed += 1
+            buffer.append(f"✗ Line {number}: {e}")
+        commands += 1
+        if len(buffer) >= flush_every:
+            output.write("\n".join(buffer) + "\n")
+            buffer.clear()
+    if buffer:
+        output.write("\n".join(buffer) + "\n")
+    return commands, failed
+
+
+def batch_main(filename, quiet=False):
+    """
+    Run a command file (or "-" for stdin) against a new library.
+
+    Results go to stdout; a throughput summary goes to stderr.
+
+    Args:
+        filename (str): Path to the command file, or "-".
+        quiet (bool, optional): Whether to print only errors. Defaults to False.
+
+    Returns:
+        int: Exit status, 1 if any command failed, 2 if the file cannot be opened.
+    """
+    library = Library()
+    start = time.perf_counter()
+    if filename == "-":
+        commands, failed = run_batch(library, sys.stdin, sys.stdout, quiet)
+    else:
+        try:
+            f = open(filename, "r")
+        except OSError as e:
+            print(f"✗ Error: cannot open '{filename}': {e.strerror}", file=sys.stderr)
+            return 2
+        with f:
+            commands, failed = run_batch(library, f, sys.stdout, quiet)
+    elapsed = time.perf_counter() - start
+    rate = commands / elapsed if elapsed else 0.0
+    print(
+        f"Ran {commands} commands ({failed} failed) in {elapsed:.3f}s: "
+        f"{rate:,.0f} commands/sec",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+def parse_args(argv):
+    """Parse the command line options."""
+    # Imported here so that starting the menu does not pay for argparse.
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Smart Library Management System")
+    parser.add_argument("--batch", metavar="FILE", help='run commands from FILE ("-" for stdin)')
+    parser.add_argument("--quiet", action="store_true", help="in batch mode, print only errors")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main program loop."""
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv:
+        args = parse_args(argv)
+        if args.batch is not None:
+            return batch_main(args.batch, args.quiet)
+
     library = Library()
     print_header("SMART LIBRARY MANAGEMENT SYSTEM")
     print("Welcome! Type your choice to begin.\n")
@@ -239,10 +466,10 @@ def main():
             print("\n" + "=" * 60)
             print("  Thank you for using the Library Management System!")
             print("=" * 60 + "\n")
-            break
+            return 0
         else:
             print("✗ Invalid choice. Please enter a number between 1 and 11.")
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
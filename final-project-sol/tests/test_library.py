@@ -9,15 +9,37 @@ Tests cover all major functionality including:
 - Error handling
 """
 
+import asyncio
+import io
 import json
 import os
+import random
+import subprocess
+import sys
+import threading
+import urllib.request
 import pytest
+import main
 from library import (
     Library,
+    ConcurrentLibrary,
+    AsyncLibrary,
+    ShardedLibrary,
     PhysicalBook,
     EBook,
     Member,
     Loan,
+    LoanIndex,
+    Journal,
+    Event,
+    EventBus,
+    ImportReport,
+    OperationResult,
+    SearchIndex,
+    ColumnarCatalog,
+    HoldQueue,
+    BinarySnapshot,
+    Metrics,
     BookNotAvailableError,
     BookNotFoundError,
     MemberNotFoundError,
@@ -82,6 +104,12 @@ class TestPhysicalBook:
         with pytest.raises(Exception):
             sample_physical_book.borrow()
 
+    def test_can_borrow(self, sample_physical_book):
+        """Test that can_borrow reflects available copies."""
+        assert sample_physical_book.can_borrow()
+        sample_physical_book._available_copies = 0
+        assert not sample_physical_book.can_borrow()
+
     def test_to_dict(self, sample_physical_book):
         """Test serialization to dictionary."""
         data = sample_physical_book.to_dict()
@@ -101,6 +129,11 @@ class TestPhysicalBook:
         assert "Python Programming" in result
         assert "3 copies available" in result
 
+    def test_uses_slots(self, sample_physical_book):
+        """Test that books do not carry a per-instance __dict__."""
+        assert not hasattr(sample_physical_book, "__dict__")
+        assert not hasattr(EBook("E001", "Title", "Author", 1.0), "__dict__")
+
     def test_negative_copies_raises_error(self):
         """Test that negative copies raises error."""
         with pytest.raises(ValueError):
@@ -190,6 +223,29 @@ class TestMember:
         with pytest.raises(ValueError):
             sample_member.return_book(sample_physical_book)
 
+    def test_has_borrowed(self, sample_member, sample_physical_book):
+        """Test checking whether a book is borrowed by ID."""
+        assert not sample_member.has_borrowed("B001")
+        sample_member.borrow_book(sample_physical_book)
+        assert sample_member.has_borrowed("B001")
+
+    def test_borrowed_books_is_read_only_view(self, sample_member, sample_physical_book):
+        """Test that borrowed_books reflects changes and cannot be mutated."""
+        borrowed = sample_member.borrowed_books
+        sample_member.borrow_book(sample_physical_book)
+        assert len(borrowed) == 1
+        assert sample_physical_book in borrowed
+        assert borrowed[-1] == sample_physical_book
+        with pytest.raises(AttributeError):
+            borrowed.append(sample_physical_book)
+
+    def test_to_dict_preserves_borrow_order(self, sample_member):
+        """Test that borrowed book IDs are serialized in borrow order."""
+        for book_id in ["B003", "B001", "B002"]:
+            sample_member.borrow_book(PhysicalBook(book_id, "Title", "Author", 1))
+        sample_member.return_book(PhysicalBook("B001", "Title", "Author", 1))
+        assert sample_member.to_dict()["borrowed_books"] == ["B003", "B002"]
+
     def test_to_dict(self, sample_member, sample_physical_book):
         """Test serialization to dictionary."""
         sample_member.borrow_book(sample_physical_book)
@@ -230,6 +286,20 @@ class TestLoan:
         loan = Loan(sample_physical_book, sample_member, "2026-02-20")
         assert loan.date_borrowed == "2026-02-20"
 
+    def test_loan_due_date(self, sample_physical_book, sample_member):
+        """Test the default and explicit due dates."""
+        loan = Loan(sample_physical_book, sample_member, "2026-02-20")
+        assert loan.due_date == "2026-03-06"
+        assert loan.due_day - loan.borrowed_day == Loan.LOAN_PERIOD_DAYS
+        loan = Loan(sample_physical_book, sample_member, "2026-02-20", "2026-02-27")
+        assert loan.due_date == "2026-02-27"
+
+    def test_loan_is_overdue(self, sample_physical_book, sample_member):
+        """Test overdue checks against a given date."""
+        loan = Loan(sample_physical_book, sample_member, "2026-02-20", "2026-02-27")
+        assert not loan.is_overdue("2026-02-27")
+        assert loan.is_overdue("2026-02-28")
+
     def test_loan_requires_book_and_member(self):
         """Test that loan requires both book and member."""
         member = Member("M001", "Alice")
@@ -243,6 +313,7 @@ class TestLoan:
         assert data["book_id"] == "B001"
         assert data["member_id"] == "M001"
         assert data["date_borrowed"] == "2026-02-20"
+        assert data["due_date"] == "2026-03-06"
 
     def test_loan_equality(self, sample_physical_book, sample_member):
         """Test loan equality."""
@@ -259,6 +330,51 @@ class TestLoan:
         assert "2026-02-20" in result
 
 
+# ============================================================================
+# LoanIndex Tests
+# ============================================================================
+
+
+class TestLoanIndex:
+    """Tests for LoanIndex class."""
+
+    def test_add_and_get(self, sample_physical_book, sample_member):
+        """Test adding a loan and looking it up by key."""
+        index = LoanIndex()
+        loan = Loan(sample_physical_book, sample_member)
+        index.add(loan)
+        assert len(index) == 1
+        assert index.get("M001", "B001") is loan
+        assert ("M001", "B001") in index
+        assert index.for_member("M001") == [loan]
+        assert index.for_book("B001") == [loan]
+
+    def test_add_duplicate_raises_error(self, sample_physical_book, sample_member):
+        """Test that the same member and book cannot be indexed twice."""
+        index = LoanIndex()
+        index.add(Loan(sample_physical_book, sample_member))
+        with pytest.raises(ValueError):
+            index.add(Loan(sample_physical_book, sample_member))
+
+    def test_remove(self, sample_physical_book, sample_ebook, sample_member):
+        """Test removing a loan keeps the other indexes consistent."""
+        index = LoanIndex()
+        index.add(Loan(sample_physical_book, sample_member))
+        ebook_loan = Loan(sample_ebook, sample_member)
+        index.add(ebook_loan)
+
+        index.remove("M001", "B001")
+        assert index.get("M001", "B001") is None
+        assert index.for_member("M001") == [ebook_loan]
+        assert index.for_book("B001") == []
+        assert list(index) == [ebook_loan]
+
+    def test_remove_missing_raises_error(self):
+        """Test removing an unknown loan raises KeyError."""
+        with pytest.raises(KeyError):
+            LoanIndex().remove("M001", "B001")
+
+
 # ============================================================================
 # Library Tests
 # ============================================================================
@@ -371,6 +487,23 @@ class TestLibrary:
         with pytest.raises(InvalidOperationError):
             library.return_book("M001", "B001")
 
+    def test_loan_lookups(self, library, sample_physical_book, sample_ebook, sample_member):
+        """Test looking up loans by key, member, and book."""
+        library.add_book(sample_physical_book)
+        library.add_book(sample_ebook)
+        library.add_member(sample_member)
+        library.borrow_book("M001", "B001")
+        library.borrow_book("M001", "E001")
+
+        loan = library.get_loan("M001", "B001")
+        assert loan.book == sample_physical_book
+        assert len(library.loans_for_member("M001")) == 2
+        assert library.loans_for_book("E001")[0].member == sample_member
+
+        library.return_book("M001", "B001")
+        assert library.get_loan("M001", "B001") is None
+        assert [loan.book.id for loan in library.loans] == ["E001"]
+
     def test_list_books(self, library, sample_physical_book, sample_ebook):
         """Test listing all books."""
         library.add_book(sample_physical_book)
@@ -480,3 +613,2150 @@ class TestPersistence:
         assert restored_member.borrowed_books[0].id == "B001"
 
         os.remove(filename)
+
+    def test_streaming_round_trip(self, tmp_path):
+        """Test saving and loading the streaming JSON-lines format."""
+        library = Library()
+        library.add_book(PhysicalBook("B001", "Title", "Author", 2))
+        library.add_book(EBook("E001", "Guide", "Author", 1.5))
+        library.add_member(Member("M001", "Alice"))
+        library.borrow_book("M001", "B001")
+
+        filename = str(tmp_path / "library.jsonl")
+        library.save_to_file(filename)
+
+        with open(filename) as f:
+            lines = [json.loads(line) for line in f]
+        assert lines[0]["format"] == "library-jsonl"
+        assert {"section": "loans"} in lines
+        assert len(lines) == 8
+
+        library2 = Library()
+        library2.load_from_file(filename)
+        assert library2.get_book_by_id("B001").available_copies == 1
+        assert isinstance(library2.get_book_by_id("E001"), EBook)
+        assert library2.get_member_by_id("M001").has_borrowed("B001")
+        assert len(library2.loans) == 1
+
+    def test_streaming_flag_overrides_extension(self, tmp_path):
+        """Test that the streaming format can be chosen explicitly."""
+        library = Library()
+        library.add_member(Member("M001", "Alice"))
+
+        filename = str(tmp_path / "library.json")
+        library.save_to_file(filename, streaming=True)
+        with open(filename) as f:
+            assert json.loads(f.readline())["format"] == "library-jsonl"
+
+        library2 = Library()
+        library2.load_from_file(filename)
+        assert library2.get_member_by_id("M001").name == "Alice"
+
+    def test_load_rejects_unknown_book_type(self, tmp_path):
+        """Test that an unknown book type is reported instead of misloaded."""
+        filename = tmp_path / "bad.json"
+        filename.write_text(json.dumps({"books": [{"type": "Scroll", "id": "S1"}]}))
+        with pytest.raises(ValueError):
+            Library().load_from_file(str(filename))
+
+    def test_load_accepts_non_string_title(self, tmp_path):
+        """Test that a title stored as a number still loads."""
+        filename = tmp_path / "numbers.json"
+        filename.write_text(json.dumps({"books": [{
+            "type": "PhysicalBook", "id": "B001", "title": 1984,
+            "author": "George Orwell", "available_copies": 1,
+        }]}))
+        library = Library()
+        library.load_from_file(str(filename))
+        assert library.get_book_by_id("B001").title == 1984
+        assert library.search("1984") == [library.get_book_by_id("B001")]
+
+    def test_titles_and_authors_are_shared(self, tmp_path):
+        """Test that loaded and imported books by one author share one string."""
+        library = Library()
+        # Built at run time, so the strings are distinct objects to start with.
+        for i, author in enumerate("".join(["Jane", " Austen"]) for _ in range(2)):
+            library.add_book(PhysicalBook(f"B00{i}", "Emma", author, 1))
+        filename = str(tmp_path / "library.jsonl")
+        library.save_to_file(filename)
+        catalog = tmp_path / "catalog.csv"
+        catalog.write_text(
+            "type,id,title,author,available_copies,file_size_mb\n"
+            "PhysicalBook,C001,Persuasion,Jane Austen,1,\n"
+            "EBook,C002,Emma,Jane Austen,,1.5\n"
+        )
+
+        loaded = Library()
+        loaded.load_from_file(filename)
+        loaded.import_catalog(str(catalog))
+        books = loaded.list_books()
+        assert len(books) == 4
+        assert all(book.author is books[0].author for book in books)
+        assert loaded.get_book_by_id("C002").title is loaded.get_book_by_id("B000").title
+
+    @pytest.mark.parametrize("name", ["library.json", "library.jsonl"])
+    def test_failed_load_keeps_state(self, library, tmp_path, name):
+        """Test that a corrupt file leaves the library as it was."""
+        library.add_book(PhysicalBook("B001", "Python Basics", "Author", 2))
+        library.add_member(Member("M001", "Alice"))
+        library.borrow_book("M001", "B001")
+
+        other = Library()
+        other.add_book(PhysicalBook("X001", "Other", "Writer", 1))
+        other.add_member(Member("X002", "Bob"))
+        filename = str(tmp_path / name)
+        other.save_to_file(filename)
+        with open(filename) as f:
+            content = f.read()
+        # Cut the file off part-way through its members.
+        with open(filename, "w") as f:
+            f.write(content[: content.index("X002") + 2])
+
+        with pytest.raises(json.JSONDecodeError):
+            library.load_from_file(filename)
+        assert set(library.books) == {"B001"}
+        assert set(library.members) == {"M001"}
+        assert library.get_loan("M001", "B001") is not None
+        assert library.search("python") == [library.get_book_by_id("B001")]
+        assert library.verify_inventory() == []
+
+
+# ============================================================================
+# Journal Tests
+# ============================================================================
+
+
+class TestJournal:
+    """Tests for the write-ahead journal."""
+
+    def test_append_and_read(self, tmp_path):
+        """Test that appended records can be read back in order."""
+        filename = str(tmp_path / "journal.log")
+        with Journal(filename, batch_size=2) as journal:
+            journal.append({"op": "a"})
+            assert journal.pending == 1
+            journal.append({"op": "b"})
+            assert journal.pending == 0
+            journal.append({"op": "c"})
+        assert [r["op"] for r in Journal.read(filename)] == ["a", "b", "c"]
+
+    def test_read_stops_at_torn_write(self, tmp_path):
+        """Test that a partially written last record is ignored."""
+        filename = tmp_path / "journal.log"
+        filename.write_text('{"op": "a"}\n{"op": "b"')
+        assert [r["op"] for r in Journal.read(str(filename))] == ["a"]
+
+    def test_append_after_torn_write(self, tmp_path):
+        """Test that records appended after a crash mid-write are recovered."""
+        journal_file = str(tmp_path / "journal.log")
+        library = Library()
+        with Journal(journal_file) as journal:
+            library.attach_journal(journal)
+            library.add_book(PhysicalBook("B001", "Title", "Author", 1))
+            library.add_member(Member("M001", "Alice"))
+        with open(journal_file, "a") as f:
+            f.write('{"op":"add_member","member_id":"M9"')
+
+        recovered = Library()
+        assert recovered.recover(str(tmp_path / "missing.json"), journal_file) == 2
+        with Journal(journal_file) as journal:
+            recovered.attach_journal(journal)
+            recovered.add_member(Member("M002", "Bob"))
+            recovered.borrow_book("M002", "B001")
+
+        again = Library()
+        assert again.recover(str(tmp_path / "missing.json"), journal_file) == 4
+        assert again.get_loan("M002", "B001") is not None
+        assert "M9" not in again.members
+
+    def test_open_cuts_torn_write(self, tmp_path):
+        """Test that opening a journal removes an incomplete last record."""
+        filename = tmp_path / "journal.log"
+        filename.write_text('{"op": "a"}\n{"op": "b"')
+        with Journal(str(filename)) as journal:
+            journal.append({"op": "c"})
+        assert [r["op"] for r in Journal.read(str(filename))] == ["a", "c"]
+
+    def test_invalid_batch_size(self, tmp_path):
+        """Test that a batch size below 1 is rejected."""
+        with pytest.raises(ValueError):
+            Journal(str(tmp_path / "journal.log"), batch_size=0)
+
+    def test_recover_replays_journal(self, tmp_path):
+        """Test recovering mutations made after the last snapshot."""
+        snapshot = str(tmp_path / "snapshot.jsonl")
+        journal_file = str(tmp_path / "journal.log")
+
+        library = Library()
+        library.attach_journal(Journal(journal_file))
+        library.add_book(PhysicalBook("B001", "Title", "Author", 2))
+        library.add_member(Member("M001", "Alice"))
+        library.borrow_book("M001", "B001")
+        library.compact(snapshot)
+
+        library.add_book(EBook("E001", "Guide", "Author", 1.5))
+        library.borrow_book("M001", "E001")
+        library.return_book("M001", "B001")
+        library.detach_journal().close()
+
+        recovered = Library()
+        assert recovered.recover(snapshot, journal_file) == 3
+        assert recovered.get_book_by_id("B001").available_copies == 2
+        assert [loan.book.id for loan in recovered.loans] == ["E001"]
+        date = library.get_loan("M001", "E001").date_borrowed
+        assert recovered.get_loan("M001", "E001").date_borrowed == date
+
+    def test_failed_append_leaves_library_unchanged(self, tmp_path):
+        """Test that a mutation the journal rejects is not applied and can be retried."""
+
+        class FullDiskJournal(Journal):
+            full = False
+
+            def append(self, record):
+                if self.full:
+                    raise OSError(28, "No space left on device")
+                super().append(record)
+
+        journal = FullDiskJournal(str(tmp_path / "journal.log"))
+        library = Library()
+        library.attach_journal(journal)
+        library.add_book(PhysicalBook("B001", "Title", "Author", 1))
+        library.add_member(Member("M001", "Alice"))
+        library.add_member(Member("M002", "Bob"))
+        library.borrow_book("M001", "B001")
+        library.place_hold("M002", "B001")
+
+        journal.full = True
+        with pytest.raises(OSError):
+            library.add_book(EBook("E001", "Guide", "Author", 1.5))
+        with pytest.raises(OSError):
+            library.return_book("M001", "B001")
+        with pytest.raises(OSError):
+            library.cancel_hold("M002", "B001")
+        assert "E001" not in library.books
+        assert library.get_loan("M001", "B001") is not None
+        assert library.hold_position("M002", "B001") == 1
+        assert library.verify_inventory() == []
+
+        journal.full = False
+        library.add_book(EBook("E001", "Guide", "Author", 1.5))
+        library.return_book("M001", "B001")
+        assert library.get_loan("M002", "B001") is not None
+        library.detach_journal().close()
+
+        recovered = Library()
+        recovered.recover(str(tmp_path / "missing.json"), str(tmp_path / "journal.log"))
+        assert set(recovered.books) == {"B001", "E001"}
+        assert recovered.get_loan("M002", "B001") is not None
+        assert recovered.hold_count("B001") == 0
+
+    def test_recover_skips_records_in_snapshot(self, tmp_path):
+        """Test that a crash between snapshot and truncation is harmless."""
+        snapshot = str(tmp_path / "snapshot.json")
+        journal_file = str(tmp_path / "journal.log")
+
+        library = Library()
+        library.attach_journal(Journal(journal_file))
+        library.add_book(PhysicalBook("B001", "Title", "Author", 2))
+        library.add_member(Member("M001", "Alice"))
+        library.borrow_book("M001", "B001")
+        library.save_to_file(snapshot)
+        library.detach_journal().close()
+
+        recovered = Library()
+        assert recovered.recover(snapshot, journal_file) == 0
+        assert recovered.get_book_by_id("B001").available_copies == 1
+
+    def test_recover_without_snapshot(self, tmp_path):
+        """Test recovering from the journal alone."""
+        journal_file = str(tmp_path / "journal.log")
+        library = Library()
+        with Journal(journal_file) as journal:
+            library.attach_journal(journal)
+            library.add_member(Member("M001", "Alice"))
+
+        recovered = Library()
+        recovered.recover(str(tmp_path / "missing.json"), journal_file)
+        assert recovered.get_member_by_id("M001").name == "Alice"
+
+    def test_compact_requires_journal(self, library, tmp_path):
+        """Test that compaction without a journal is rejected."""
+        with pytest.raises(InvalidOperationError):
+            library.compact(str(tmp_path / "snapshot.json"))
+
+
+# ============================================================================
+# Batch Operation Tests
+# ============================================================================
+
+
+class TestBatchOperations:
+    """Tests for borrow_many and return_many."""
+
+    @pytest.fixture
+    def stocked_library(self):
+        """Provide a library with one single-copy book, one e-book, and two members."""
+        library = Library()
+        library.add_book(PhysicalBook("B001", "Title", "Author", 1))
+        library.add_book(EBook("E001", "Guide", "Author", 1.5))
+        library.add_member(Member("M001", "Alice"))
+        library.add_member(Member("M002", "Bob"))
+        return library
+
+    def test_borrow_many_reports_each_item(self, stocked_library):
+        """Test that every request gets a result and failures do not raise."""
+        results = stocked_library.borrow_many([
+            ("M001", "B001"),
+            ("M002", "B001"),
+            ("M001", "B001"),
+            ("M003", "E001"),
+            ("M001", "X999"),
+            ("M002", "E001"),
+        ])
+        assert [r.ok for r in results] == [True, False, False, False, False, True]
+        assert [r.error for r in results] == [
+            None,
+            BookNotAvailableError,
+            InvalidOperationError,
+            MemberNotFoundError,
+            BookNotFoundError,
+            None,
+        ]
+        assert results[0] == OperationResult("M001", "B001")
+        assert len(stocked_library.loans) == 2
+        assert stocked_library.get_book_by_id("B001").available_copies == 0
+
+    def test_borrow_many_matches_single_errors(self, stocked_library):
+        """Test that batch messages match the exceptions of borrow_book."""
+        stocked_library.borrow_book("M001", "B001")
+        result = stocked_library.borrow_many([("M002", "B001")])[0]
+        with pytest.raises(BookNotAvailableError) as excinfo:
+            stocked_library.borrow_book("M002", "B001")
+        assert str(excinfo.value) == result.message
+        with pytest.raises(BookNotAvailableError):
+            result.raise_error()
+
+    def test_return_many(self, stocked_library):
+        """Test batch returns with a mix of valid and invalid requests."""
+        stocked_library.borrow_many([("M001", "B001"), ("M001", "E001")])
+        results = stocked_library.return_many([
+            ("M001", "B001"),
+            ("M001", "B001"),
+            ("M002", "E001"),
+            ("M001", "E001"),
+        ])
+        assert [r.ok for r in results] == [True, False, False, True]
+        assert results[1].error is InvalidOperationError
+        assert len(stocked_library.loans) == 0
+        assert stocked_library.get_book_by_id("B001").available_copies == 1
+
+
+# ============================================================================
+# Search Tests
+# ============================================================================
+
+
+class TestSearch:
+    """Tests for the title and author search index."""
+
+    @pytest.fixture
+    def catalog(self):
+        """Provide a library with a few searchable books."""
+        library = Library()
+        library.add_book(PhysicalBook("B001", "Python Programming", "John Doe", 1))
+        library.add_book(PhysicalBook("B002", "Learning Python", "Mark Lutz", 2))
+        library.add_book(EBook("E001", "Design Patterns", "Erich Gamma", 5.2))
+        library.add_book(EBook("E002", "Patterns of Python", "Jane Python", 1.0))
+        return library
+
+    def test_exact_word(self, catalog):
+        """Test a single-word query, ranked by title weight then ID."""
+        ids = [book.id for book in catalog.search("python")]
+        assert ids == ["B001", "B002", "E002"]
+
+    def test_prefix_typeahead(self, catalog):
+        """Test that the last word matches as a prefix."""
+        assert [book.id for book in catalog.search("desi")] == ["E001"]
+        assert [book.id for book in catalog.search("pat")] == ["E001", "E002"]
+
+    def test_all_words_must_match(self, catalog):
+        """Test that every query word must match."""
+        assert [book.id for book in catalog.search("python patt")] == ["E002"]
+        assert catalog.search("python gamma") == []
+
+    def test_author_matches(self, catalog):
+        """Test that author names are searchable."""
+        assert [book.id for book in catalog.search("LUTZ")] == ["B002"]
+
+    def test_pagination(self, catalog):
+        """Test offset and limit over ranked results."""
+        assert [book.id for book in catalog.search("python", limit=2)] == ["B001", "B002"]
+        assert [book.id for book in catalog.search("python", offset=2)] == ["E002"]
+
+    def test_empty_query(self, catalog):
+        """Test that a query without words returns nothing."""
+        assert catalog.search("  !! ") == []
+
+    def test_index_rebuilt_on_load(self, catalog, tmp_path):
+        """Test that loading a file indexes the loaded books."""
+        filename = str(tmp_path / "catalog.jsonl")
+        catalog.save_to_file(filename)
+        library = Library()
+        library.add_book(PhysicalBook("X001", "Stale Entry", "Nobody", 1))
+        library.load_from_file(filename)
+        assert [book.id for book in library.search("programming")] == ["B001"]
+        assert library.search("stale") == []
+
+    def test_add_many(self):
+        """Test bulk indexing keeps prefix search working."""
+        index = SearchIndex()
+        index.add_many([
+            PhysicalBook("B002", "Zebra", "Alpha", 1),
+            PhysicalBook("B001", "Apple", "Beta", 1),
+        ])
+        index.add(PhysicalBook("B003", "Apricot", "Gamma", 1))
+        assert index.search("ap") == ["B001", "B003"]
+        assert index.search("alpha") == ["B002"]
+
+
+# ============================================================================
+# Columnar Catalog Tests
+# ============================================================================
+
+
+class TestColumnarCatalog:
+    """Tests for the column-oriented book store."""
+
+    def test_views_match_books(self, sample_physical_book, sample_ebook):
+        """Test that views expose the same properties as the stored books."""
+        catalog = ColumnarCatalog([sample_physical_book, sample_ebook])
+        physical = catalog["B001"]
+        ebook = catalog["E001"]
+        assert isinstance(physical, PhysicalBook)
+        assert isinstance(ebook, EBook)
+        assert physical == sample_physical_book
+        assert physical.to_dict() == sample_physical_book.to_dict()
+        assert str(ebook) == str(sample_ebook)
+        assert len(catalog) == 2
+        assert list(catalog) == ["B001", "E001"]
+
+    def test_borrow_through_view_updates_column(self, sample_physical_book):
+        """Test that mutations through a view are stored."""
+        catalog = ColumnarCatalog([sample_physical_book])
+        catalog["B001"].borrow()
+        assert catalog["B001"].available_copies == 2
+        view = catalog["B001"]
+        view.borrow()
+        view.borrow()
+        with pytest.raises(Exception):
+            view.borrow()
+        assert catalog["B001"].available_copies == 0
+
+    def test_replace_and_delete(self, sample_physical_book):
+        """Test replacing and deleting books by ID."""
+        catalog = ColumnarCatalog([sample_physical_book])
+        catalog["B001"] = EBook("B001", "New", "Author", 2.0)
+        assert isinstance(catalog["B001"], EBook)
+        del catalog["B001"]
+        assert "B001" not in catalog
+        with pytest.raises(ValueError):
+            catalog["B002"] = sample_physical_book
+
+    def test_library_with_catalog_store(self, tmp_path):
+        """Test a library backed by a catalog end to end."""
+        library = Library(book_store=ColumnarCatalog())
+        library.add_book(PhysicalBook("B001", "Title", "Author", 1))
+        library.add_member(Member("M001", "Alice"))
+        library.add_member(Member("M002", "Bob"))
+        library.borrow_book("M001", "B001")
+        with pytest.raises(BookNotAvailableError):
+            library.borrow_book("M002", "B001")
+        library.return_book("M001", "B001")
+        assert library.get_book_by_id("B001").available_copies == 1
+
+        filename = str(tmp_path / "catalog.jsonl")
+        library.save_to_file(filename)
+        library.load_from_file(filename)
+        assert isinstance(library._books, ColumnarCatalog)
+        assert library.search("title")[0].id == "B001"
+
+    def test_snapshots_keep_catalog_store(self, tmp_path):
+        """Test that opening a snapshot, directly or from the cache, keeps the store."""
+        library = Library(book_store=ColumnarCatalog())
+        library.add_book(PhysicalBook("B001", "Title", "Author", 2))
+        library.add_member(Member("M001", "Alice"))
+        library.add_member(Member("M002", "Bob"))
+        library.borrow_book("M001", "B001")
+        filename = str(tmp_path / "library.json")
+        library.save_to_file(filename)
+        library.save_binary(str(tmp_path / "library.snap"))
+
+        library.open_snapshot(str(tmp_path / "library.snap"))
+        assert isinstance(library._books, ColumnarCatalog)
+        library.load_cached(filename)
+        assert library.load_cached(filename)
+        assert isinstance(library._books, ColumnarCatalog)
+        library.borrow_book("M002", "B001")
+        assert library.get_book_by_id("B001").available_copies == 0
+        library.return_book("M001", "B001")
+        assert library.get_loan("M001", "B001") is None
+        assert library.get_book_by_id("B001").available_copies == 1
+        assert library.verify_inventory() == []
+
+
+# ============================================================================
+# Concurrency Tests
+# ============================================================================
+
+
+class TestConcurrentLibrary:
+    """Tests for the thread-safe ConcurrentLibrary."""
+
+    def test_concurrent_borrows_never_oversubscribe(self):
+        """Test that many threads borrowing one book respect its copy count."""
+        library = ConcurrentLibrary()
+        library.add_book(PhysicalBook("B001", "Title", "Author", 5))
+        for i in range(40):
+            library.add_member(Member(f"M{i:03d}", f"Member {i}"))
+        outcomes = []
+
+        def borrow_and_return(member_id):
+            for _ in range(50):
+                result = library.borrow_many([(member_id, "B001")])[0]
+                outcomes.append(result.ok)
+                assert library.get_book_by_id("B001").available_copies >= 0
+                if result.ok:
+                    library.return_book(member_id, "B001")
+
+        threads = [
+            threading.Thread(target=borrow_and_return, args=(f"M{i:03d}",))
+            for i in range(40)
+        ]
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        assert len(outcomes) == 2000
+        assert library.get_book_by_id("B001").available_copies == 5
+        assert len(library.loans) == 0
+
+    def test_exclusive_operations_can_nest(self, tmp_path):
+        """Test that recover (which loads and replays) does not deadlock."""
+        snapshot = str(tmp_path / "snapshot.json")
+        journal_file = str(tmp_path / "journal.log")
+        library = ConcurrentLibrary()
+        with Journal(journal_file) as journal:
+            library.attach_journal(journal)
+            library.add_book(PhysicalBook("B001", "Title", "Author", 1))
+            library.add_member(Member("M001", "Alice"))
+            library.compact(snapshot)
+            library.borrow_book("M001", "B001")
+            library.return_book("M001", "B001")
+            library.borrow_book("M001", "B001")
+
+        recovered = ConcurrentLibrary()
+        assert recovered.recover(snapshot, journal_file) == 3
+        assert recovered.get_book_by_id("B001").available_copies == 0
+
+    def test_unknown_ids_use_no_memory(self):
+        """Test that requests for unknown IDs do not create new locks."""
+        library = ConcurrentLibrary()
+        locks = (list(library._member_locks), list(library._book_locks))
+        for i in range(1000):
+            with pytest.raises(MemberNotFoundError):
+                library.borrow_book(f"NOBODY{i}", f"NOTHING{i}")
+        assert (library._member_locks, library._book_locks) == locks
+
+    def test_errors_still_raised(self):
+        """Test that the concurrent library raises the usual exceptions."""
+        library = ConcurrentLibrary()
+        library.add_book(PhysicalBook("B001", "Title", "Author", 0))
+        library.add_member(Member("M001", "Alice"))
+        with pytest.raises(BookNotAvailableError):
+            library.borrow_book("M001", "B001")
+        with pytest.raises(MemberNotFoundError):
+            library.return_book("M999", "B001")
+
+
+# ============================================================================
+# Async Library Tests
+# ============================================================================
+
+
+class TestAsyncLibrary:
+    """Tests for the asyncio facade."""
+
+    def test_operations(self, tmp_path):
+        """Test mutations, errors, and persistence through coroutines."""
+        filename = str(tmp_path / "library.jsonl")
+
+        async def scenario():
+            async with AsyncLibrary() as library:
+                await library.add_book(PhysicalBook("B001", "Title", "Author", 1))
+                await library.add_member(Member("M001", "Alice"))
+                await library.borrow_book("M001", "B001")
+                with pytest.raises(InvalidOperationError):
+                    await library.borrow_book("M001", "B001")
+                results = await library.return_many([("M001", "B001")])
+                await library.save(filename)
+                return library.library, results
+
+        library, results = asyncio.run(scenario())
+        assert results[0].ok
+        assert library.get_book_by_id("B001").available_copies == 1
+
+        async def reload():
+            async with AsyncLibrary() as library:
+                await library.load(filename)
+                return library.library
+
+        assert asyncio.run(reload()).get_member_by_id("M001").name == "Alice"
+
+    def test_mutations_are_serialized_in_order(self):
+        """Test that concurrently submitted mutations apply in submission order."""
+
+        async def scenario():
+            async with AsyncLibrary() as library:
+                await library.add_book(PhysicalBook("B001", "Title", "Author", 1))
+                await library.add_member(Member("M001", "Alice"))
+                await library.add_member(Member("M002", "Bob"))
+                return await asyncio.gather(
+                    library.borrow_book("M001", "B001"),
+                    library.borrow_book("M002", "B001"),
+                    return_exceptions=True,
+                )
+
+        first, second = asyncio.run(scenario())
+        assert first is None
+        assert isinstance(second, BookNotAvailableError)
+
+    def test_save_does_not_block_event_loop(self, tmp_path):
+        """Test that other coroutines keep running while a snapshot is saved."""
+        library = Library()
+        for i in range(20000):
+            library.add_book(PhysicalBook(f"B{i:05d}", f"Title {i}", "Author", 1))
+
+        async def scenario():
+            ticks = 0
+            done = asyncio.Event()
+
+            async def ticker():
+                nonlocal ticks
+                while not done.is_set():
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            async with AsyncLibrary(library) as async_library:
+                task = asyncio.ensure_future(ticker())
+                await async_library.save(str(tmp_path / "big.json"))
+                done.set()
+                await task
+            return ticks
+
+        assert asyncio.run(scenario()) > 1
+
+
+# ============================================================================
+# Due Date Tests
+# ============================================================================
+
+
+class TestDueDates:
+    """Tests for the due date index on Library."""
+
+    @pytest.fixture
+    def loaned_library(self):
+        """Provide a library with loans due on different days."""
+        library = Library()
+        library.add_member(Member("M001", "Alice"))
+        due_dates = ["2026-03-05", "2026-03-01", "2026-03-10", "2026-03-03", "2026-03-08"]
+        for i, due_date in enumerate(due_dates):
+            library.add_book(EBook(f"E{i}", f"Title {i}", "Author", 1.0))
+            library._borrow("M001", f"E{i}", "2026-02-20", due_date)
+        return library
+
+    def test_overdue_loans(self, loaned_library):
+        """Test that overdue loans come back most overdue first."""
+        overdue = loaned_library.overdue_loans("2026-03-06")
+        assert [loan.due_date for loan in overdue] == [
+            "2026-03-01", "2026-03-03", "2026-03-05",
+        ]
+        assert len(loaned_library.overdue_loans("2026-03-06", limit=1)) == 1
+        assert loaned_library.overdue_loans("2026-02-01") == []
+
+    def test_next_due_loans(self, loaned_library):
+        """Test the soonest-due query."""
+        assert [loan.book.id for loan in loaned_library.next_due_loans(2)] == ["E1", "E3"]
+        assert len(loaned_library.next_due_loans(10)) == 5
+
+    def test_returned_loans_are_skipped(self, loaned_library):
+        """Test that returned loans disappear from queries."""
+        loaned_library.return_book("M001", "E1")
+        loaned_library.return_book("M001", "E3")
+        loaned_library.return_book("M001", "E0")
+        assert [loan.book.id for loan in loaned_library.next_due_loans(5)] == ["E4", "E2"]
+        assert loaned_library.overdue_loans("2026-03-06") == []
+
+        loaned_library._borrow("M001", "E1", "2026-02-20", "2026-02-25")
+        assert [loan.book.id for loan in loaned_library.overdue_loans("2026-03-06")] == ["E1"]
+
+    def test_due_dates_persist(self, loaned_library, tmp_path):
+        """Test that due dates survive a save and load."""
+        filename = str(tmp_path / "loans.jsonl")
+        loaned_library.save_to_file(filename)
+        library = Library()
+        library.load_from_file(filename)
+        assert [loan.book.id for loan in library.next_due_loans(2)] == ["E1", "E3"]
+
+    def test_load_builds_index_at_once(self, loaned_library, monkeypatch, tmp_path):
+        """Test that loading heapifies the due dates instead of pushing each loan."""
+        filename = str(tmp_path / "loans.jsonl")
+        loaned_library.save_to_file(filename)
+        library = Library()
+
+        def push(index, loan):
+            raise AssertionError("loans are pushed one at a time")
+
+        monkeypatch.setattr(type(library._due), "push", push)
+        library.load_from_file(filename)
+        assert [loan.book.id for loan in library.next_due_loans(5)] == ["E1", "E3", "E0", "E4", "E2"]
+
+    def test_legacy_loans_get_default_due_date(self, tmp_path):
+        """Test that loans saved without a due date get the standard period."""
+        filename = tmp_path / "legacy.json"
+        filename.write_text(json.dumps({
+            "books": [{"type": "EBook", "id": "E1", "title": "T", "author": "A", "file_size_mb": 1}],
+            "members": [{"member_id": "M001", "name": "Alice", "borrowed_books": ["E1"]}],
+            "loans": [{"book_id": "E1", "member_id": "M001", "date_borrowed": "2026-02-20"}],
+        }))
+        library = Library()
+        library.load_from_file(str(filename))
+        assert library.get_loan("M001", "E1").due_date == "2026-03-06"
+
+
+# ============================================================================
+# Binary Snapshot Tests
+# ============================================================================
+
+
+class TestBinarySnapshot:
+    """Tests for binary snapshots and lazy loading."""
+
+    @pytest.fixture
+    def snapshot_file(self, tmp_path):
+        """Provide a binary snapshot of a small library with loans."""
+        library = Library()
+        library.add_book(PhysicalBook("P001", "Python 101", "Smith", 2))
+        library.add_book(EBook("E001", "Clean Code", "Martin", 5.5))
+        library.add_book(PhysicalBook("P002", "Design Patterns", "Gamma", 1))
+        library.add_member(Member("M001", "Alice"))
+        library.add_member(Member("M002", "Bob"))
+        library._borrow("M001", "P001", "2026-02-20", "2026-03-06")
+        library._borrow("M001", "E001", "2026-02-21")
+        library._borrow("M002", "P001", "2026-02-22")
+        filename = str(tmp_path / "library.snap")
+        library.save_binary(filename)
+        return filename
+
+    def test_open_loads_lazily(self, snapshot_file):
+        """Test that records are built only when looked up."""
+        library = Library()
+        library.open_snapshot(snapshot_file)
+        assert len(library._books) == 3
+        assert "P002" in library._books
+        assert library._books._loaded == {}
+        assert "Alice" in str(library.get_member_by_id("M001"))
+        assert set(library._members._loaded) == {"M001"}
+        assert set(library._books._loaded) == {"P001", "E001"}
+        assert str(library).endswith("and 3 active loans")
+
+    def test_round_trip(self, snapshot_file):
+        """Test that books, members, and loans survive a binary round trip."""
+        library = Library()
+        library.open_snapshot(snapshot_file)
+        book = library.get_book_by_id("P001")
+        assert book.title == "Python 101"
+        assert book.available_copies == 0
+        assert library.get_book_by_id("E001").file_size_mb == 5.5
+        loan = library.get_loan("M001", "P001")
+        assert loan.date_borrowed == "2026-02-20"
+        assert loan.due_date == "2026-03-06"
+        assert len(library.loans) == 3
+        assert [b.id for b in library.get_member_by_id("M002").borrowed_books] == ["P001"]
+        assert library.get_book_by_id("X999") is None
+        assert library.get_member_by_id("M999") is None
+
+    def test_operations_on_lazy_state(self, snapshot_file):
+        """Test borrowing, returning, and adding before everything is loaded."""
+        library = Library()
+        library.open_snapshot(snapshot_file)
+        library.return_book("M002", "P001")
+        library.borrow_book("M002", "P002")
+        library.add_book(EBook("E002", "Refactoring", "Fowler", 3.0))
+        with pytest.raises(BookNotAvailableError):
+            library.borrow_book("M001", "P002")
+        assert len(library.books) == 4
+        assert [book.id for book in library.search("refactoring")] == ["E002"]
+        assert [book.id for book in library.search("design")] == ["P002"]
+        assert len(library.loans) == 3
+        assert library._snapshot is None
+
+    def test_resave_and_reopen(self, snapshot_file, tmp_path):
+        """Test that a lazily opened library can be saved in both formats."""
+        library = Library()
+        library.open_snapshot(snapshot_file)
+        library.borrow_book("M002", "E001")
+        binary = str(tmp_path / "again.snap")
+        library.save_binary(binary)
+        text = str(tmp_path / "again.jsonl")
+        library.save_to_file(text)
+
+        for load in (Library.open_snapshot, Library.load_from_file):
+            reloaded = Library()
+            load(reloaded, binary if load is Library.open_snapshot else text)
+            assert len(reloaded.loans) == 4
+            assert reloaded.get_book_by_id("P001").available_copies == 0
+
+    def test_concurrent_library(self, snapshot_file):
+        """Test that a ConcurrentLibrary can open a snapshot and finish loading it."""
+        library = ConcurrentLibrary()
+        library.open_snapshot(snapshot_file)
+        library.return_book("M001", "P001")
+        assert [loan.book.id for loan in library.next_due_loans(5)] == ["E001", "P001"]
+        assert library._snapshot is None
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test that a file that is not a binary snapshot is rejected."""
+        filename = tmp_path / "library.json"
+        filename.write_text(json.dumps({"books": [], "members": [], "loans": []}))
+        with pytest.raises(ValueError):
+            BinarySnapshot(str(filename))
+        library = Library()
+        with pytest.raises(ValueError):
+            library.open_snapshot(str(filename))
+
+
+# ============================================================================
+# Metrics Tests
+# ============================================================================
+
+
+class TestMetrics:
+    """Tests for the Metrics instrumentation layer."""
+
+    @pytest.fixture
+    def instrumented(self, library):
+        """Provide a library with one single-copy book and metrics attached."""
+        library.add_book(PhysicalBook("B001", "Python Programming", "John Doe", 1))
+        library.add_member(Member("M001", "Alice"))
+        library.add_member(Member("M002", "Bob"))
+        metrics = Metrics()
+        metrics.attach(library)
+        return library, metrics
+
+    def test_counts_calls_and_errors(self, instrumented):
+        """Test that calls and errors are counted per operation and exception."""
+        library, metrics = instrumented
+        library.borrow_book("M001", "B001")
+        with pytest.raises(BookNotAvailableError):
+            library.borrow_book("M002", "B001")
+        with pytest.raises(MemberNotFoundError):
+            library.borrow_book("M999", "B001")
+        library.return_book("M001", "B001")
+        library.borrow_book("M002", "B001")
+
+        stats = metrics.snapshot()
+        assert stats["borrow_book"]["calls"] == 4
+        assert stats["borrow_book"]["errors"] == {
+            "BookNotAvailableError": 1,
+            "MemberNotFoundError": 1,
+        }
+        assert stats["borrow_book"]["error_rate"] == 0.5
+        assert stats["return_book"]["calls"] == 1
+        assert stats["return_book"]["errors"] == {}
+        assert sum(count for _, count in stats["borrow_book"]["buckets"]) == 4
+
+    def test_detach_restores_methods(self, instrumented):
+        """Test that detaching removes the wrappers."""
+        library, metrics = instrumented
+        metrics.detach(library)
+        assert "borrow_book" not in vars(library)
+        library.borrow_book("M001", "B001")
+        assert metrics.snapshot() == {}
+
+    def test_report(self, instrumented):
+        """Test the text report."""
+        library, metrics = instrumented
+        library.borrow_book("M001", "B001")
+        with pytest.raises(InvalidOperationError):
+            library.return_book("M002", "B001")
+        report = metrics.report()
+        assert 'library_operation_calls_total{operation="borrow_book"} 1' in report
+        assert (
+            'library_operation_errors_total{operation="return_book",'
+            'error="InvalidOperationError"} 1'
+        ) in report
+        assert 'library_operation_duration_seconds_bucket{operation="borrow_book",le="+Inf"} 1' in report
+
+    def test_serve(self, instrumented):
+        """Test that the report is served over HTTP."""
+        library, metrics = instrumented
+        library.borrow_book("M001", "B001")
+        server = metrics.serve()
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                assert response.read().decode() == metrics.report()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+# ============================================================================
+# Inventory Tests
+# ============================================================================
+
+
+class TestInventory:
+    """Tests for the running inventory totals."""
+
+    @pytest.fixture
+    def stocked_library(self, library):
+        """Provide a library with physical books, an e-book, and members."""
+        library.add_book(PhysicalBook("P001", "Python 101", "Smith", 2))
+        library.add_book(PhysicalBook("P002", "Design Patterns", "Gamma", 1))
+        library.add_book(EBook("E001", "Clean Code", "Martin", 5.5))
+        library.add_member(Member("M001", "Alice"))
+        library.add_member(Member("M002", "Bob"))
+        return library
+
+    def test_totals_follow_operations(self, stocked_library):
+        """Test that totals change with borrows and returns."""
+        library = stocked_library
+        assert library.inventory()["available_copies"] == 3
+        library.borrow_book("M001", "P002")
+        library.borrow_book("M001", "E001")
+        library.borrow_book("M002", "P001")
+        stats = library.inventory()
+        assert stats["titles"] == 3
+        assert stats["physical_titles"] == 2
+        assert stats["ebook_titles"] == 1
+        assert stats["available_copies"] == 1
+        assert stats["checked_out_titles"] == 1
+        assert stats["active_loans"] == 3
+        assert stats["members_with_loans"] == 2
+        assert stats["loans_per_member"] == 1.5
+        assert library.loan_count("M001") == 2
+        assert library.loan_count("M999") == 0
+
+        library.return_book("M001", "P002")
+        library.return_many([("M002", "P001")])
+        stats = library.inventory()
+        assert stats["available_copies"] == 3
+        assert stats["checked_out_titles"] == 0
+        assert stats["members_with_loans"] == 1
+        assert library.verify_inventory() == []
+
+    def test_totals_match_recount_after_random_operations(self, stocked_library):
+        """Test that the totals always agree with a full recount."""
+        rng = random.Random(7)
+        library = stocked_library
+        for _ in range(500):
+            request = (rng.choice(["M001", "M002"]), rng.choice(["P001", "P002", "E001"]))
+            if rng.random() < 0.5:
+                library.borrow_many([request])
+            else:
+                library.return_many([request])
+        assert library.verify_inventory() == []
+
+    def test_totals_after_load(self, stocked_library, tmp_path):
+        """Test that loading restores the totals."""
+        stocked_library.borrow_book("M001", "P002")
+        filename = str(tmp_path / "library.jsonl")
+        stocked_library.save_to_file(filename)
+        library = Library()
+        library.load_from_file(filename)
+        assert library.inventory() == stocked_library.inventory()
+        assert library.verify_inventory() == []
+
+    def test_totals_after_binary_snapshot(self, stocked_library, tmp_path):
+        """Test that a lazily opened snapshot reports the same totals."""
+        stocked_library.borrow_book("M001", "P002")
+        filename = str(tmp_path / "library.snap")
+        stocked_library.save_binary(filename)
+        library = Library()
+        library.open_snapshot(filename)
+        library.borrow_book("M002", "P001")
+        assert library.loan_count("M001") == 1
+        assert library.inventory()["available_copies"] == 1
+        assert library.verify_inventory() == []
+
+    def test_verify_detects_drift(self, stocked_library):
+        """Test that changes made behind the library's back are reported."""
+        stocked_library.get_book_by_id("P002").borrow()
+        problems = stocked_library.verify_inventory()
+        assert any(problem.startswith("available_copies") for problem in problems)
+        assert any(problem.startswith("checked_out_titles") for problem in problems)
+
+
+# ============================================================================
+# Sharded Library Tests
+# ============================================================================
+
+
+class TestShardedLibrary:
+    """Tests for ShardedLibrary."""
+
+    @pytest.fixture
+    def sharded(self):
+        """Provide a three-shard library with books and members on every shard."""
+        library = ShardedLibrary(shards=3)
+        for i in range(12):
+            library.add_book(PhysicalBook(f"B{i:03d}", f"Title {i}", "Author", 1))
+        library.add_book(EBook("E001", "Clean Code", "Martin", 5.5))
+        for i in range(6):
+            library.add_member(Member(f"M{i:03d}", f"Member {i}"))
+        yield library
+        library.close()
+
+    def cross_shard_pair(self, library):
+        """Return a (member_id, book_id) pair living on different shards."""
+        for i in range(6):
+            for j in range(12):
+                member_id, book_id = f"M{i:03d}", f"B{j:03d}"
+                if library.shard_for(member_id) != library.shard_for(book_id):
+                    return member_id, book_id
+
+    def test_cross_shard_borrow_and_return(self, sharded):
+        """Test a borrow and return whose member and book are on different shards."""
+        member_id, book_id = self.cross_shard_pair(sharded)
+        sharded.borrow_book(member_id, book_id)
+        assert sharded.get_book_by_id(book_id).available_copies == 0
+        assert sharded.loan_count(member_id) == 1
+        assert [b.id for b in sharded.get_member_by_id(member_id).borrowed_books] == [book_id]
+        with pytest.raises(InvalidOperationError):
+            sharded.borrow_book(member_id, book_id)
+
+        sharded.return_book(member_id, book_id)
+        assert sharded.get_book_by_id(book_id).available_copies == 1
+        assert sharded.loan_count(member_id) == 0
+        with pytest.raises(InvalidOperationError):
+            sharded.return_book(member_id, book_id)
+
+    def test_failed_check_releases_reservation(self, sharded):
+        """Test that a copy reserved for a failed borrow is given back."""
+        member_id, book_id = self.cross_shard_pair(sharded)
+        with pytest.raises(MemberNotFoundError):
+            sharded.borrow_book("M999", book_id)
+        with pytest.raises(BookNotFoundError):
+            sharded.borrow_book(member_id, "B999")
+        assert sharded.get_book_by_id(book_id).available_copies == 1
+        sharded.borrow_book(member_id, book_id)
+
+    def test_batches_match_library(self, sharded):
+        """Test that batch results match a single Library given the same requests."""
+        library = Library()
+        for i in range(12):
+            library.add_book(PhysicalBook(f"B{i:03d}", f"Title {i}", "Author", 1))
+        library.add_book(EBook("E001", "Clean Code", "Martin", 5.5))
+        for i in range(6):
+            library.add_member(Member(f"M{i:03d}", f"Member {i}"))
+
+        rng = random.Random(3)
+        requests = [
+            (f"M{rng.randrange(7):03d}", rng.choice([f"B{rng.randrange(13):03d}", "E001"]))
+            for _ in range(60)
+        ]
+        sharded_results = sharded.borrow_many(requests)
+        assert sum(r.ok for r in sharded_results) == sum(r.ok for r in library.borrow_many(requests))
+        assert sharded.inventory()["active_loans"] == library.inventory()["active_loans"]
+        assert sharded.verify_inventory() == []
+
+        returned = sharded.return_many(requests)
+        assert sum(r.ok for r in returned) == sum(r.ok for r in sharded_results)
+        assert sharded.inventory()["available_copies"] == 12
+
+    def test_save_and_load(self, sharded, tmp_path):
+        """Test that each shard snapshots and restores its own state."""
+        member_id, book_id = self.cross_shard_pair(sharded)
+        sharded.borrow_book(member_id, book_id)
+        sharded.borrow_book(member_id, "E001")
+        directory = str(tmp_path / "shards")
+        sharded.save(directory)
+        assert len(os.listdir(directory)) == 4
+
+        sharded.return_book(member_id, book_id)
+        sharded.load(directory)
+        assert sharded.loan_count(member_id) == 2
+        assert sharded.get_book_by_id(book_id).available_copies == 0
+        sharded.return_book(member_id, book_id)
+        assert sharded.verify_inventory() == []
+
+        with ShardedLibrary(shards=2) as other, pytest.raises(ValueError):
+            other.load(directory)
+
+
+# ============================================================================
+# Lazy Loading Tests
+# ============================================================================
+
+
+class TestLazyLoad:
+    """Tests for loading a file with lazily attached loans."""
+
+    @pytest.fixture
+    def saved_file(self, tmp_path):
+        """Provide a saved library where one member holds many loans."""
+        library = Library()
+        for i in range(50):
+            library.add_book(EBook(f"E{i:03d}", f"Title {i}", "Author", 1.0))
+        library.add_book(PhysicalBook("P001", "Python 101", "Smith", 1))
+        library.add_member(Member("M001", "Alice"))
+        library.add_member(Member("M002", "Bob"))
+        for i in range(50):
+            library._borrow("M001", f"E{i:03d}", "2026-02-20", f"2026-03-{i % 28 + 1:02d}")
+        library.borrow_book("M002", "P001")
+        filename = str(tmp_path / "library.jsonl")
+        library.save_to_file(filename)
+        return filename
+
+    def test_eager_load_attaches_all_loans(self, saved_file):
+        """Test that a normal load attaches every loan to its member."""
+        library = Library()
+        library.load_from_file(saved_file)
+        assert len(library.get_member_by_id("M001").borrowed_books) == 50
+        assert len(library.loans) == 51
+        assert library._pending_loans == 0
+
+    def test_eager_load_after_lazy_load(self, saved_file):
+        """Test that a normal load after a lazy one attaches every loan again."""
+        library = Library()
+        library.load_from_file(saved_file, lazy=True)
+        library.load_from_file(saved_file)
+        assert library._pending_loans == 0
+        assert len(library._loans) == 51
+        assert isinstance(library._members, dict)
+
+    def test_loans_attached_on_first_lookup(self, saved_file):
+        """Test that a lazy load attaches a member's loans when it is looked up."""
+        library = Library()
+        library.load_from_file(saved_file, lazy=True)
+        assert len(library._loans) == 0
+        assert str(library).endswith("and 51 active loans")
+
+        bob = library.get_member_by_id("M002")
+        assert [book.id for book in bob.borrowed_books] == ["P001"]
+        assert len(library._loans) == 1
+        assert library.loan_count("M001") == 50
+        assert library._pending_loans == 0
+
+    def test_operations_on_lazy_state(self, saved_file):
+        """Test that borrows and returns see loans that were not attached yet."""
+        library = Library()
+        library.load_from_file(saved_file, lazy=True)
+        with pytest.raises(InvalidOperationError):
+            library.borrow_book("M001", "E007")
+        library.return_book("M001", "E007")
+        with pytest.raises(BookNotAvailableError):
+            library.borrow_book("M001", "P001")
+        library.return_book("M002", "P001")
+        library.borrow_book("M001", "P001")
+        assert library.get_book_by_id("P001").available_copies == 0
+
+    def test_whole_library_queries_attach_everything(self, saved_file, tmp_path):
+        """Test that queries over every loan attach all deferred loans first."""
+        library = Library()
+        library.load_from_file(saved_file, lazy=True)
+        assert [loan.due_date for loan in library.next_due_loans(2)] == [
+            "2026-03-01", "2026-03-01",
+        ]
+        assert library._pending_loans == 0
+        assert library.verify_inventory() == []
+
+        library = Library()
+        library.load_from_file(saved_file, lazy=True)
+        resaved = str(tmp_path / "resaved.jsonl")
+        library.save_to_file(resaved)
+        reloaded = Library()
+        reloaded.load_from_file(resaved)
+        assert len(reloaded.loans) == 51
+
+    def test_concurrent_library_lazy_load(self, saved_file):
+        """Test lazy loading with ConcurrentLibrary."""
+        library = ConcurrentLibrary()
+        library.load_from_file(saved_file, lazy=True)
+        library.return_book("M001", "E001")
+        assert library.inventory()["active_loans"] == 50
+        assert library.verify_inventory() == []
+
+
+# ============================================================================
+# View and Snapshot Tests
+# ============================================================================
+
+
+class TestViews:
+    """Tests for the read-only views and point-in-time snapshots."""
+
+    @pytest.fixture
+    def stocked_library(self, library, sample_physical_book, sample_ebook, sample_member):
+        """Provide a library with two books, a member, and one loan."""
+        library.add_book(sample_physical_book)
+        library.add_book(sample_ebook)
+        library.add_member(sample_member)
+        library.borrow_book("M001", "B001")
+        return library
+
+    def test_views_are_read_only(self, stocked_library):
+        """Test that the views cannot be modified."""
+        with pytest.raises(TypeError):
+            stocked_library.books["X"] = None
+        with pytest.raises(TypeError):
+            stocked_library.members["X"] = None
+        with pytest.raises(TypeError):
+            stocked_library.loans[0] = None
+
+    def test_views_are_live(self, stocked_library):
+        """Test that views reflect later changes without being fetched again."""
+        books, members, loans = stocked_library.books, stocked_library.members, stocked_library.loans
+        stocked_library.add_book(EBook("E002", "Refactoring", "Fowler", 3.0))
+        stocked_library.add_member(Member("M002", "Bob"))
+        stocked_library.borrow_book("M002", "E002")
+        assert "E002" in books and len(books) == 3
+        assert members["M002"].name == "Bob"
+        assert len(loans) == 2
+        assert stocked_library.get_loan("M002", "E002") in loans
+
+    def test_view_indexing(self, library):
+        """Test positional access on the loans and borrowed books views."""
+        library.add_member(Member("M001", "Alice"))
+        for i in range(6):
+            library.add_book(EBook(f"E{i}", f"Title {i}", "Author", 1.0))
+            library.borrow_book("M001", f"E{i}")
+        loans = library.loans
+        assert [loans[i].book.id for i in range(len(loans))] == [f"E{i}" for i in range(6)]
+        assert loans[-1].book.id == "E5"
+        assert [loan.book.id for loan in reversed(loans)] == [f"E{i}" for i in range(5, -1, -1)]
+        assert [loan.book.id for loan in loans[1:3]] == ["E1", "E2"]
+        with pytest.raises(IndexError):
+            loans[6]
+        library.return_book("M001", "E0")
+        library.borrow_book("M001", "E0")
+        assert loans[0].book.id == "E1" and loans[5].book.id == "E0"
+
+        books = library.get_member_by_id("M001").borrowed_books
+        assert [books[i].id for i in range(6)] == ["E1", "E2", "E3", "E4", "E5", "E0"]
+        assert books[-2].id == "E5"
+        assert [book.id for book in reversed(books)][:2] == ["E0", "E5"]
+        with pytest.raises(IndexError):
+            books[-7]
+
+    def test_snapshot_is_stable(self, stocked_library):
+        """Test that a snapshot does not change with the library."""
+        snapshot = stocked_library.snapshot()
+        stocked_library.return_book("M001", "B001")
+        stocked_library.add_book(EBook("E002", "Refactoring", "Fowler", 3.0))
+        assert len(snapshot.loans) == 1
+        assert set(snapshot.books) == {"B001", "E001"}
+        assert str(snapshot) == "Snapshot: 2 books, 1 members, and 1 active loans"
+        with pytest.raises(TypeError):
+            snapshot.books["X"] = None
+
+    def test_snapshot_ignores_later_changes(self, library, sample_physical_book, sample_member):
+        """Test that a change after the snapshot shows in none of its views."""
+        library.add_book(sample_physical_book)
+        library.add_member(sample_member)
+        snapshot = library.snapshot()
+        library.borrow_book("M001", "B001")
+        library.add_member(Member("M002", "Bob"))
+        library.borrow_book("M002", "B001")
+        assert snapshot.loans == ()
+        assert snapshot.books["B001"].available_copies == 3
+        assert list(snapshot.members["M001"].borrowed_books) == []
+        assert "M002" not in snapshot.members
+        with pytest.raises(KeyError):
+            snapshot.members["M002"]
+        assert list(snapshot.members) == ["M001"]
+
+    def test_snapshot_objects_are_copies(self, stocked_library):
+        """Test that a snapshot's loans link its own books and members, as of the snapshot."""
+        snapshot = stocked_library.snapshot()
+        stocked_library.return_book("M001", "B001")
+        (loan,) = snapshot.loans
+        assert loan.book is snapshot.books["B001"]
+        assert loan.member is snapshot.members["M001"]
+        assert loan.book is not stocked_library.get_book_by_id("B001")
+        assert loan.book.available_copies == 2
+        assert [book.id for book in loan.member.borrowed_books] == ["B001"]
+
+    def test_discarded_snapshot_keeps_nothing(self, stocked_library):
+        """Test that the library stops keeping records once a snapshot is dropped."""
+        snapshot = stocked_library.snapshot()
+        assert len(stocked_library._versions) == 1
+        del snapshot
+        assert len(stocked_library._versions) == 0
+        stocked_library.return_book("M001", "B001")
+
+    def test_snapshot_survives_load(self, stocked_library, tmp_path):
+        """Test that changes after loading another state do not reach an older snapshot."""
+        filename = str(tmp_path / "library.json")
+        stocked_library.save_to_file(filename)
+        snapshot = stocked_library.snapshot()
+        stocked_library.return_book("M001", "B001")
+        stocked_library.load_from_file(filename)
+        stocked_library.return_book("M001", "B001")
+        assert snapshot.books["B001"].available_copies == 2
+        assert len(snapshot.loans) == 1
+
+    def test_views_over_lazy_state(self, stocked_library, tmp_path):
+        """Test that views work on lazily loaded state."""
+        filename = str(tmp_path / "library.jsonl")
+        stocked_library.save_to_file(filename)
+        library = Library()
+        library.load_from_file(filename, lazy=True)
+        alice = library.members["M001"]
+        assert [book.id for book in alice.borrowed_books] == ["B001"]
+        assert len(library.snapshot().loans) == 1
+
+
+# ============================================================================
+# Hold Queue Tests
+# ============================================================================
+
+
+class TestHolds:
+    """Tests for hold queues."""
+
+    @pytest.fixture
+    def busy_library(self, library):
+        """Provide a library whose only copy of B001 is borrowed by M001."""
+        library.add_book(PhysicalBook("B001", "Python Programming", "John Doe", 1))
+        library.add_book(EBook("E001", "Design Patterns", "Jane Smith", 5.2))
+        for i in range(1, 5):
+            library.add_member(Member(f"M00{i}", f"Member {i}"))
+        library.borrow_book("M001", "B001")
+        return library
+
+    def test_queue_positions(self):
+        """Test FIFO order and positions with cancellations."""
+        queue = HoldQueue()
+        for member_id in ["A", "B", "C", "D"]:
+            queue.push(member_id)
+        assert queue.remove("B")
+        assert not queue.remove("B")
+        assert [queue.position(m) for m in "ACD"] == [1, 2, 3]
+        assert queue.pop() == "A"
+        assert queue.position("D") == 2
+        queue.push("B")
+        assert list(queue) == ["C", "D", "B"]
+        assert queue.position("B") == 3
+        assert [queue.pop(), queue.pop(), queue.pop(), queue.pop()] == ["C", "D", "B", None]
+
+    def test_return_hands_copy_to_first_holder(self, busy_library):
+        """Test that a returned copy goes to the first member in the queue."""
+        assert busy_library.place_hold("M002", "B001") == 1
+        assert busy_library.place_hold("M003", "B001") == 2
+        assert busy_library.hold_count("B001") == 2
+
+        busy_library.return_book("M001", "B001")
+        assert busy_library.get_loan("M002", "B001") is not None
+        assert busy_library.get_book_by_id("B001").available_copies == 0
+        assert busy_library.hold_position("M003", "B001") == 1
+        assert busy_library.hold_position("M002", "B001") is None
+
+        busy_library.return_many([("M002", "B001")])
+        assert busy_library.get_loan("M003", "B001") is not None
+        assert busy_library.hold_count("B001") == 0
+        busy_library.return_book("M003", "B001")
+        assert busy_library.get_book_by_id("B001").available_copies == 1
+        assert busy_library.verify_inventory() == []
+
+    def test_hold_errors(self, busy_library):
+        """Test the checks made when placing and cancelling holds."""
+        with pytest.raises(MemberNotFoundError):
+            busy_library.place_hold("M999", "B001")
+        with pytest.raises(BookNotFoundError):
+            busy_library.place_hold("M002", "B999")
+        with pytest.raises(InvalidOperationError):
+            busy_library.place_hold("M001", "B001")
+        with pytest.raises(InvalidOperationError):
+            busy_library.place_hold("M002", "E001")
+        busy_library.place_hold("M002", "B001")
+        with pytest.raises(InvalidOperationError):
+            busy_library.place_hold("M002", "B001")
+        busy_library.cancel_hold("M002", "B001")
+        with pytest.raises(InvalidOperationError):
+            busy_library.cancel_hold("M002", "B001")
+        busy_library.return_book("M001", "B001")
+        assert busy_library.get_book_by_id("B001").available_copies == 1
+
+    @pytest.mark.parametrize("filename", ["library.json", "library.jsonl", "library.snap"])
+    def test_holds_persist(self, busy_library, tmp_path, filename):
+        """Test that queues survive saving and loading in every format."""
+        for member_id in ["M003", "M002", "M004"]:
+            busy_library.place_hold(member_id, "B001")
+        busy_library.cancel_hold("M002", "B001")
+        path = str(tmp_path / filename)
+        library = Library()
+        if filename.endswith(".snap"):
+            busy_library.save_binary(path)
+            library.open_snapshot(path)
+        else:
+            busy_library.save_to_file(path)
+            library.load_from_file(path)
+        assert library.hold_position("M004", "B001") == 2
+        library.return_book("M001", "B001")
+        assert library.get_loan("M003", "B001") is not None
+
+    def test_recovery_replays_hand_off(self, busy_library, tmp_path):
+        """Test that recovery reproduces holds and hand-offs from the journal."""
+        snapshot = str(tmp_path / "snapshot.jsonl")
+        journal_file = str(tmp_path / "journal.log")
+        busy_library.save_to_file(snapshot)
+        busy_library.attach_journal(Journal(journal_file))
+        busy_library.place_hold("M002", "B001")
+        busy_library.place_hold("M003", "B001")
+        busy_library.place_hold("M004", "B001")
+        busy_library.cancel_hold("M003", "B001")
+        busy_library.return_book("M001", "B001")
+        busy_library.detach_journal()
+
+        recovered = Library()
+        assert recovered.recover(snapshot, journal_file) == 6
+        assert recovered.get_loan("M002", "B001") is not None
+        assert recovered.get_loan("M001", "B001") is None
+        assert recovered.hold_position("M004", "B001") == 1
+        assert recovered.hold_count("B001") == 1
+
+    def test_concurrent_hand_off(self):
+        """Test that copies handed off under contention are never lost."""
+        library = ConcurrentLibrary()
+        library.add_book(PhysicalBook("B001", "Title", "Author", 2))
+        member_ids = [f"M{i:03d}" for i in range(16)]
+        for member_id in member_ids:
+            library.add_member(Member(member_id, member_id))
+
+        def worker(member_id):
+            for _ in range(50):
+                try:
+                    library.borrow_book(member_id, "B001")
+                except BookNotAvailableError:
+                    try:
+                        library.place_hold(member_id, "B001")
+                    except InvalidOperationError:
+                        pass
+                except InvalidOperationError:
+                    pass
+                try:
+                    library.return_book(member_id, "B001")
+                except InvalidOperationError:
+                    pass
+
+        threads = [threading.Thread(target=worker, args=(m,)) for m in member_ids]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        book = library.get_book_by_id("B001")
+        assert book.available_copies + len(library.loans_for_book("B001")) == 2
+        assert library.verify_inventory() == []
+
+
+# ============================================================================
+# Catalog Import Tests
+# ============================================================================
+
+
+class TestImport:
+    """Tests for bulk catalog imports."""
+
+    CSV_ROWS = [
+        "type,id,title,author,available_copies,file_size_mb",
+        "PhysicalBook,B001,Python Programming,John Doe,2,",
+        "EBook,E001,Design Patterns,Jane Smith,,5.2",
+        "PhysicalBook,B002,Negative Copies,Author,-1,",
+        "PhysicalBook,B003,,Author,1,",
+        "AudioBook,A001,Podcast,Host,,",
+        "PhysicalBook,B001,Duplicate,Author,1,",
+        "EBook,E002,Clean Code,Robert Martin,,many",
+        "PhysicalBook,B004,Algorithms,Thomas Cormen,3,",
+    ]
+
+    def write(self, tmp_path, name, lines):
+        """Write a catalog file and return its path."""
+        path = tmp_path / name
+        path.write_text("\n".join(lines) + "\n")
+        return str(path)
+
+    def test_unreadable_row_late_in_file(self, library, tmp_path):
+        """Test that books added before a read error are searchable."""
+        path = tmp_path / "catalog.csv"
+        lines = [self.CSV_ROWS[0]] + [
+            f"PhysicalBook,B{i:05d},Title {i},Author,1," for i in range(2000)
+        ]
+        path.write_bytes(("\n".join(lines) + "\n").encode() + b"PhysicalBook,X1,\xff\xfe,A,1,\n")
+        with pytest.raises(UnicodeDecodeError):
+            library.import_catalog(str(path), chunk_size=100)
+        assert len(library.books) >= 1000
+        found = library.search("title", limit=len(library.books) + 1)
+        assert {book.id for book in found} == set(library.books)
+        assert library.verify_inventory() == []
+
+    @pytest.mark.parametrize("chunk_size", [2, 10000])
+    def test_csv_import(self, library, tmp_path, chunk_size):
+        """Test importing a CSV file with some invalid rows."""
+        report = library.import_catalog(
+            self.write(tmp_path, "catalog.csv", self.CSV_ROWS), chunk_size=chunk_size
+        )
+        assert isinstance(report, ImportReport)
+        assert report.imported == 3
+        assert not report.ok
+        assert [(line, book_id) for line, book_id, _ in report.rejected] == [
+            (4, "B002"), (5, "B003"), (6, "A001"), (7, "B001"), (8, "E002"),
+        ]
+        assert "already exists" in report.rejected[3][2]
+        assert library.get_book_by_id("B001").title == "Python Programming"
+        assert library.get_book_by_id("E001").file_size_mb == 5.2
+        assert [book.id for book in library.search("algorithms")] == ["B004"]
+        assert library.inventory()["available_copies"] == 5
+        assert library.verify_inventory() == []
+        assert str(report) == "Imported 3 books; rejected 5 rows."
+
+    def test_jsonl_import(self, library, tmp_path):
+        """Test importing JSON lines, skipping IDs already in the library."""
+        library.add_book(PhysicalBook("B001", "Python Programming", "John Doe", 2))
+        path = self.write(tmp_path, "catalog.jsonl", [
+            json.dumps({"type": "PhysicalBook", "id": "B001", "title": "T", "author": "A",
+                        "available_copies": 1}),
+            "not json",
+            "",
+            json.dumps([1, 2]),
+            json.dumps({"type": "PhysicalBook", "id": "B002", "title": "T", "author": "A",
+                        "available_copies": 1.5}),
+            json.dumps({"type": "EBook", "id": "E001", "title": "T", "author": "A",
+                        "file_size_mb": 2}),
+        ])
+        report = library.import_catalog(path)
+        assert report.imported == 1
+        assert [line for line, _, _ in report.rejected] == [1, 2, 4, 5]
+        assert len(library.books) == 2
+
+    def test_save_rejected(self, library, tmp_path):
+        """Test writing the rejected rows to a CSV file."""
+        report = library.import_catalog(self.write(tmp_path, "catalog.csv", self.CSV_ROWS))
+        output = tmp_path / "rejected.csv"
+        report.save_rejected(str(output))
+        lines = output.read_text().splitlines()
+        assert lines[0] == "line,id,reason"
+        assert lines[1] == "4,B002,Available copies cannot be negative."
+        assert len(lines) == 6
+
+    def test_unknown_format(self, library, tmp_path):
+        """Test that a file with an unknown extension needs an explicit format."""
+        path = self.write(tmp_path, "catalog.txt", self.CSV_ROWS)
+        with pytest.raises(ValueError):
+            library.import_catalog(path)
+        assert library.import_catalog(path, fmt="csv").imported == 3
+
+    def test_import_is_journaled(self, library, tmp_path):
+        """Test that imported books are recovered from the journal."""
+        snapshot = str(tmp_path / "snapshot.jsonl")
+        journal_file = str(tmp_path / "journal.log")
+        library.save_to_file(snapshot)
+        library.attach_journal(Journal(journal_file))
+        library.import_catalog(self.write(tmp_path, "catalog.csv", self.CSV_ROWS))
+        library.detach_journal()
+
+        recovered = Library()
+        assert recovered.recover(snapshot, journal_file) == 3
+        assert sorted(recovered.books) == ["B001", "B004", "E001"]
+
+    def test_concurrent_import(self, tmp_path):
+        """Test importing into a ConcurrentLibrary."""
+        library = ConcurrentLibrary()
+        report = library.import_catalog(self.write(tmp_path, "catalog.csv", self.CSV_ROWS))
+        assert report.imported == 3
+        assert library.verify_inventory() == []
+
+
+# ============================================================================
+# Event Stream Tests
+# ============================================================================
+
+
+class TestEvents:
+    """Tests for the change event stream."""
+
+    @pytest.fixture
+    def bus(self, library):
+        """Provide an event bus attached to the library fixture."""
+        bus = EventBus(capacity=8)
+        library.attach_events(bus)
+        return bus
+
+    def test_changes_publish_events(self, library, bus):
+        """Test that every kind of change publishes a typed event in order."""
+        subscription = bus.subscribe()
+        library.add_book(PhysicalBook("B001", "Python Programming", "John Doe", 1))
+        library.add_member(Member("M001", "Alice"))
+        library.add_member(Member("M002", "Bob"))
+        library.borrow_book("M001", "B001")
+        library.place_hold("M002", "B001")
+        library.return_book("M001", "B001")
+
+        events = subscription.poll()
+        assert [(e.seq, e.kind, e.member_id, e.book_id) for e in events] == [
+            (1, Event.BOOK_ADDED, None, "B001"),
+            (2, Event.MEMBER_ADDED, "M001", None),
+            (3, Event.MEMBER_ADDED, "M002", None),
+            (4, Event.BOOK_BORROWED, "M001", "B001"),
+            (5, Event.HOLD_PLACED, "M002", "B001"),
+            (6, Event.BOOK_RETURNED, "M001", "B001"),
+            (7, Event.BOOK_BORROWED, "M002", "B001"),
+        ]
+        assert subscription.poll() == []
+        assert subscription.lag == 0
+        assert str(events[3]) == "#4 book_borrowed: member M001, book B001"
+
+        with pytest.raises(BookNotFoundError):
+            library.borrow_book("M001", "B999")
+        assert bus.last_seq == 7
+        assert library.detach_events() is bus
+
+    def test_slow_subscriber_misses_events(self, library, bus):
+        """Test that a full buffer overwrites old events instead of blocking."""
+        slow = bus.subscribe(from_start=True)
+        for i in range(20):
+            library.add_member(Member(f"M{i:03d}", f"Member {i}"))
+        assert bus.first_seq == 13
+        assert slow.lag == 20
+        events = slow.poll(limit=3)
+        assert [event.seq for event in events] == [13, 14, 15]
+        assert slow.missed == 12
+        assert len(slow.poll()) == 5
+
+    def test_read_waits_for_events(self, library, bus):
+        """Test that a reader can wait for the next event."""
+        assert bus.read(after=0, timeout=0.01) == []
+        timer = threading.Timer(0.05, library.add_member, [Member("M001", "Alice")])
+        timer.start()
+        events = bus.read(after=0, timeout=5)
+        timer.join()
+        assert [event.kind for event in events] == [Event.MEMBER_ADDED]
+
+    def test_load_and_recovery_publish_one_event(self, library, bus, tmp_path):
+        """Test that replacing the library publishes a single load event."""
+        snapshot = str(tmp_path / "snapshot.jsonl")
+        journal_file = str(tmp_path / "journal.log")
+        library.save_to_file(snapshot)
+        library.attach_journal(Journal(journal_file))
+        library.add_book(PhysicalBook("B001", "Python Programming", "John Doe", 1))
+        library.add_member(Member("M001", "Alice"))
+        library.borrow_book("M001", "B001")
+        library.detach_journal()
+
+        subscription = bus.subscribe()
+        assert library.recover(snapshot, journal_file) == 3
+        library.load_from_file(snapshot)
+        assert [event.kind for event in subscription.poll()] == [
+            Event.LIBRARY_LOADED, Event.LIBRARY_LOADED,
+        ]
+
+    def test_concurrent_publishers(self):
+        """Test that sequence numbers stay gapless under concurrent borrows."""
+        library = ConcurrentLibrary()
+        bus = EventBus(capacity=10000)
+        library.attach_events(bus)
+        for i in range(8):
+            library.add_book(PhysicalBook(f"B{i}", "Title", "Author", 100))
+            library.add_member(Member(f"M{i}", f"Member {i}"))
+
+        def worker(i):
+            for _ in range(100):
+                library.borrow_book(f"M{i}", f"B{(i + 1) % 8}")
+                library.return_book(f"M{i}", f"B{(i + 1) % 8}")
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        events = bus.read()
+        assert [event.seq for event in events] == list(range(1, 1617))
+
+    def test_invalid_capacity(self):
+        """Test that the buffer must hold at least one event."""
+        with pytest.raises(ValueError):
+            EventBus(capacity=0)
+
+
+# ============================================================================
+# Batch Mode Tests
+# ============================================================================
+
+
+class TestBatchMode:
+    """Tests for running console commands from a file."""
+
+    COMMANDS = [
+        "# set up",
+        'add_physical B001 "Python Programming" "John Doe" 1',
+        "add_ebook E001 'Design Patterns' 'Jane Smith' 5.2",
+        "add_member M001 Alice",
+        "",
+        'add_member M002 "Bob Smith"',
+        "borrow M001 B001",
+        "borrow M002 B001",
+        "list_member_books M001",
+        "return M001 B001",
+        "frobnicate",
+        "borrow M001",
+        "add_physical B002 Title Author many",
+    ]
+
+    def test_run_batch(self, library):
+        """Test that commands run in order and failures are reported by line."""
+        output = io.StringIO()
+        assert main.run_batch(library, self.COMMANDS, output) == (11, 4)
+        lines = output.getvalue().splitlines()
+        assert lines[4] == "✓ M001 borrowed B001"
+        assert lines[5] == "✗ Line 8: No copies of 'Python Programming' are available."
+        assert lines[6] == "1. Python Programming by John Doe (ID: B001) - 0 copies available"
+        assert lines[8:] == [
+            "✗ Line 11: Unknown command 'frobnicate'.",
+            "✗ Line 12: Usage: borrow MEMBER_ID BOOK_ID",
+            "✗ Line 13: invalid literal for int() with base 10: 'many'",
+        ]
+        assert library.get_member_by_id("M002").name == "Bob Smith"
+        assert library.get_book_by_id("B001").available_copies == 1
+
+    def test_quiet_buffered_output(self, library):
+        """Test that quiet mode writes only errors, in buffered chunks."""
+        class CountingOutput(io.StringIO):
+            writes = 0
+
+            def write(self, text):
+                self.writes += 1
+                return super().write(text)
+
+        lines = [f"add_member M{i:03d} Member{i}" for i in range(250)] + ["borrow M000 B999"]
+        output = CountingOutput()
+        assert main.run_batch(library, lines, output, quiet=True, flush_every=100) == (251, 1)
+        assert output.getvalue() == "✗ Line 251: Book with ID 'B999' not found.\n"
+        assert output.writes == 1
+
+    def test_batch_main(self, tmp_path, capsys):
+        """Test running a command file from the command line."""
+        save_file = tmp_path / "library.json"
+        commands = tmp_path / "commands.txt"
+        commands.write_text("\n".join([
+            'add_physical B001 "Python Programming" "John Doe" 1',
+            "add_member M001 Alice",
+            "borrow M001 B001",
+            f'save "{save_file}"',
+        ]) + "\n")
+        assert main.main(["--batch", str(commands), "--quiet"]) == 0
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "Ran 4 commands (0 failed)" in captured.err
+
+        library = Library()
+        library.load_from_file(str(save_file))
+        assert library.get_loan("M001", "B001") is not None
+
+    def test_batch_file_missing(self, tmp_path, capsys):
+        """Test that a missing command file is reported without a traceback."""
+        assert main.main(["--batch", str(tmp_path / "missing.txt")]) == 2
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert captured.err.startswith("✗ Error: cannot open")
+
+
+# ============================================================================
+# Startup Cache Tests
+# ============================================================================
+
+
+class TestStartupCache:
+    """Tests for cached loading and lazy package imports."""
+
+    @pytest.fixture
+    def saved(self, library, tmp_path):
+        """Save a small library and return the file path."""
+        library.add_book(PhysicalBook("B001", "Python Programming", "John Doe", 2))
+        library.add_book(EBook("E001", "Design Patterns", "Jane Smith", 5.2))
+        library.add_member(Member("M001", "Alice"))
+        library.borrow_book("M001", "B001")
+        path = tmp_path / "library.json"
+        library.save_to_file(str(path))
+        return path
+
+    def test_cache_round_trip(self, saved):
+        """Test that the first load writes the cache and the next one uses it."""
+        first = Library()
+        assert first.load_cached(str(saved)) is False
+        assert os.path.exists(str(saved) + ".cache")
+
+        second = Library()
+        assert second.load_cached(str(saved)) is True
+        assert second.get_loan("M001", "B001") is not None
+        assert second.get_book_by_id("B001").available_copies == 1
+        assert sorted(book.id for book in second.list_books()) == ["B001", "E001"]
+        assert second.verify_inventory() == []
+
+    def test_changed_file_refreshes_cache(self, saved):
+        """Test that a file with a new size or modification time is reloaded."""
+        Library().load_cached(str(saved))
+        library = Library()
+        library.load_from_file(str(saved))
+        library.add_member(Member("M002", "Bob"))
+        library.save_to_file(str(saved))
+
+        reloaded = Library()
+        assert reloaded.load_cached(str(saved)) is False
+        assert reloaded.get_member_by_id("M002") is not None
+        assert Library().load_cached(str(saved)) is True
+
+    def test_bad_or_unwritable_cache(self, saved, tmp_path):
+        """Test that a corrupt or unwritable cache never breaks loading."""
+        cache = tmp_path / "broken.cache"
+        cache.write_bytes(b"not a snapshot")
+        library = Library()
+        assert library.load_cached(str(saved), str(cache)) is False
+        assert library.load_cached(str(saved), str(cache)) is True
+
+        unwritable = str(tmp_path / "missing" / "library.cache")
+        assert library.load_cached(str(saved), unwritable) is False
+        assert library.get_loan("M001", "B001") is not None
+
+    def test_optional_modules_load_on_first_use(self):
+        """Test that importing the package skips asyncio, multiprocessing, and http.server."""
+        code = (
+            "import sys, library\n"
+            "heavy = ['asyncio', 'multiprocessing', 'http.server']\n"
+            "assert not [name for name in heavy if name in sys.modules]\n"
+            "assert library.Metrics.__name__ == 'Metrics'\n"
+            "assert 'http.server' in sys.modules\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
+
+# ============================================================================
+# Pagination Tests
+# ============================================================================
+
+
+class TestPagination:
+    """Tests for cursor-based listing."""
+
+    @pytest.fixture
+    def big_library(self, library):
+        """Provide a library with 45 books and 3 members."""
+        for i in range(45):
+            library.add_book(PhysicalBook(f"B{i:03d}", f"Title {i}", "Author", 1))
+        for i in range(3):
+            library.add_member(Member(f"M{i}", f"Member {i}"))
+        return library
+
+    def test_pages_cover_everything_in_order(self, big_library):
+        """Test that following cursors visits every book once, in order."""
+        seen, cursor, pages = [], None, 0
+        while True:
+            books, cursor = big_library.page_books(20, cursor)
+            seen.extend(book.id for book in books)
+            pages += 1
+            if cursor is None:
+                break
+        assert pages == 3
+        assert seen == [f"B{i:03d}" for i in range(45)]
+
+    def test_exact_and_empty_pages(self, library, big_library):
+        """Test the last page boundary and an empty listing."""
+        members, cursor = big_library.page_members(3)
+        assert [member.member_id for member in members] == ["M0", "M1", "M2"]
+        assert cursor is None
+        assert Library().page_books() == ([], None)
+
+    def test_cursor_survives_additions(self, big_library):
+        """Test that books added while paging appear at the end."""
+        _, cursor = big_library.page_books(40)
+        big_library.add_book(EBook("E001", "New", "Author", 1.0))
+        books, cursor = big_library.page_books(40, cursor)
+        assert [book.id for book in books] == ["B040", "B041", "B042", "B043", "B044", "E001"]
+        assert cursor is None
+
+    def test_walk_reads_each_key_once(self):
+        """Test that paging through a catalog does not restart from the first book."""
+
+        class CountingStore(dict):
+            reads = 0
+
+            def __iter__(self):
+                for key in dict.__iter__(self):
+                    CountingStore.reads += 1
+                    yield key
+
+            def __reversed__(self):
+                for key in dict.__reversed__(self):
+                    CountingStore.reads += 1
+                    yield key
+
+        library = Library(book_store=CountingStore())
+        for i in range(2000):
+            library.add_book(PhysicalBook(f"B{i:04d}", "Title", "Author", 1))
+        CountingStore.reads = 0
+        seen, cursor = [], None
+        while True:
+            books, cursor = library.page_books(10, cursor)
+            seen.extend(book.id for book in books)
+            if len(seen) == 1990:
+                library.add_book(EBook("E001", "New", "Author", 1.0))
+            if cursor is None:
+                break
+        assert seen == [f"B{i:04d}" for i in range(2000)] + ["E001"]
+        assert CountingStore.reads == 2001
+
+    def test_additions_while_listing(self, big_library):
+        """Test that books added midway through a walk are listed once, at the end."""
+        seen, cursor, added = [], None, 0
+        while True:
+            books, cursor = big_library.page_books(7, cursor)
+            seen.extend(book.id for book in books)
+            if added < 3:
+                big_library.add_book(EBook(f"E{added}", "New", "Author", 1.0))
+                added += 1
+            if cursor is None:
+                break
+        assert seen == [f"B{i:03d}" for i in range(45)] + ["E0", "E1", "E2"]
+
+    def test_invalid_cursors(self, big_library, tmp_path):
+        """Test that foreign, malformed, and stale cursors are rejected."""
+        _, cursor = big_library.page_books(10)
+        with pytest.raises(ValueError):
+            big_library.page_members(10, cursor)
+        with pytest.raises(ValueError):
+            big_library.page_books(10, "not a cursor")
+        with pytest.raises(ValueError):
+            big_library.page_books(0)
+
+        other = Library()
+        for i in range(20):
+            other.add_book(PhysicalBook(f"X{i:03d}", "Title", "Author", 1))
+        path = str(tmp_path / "other.json")
+        other.save_to_file(path)
+        big_library.load_from_file(path)
+        with pytest.raises(ValueError):
+            big_library.page_books(10, cursor)
+
+    def test_pages_from_snapshot(self, big_library, tmp_path):
+        """Test paging through a lazily opened snapshot."""
+        path = str(tmp_path / "library.snap")
+        big_library.save_binary(path)
+        library = Library()
+        library.open_snapshot(path)
+        books, cursor = library.page_books(5)
+        books, cursor = library.page_books(5, cursor)
+        assert [book.id for book in books] == [f"B{i:03d}" for i in range(5, 10)]
+
+    def test_console_pages(self, big_library, monkeypatch, capsys):
+        """Test that the console lists a page and stops when asked."""
+        answers = iter(["", "q"])
+        monkeypatch.setattr("builtins.input", lambda prompt: next(answers))
+        main.list_books(big_library)
+        output = capsys.readouterr().out
+        assert "40. Title 39 by Author (ID: B039)" in output
+        assert "41." not in output
+
+
+# ============================================================================
+# Background Save Tests
+# ============================================================================
+
+
+class TestBackgroundSave:
+    """Tests for copy-on-write background saves."""
+
+    @pytest.fixture
+    def release(self, monkeypatch):
+        """Hold background saves back from writing until the event is set."""
+        release = threading.Event()
+        write = Library._write_sections
+
+        def paused_write(library, *args):
+            release.wait(5)
+            write(library, *args)
+
+        monkeypatch.setattr(Library, "_write_sections", paused_write)
+        return release
+
+    @pytest.fixture
+    def saved_library(self, library):
+        """Provide a library with one loan."""
+        library.add_book(PhysicalBook("P001", "Title", "Author", 2))
+        library.add_book(EBook("E001", "Digital", "Author", 1.0))
+        library.add_member(Member("M001", "Alice"))
+        library.add_member(Member("M002", "Bob"))
+        library._borrow("M001", "P001", "2026-02-20", "2026-03-06")
+        return library
+
+    def test_saves_state_at_call(self, saved_library, release, tmp_path):
+        """Test that changes made during the save are left out of the file."""
+        path = str(tmp_path / "library.jsonl")
+        save = saved_library.save_in_background(path)
+        saved_library.borrow_book("M002", "P001")
+        saved_library.return_book("M001", "P001")
+        saved_library.borrow_book("M001", "P001")
+        saved_library.add_book(PhysicalBook("P002", "New", "Author", 1))
+        saved_library.add_member(Member("M003", "Carol"))
+        release.set()
+        assert save.wait(5)
+
+        loaded = Library()
+        loaded.load_from_file(path)
+        assert set(loaded.books) == {"P001", "E001"}
+        assert set(loaded.members) == {"M001", "M002"}
+        assert loaded.get_book_by_id("P001").available_copies == 1
+        assert loaded.loans_for_member("M002") == []
+        loan = loaded.get_loan("M001", "P001")
+        assert (loan.date_borrowed, loan.due_date) == ("2026-02-20", "2026-03-06")
+        assert loaded.verify_inventory() == []
+        assert saved_library.get_book_by_id("P001").available_copies == 0
+        assert "P002" in saved_library.books
+
+    def test_holds_at_call(self, library, release, tmp_path):
+        """Test that a hold handed off during the save is still saved."""
+        library.add_book(PhysicalBook("P001", "Title", "Author", 1))
+        library.add_member(Member("M001", "Alice"))
+        library.add_member(Member("M002", "Bob"))
+        library.borrow_book("M001", "P001")
+        library.place_hold("M002", "P001")
+        path = str(tmp_path / "library.json")
+        save = library.save_in_background(path)
+        library.return_book("M001", "P001")
+        assert library.get_loan("M002", "P001") is not None
+        release.set()
+        save.wait(5)
+
+        loaded = Library()
+        loaded.load_from_file(path)
+        assert loaded.get_loan("M001", "P001") is not None
+        assert loaded.get_loan("M002", "P001") is None
+        assert loaded.hold_position("M002", "P001") == 1
+
+    def test_one_save_at_a_time(self, saved_library, release, tmp_path):
+        """Test that a second save is rejected until the first one finishes."""
+        save = saved_library.save_in_background(str(tmp_path / "first.json"))
+        with pytest.raises(InvalidOperationError):
+            saved_library.save_in_background(str(tmp_path / "second.json"))
+        release.set()
+        save.wait(5)
+        assert save.done()
+        saved_library.save_in_background(str(tmp_path / "second.json")).wait(5)
+        assert os.path.exists(tmp_path / "second.json")
+
+    def test_failed_save(self, saved_library, tmp_path):
+        """Test that a failed save reports its error and allows another save."""
+        save = saved_library.save_in_background(str(tmp_path / "missing" / "library.json"))
+        with pytest.raises(FileNotFoundError):
+            save.wait(5)
+        path = str(tmp_path / "library.json")
+        saved_library.save_in_background(path).wait(5)
+        assert not os.path.exists(path + ".tmp")
+        with open(path) as f:
+            assert len(json.load(f)["loans"]) == 1
+
+    def test_failed_write_removes_temporary_file(self, saved_library, monkeypatch, tmp_path):
+        """Test that a save failing mid-write keeps the old file and no temporary file."""
+        path = str(tmp_path / "library.json")
+        saved_library.save_to_file(path)
+        with open(path) as f:
+            previous = f.read()
+
+        def failing_write(library, filename, *args):
+            with open(filename, "w") as f:
+                f.write("{")
+            raise OSError(28, "No space left on device")
+
+        monkeypatch.setattr(Library, "_write_sections", failing_write)
+        save = saved_library.save_in_background(path)
+        with pytest.raises(OSError):
+            save.wait(5)
+        assert not os.path.exists(path + ".tmp")
+        with open(path) as f:
+            assert f.read() == previous
+
+    def test_additions_during_read(self, library):
+        """Test that books added while the version is read are left out, in order."""
+        for i in range(3000):
+            library.add_book(PhysicalBook(f"B{i:04d}", f"Title {i}", "Author", 1))
+        version = library._freeze()
+        read = []
+        for i, book in enumerate(version.values("books")):
+            read.append(book.id)
+            if i % 500 == 0:
+                library.add_book(PhysicalBook(f"N{i:04d}", "New", "Author", 1))
+        assert read == [f"B{i:04d}" for i in range(3000)]
+        assert len(library.books) == 3006
+
+    def test_concurrent_mutations(self, tmp_path):
+        """Test a consistent save while many threads borrow and return."""
+        library = ConcurrentLibrary()
+        for i in range(2000):
+            library.add_book(PhysicalBook(f"B{i:04d}", f"Title {i}", "Author", 2))
+        for i in range(8):
+            library.add_member(Member(f"M{i:02d}", f"Member {i}"))
+        path = str(tmp_path / "library.jsonl")
+        stop = threading.Event()
+
+        def work(seed):
+            rng = random.Random(seed)
+            member_id = f"M{seed:02d}"
+            while not stop.is_set():
+                book_id = f"B{rng.randrange(2000):04d}"
+                if library.get_member_by_id(member_id).has_borrowed(book_id):
+                    library.return_book(member_id, book_id)
+                else:
+                    library.borrow_many([(member_id, book_id)])
+
+        threads = [threading.Thread(target=work, args=(seed,)) for seed in range(8)]
+        for thread in threads:
+            thread.start()
+        try:
+            for _ in range(3):
+                assert library.save_in_background(path).wait(30)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+        loaded = Library()
+        loaded.load_from_file(path)
+        assert len(loaded.books) == 2000
+        assert loaded.verify_inventory() == []
+        for book in loaded.books.values():
+            assert book.available_copies + len(loaded.loans_for_book(book.id)) == 2
+        assert library.verify_inventory() == []
+
+    def test_async_save(self, saved_library, tmp_path):
+        """Test that the async facade keeps applying mutations during a save."""
+        path = str(tmp_path / "library.json")
+
+        async def scenario():
+            async with AsyncLibrary(saved_library) as library:
+                save = asyncio.ensure_future(library.save_in_background(path))
+                await asyncio.sleep(0)
+                await library.borrow_book("M002", "P001")
+                await save
+
+        asyncio.run(scenario())
+        loaded = Library()
+        loaded.load_from_file(path)
+        assert loaded.get_loan("M002", "P001") is None
+        assert saved_library.get_loan("M002", "P001") is not None